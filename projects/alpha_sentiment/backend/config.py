@@ -33,6 +33,14 @@ LOG_LEVEL = os.getenv("ALPHA_SENTIMENT_LOG_LEVEL", "INFO")
 MAX_RETRIES = int(os.getenv("ALPHA_SENTIMENT_MAX_RETRIES", "5"))
 RETRY_DELAY = float(os.getenv("ALPHA_SENTIMENT_RETRY_DELAY", "2.0"))
 
+# 刷新任务配置
+# 执行方式：process（独立工作进程，默认）/ thread（API 进程内线程）
+REFRESH_ISOLATION = os.getenv("ALPHA_SENTIMENT_REFRESH_ISOLATION", "process")
+# 单次刷新超时（秒，0 表示不限制）
+REFRESH_TIMEOUT = int(os.getenv("ALPHA_SENTIMENT_REFRESH_TIMEOUT", "3600"))
+# 工作进程内存上限（MB，按 RSS 监控，超出即终止；0 表示不限制）
+WORKER_MAX_MEMORY_MB = int(os.getenv("ALPHA_SENTIMENT_WORKER_MAX_MEMORY_MB", "2048"))
+
 # 告警配置（可选）
 ALERT_WEBHOOK_URL = os.getenv("ALPHA_SENTIMENT_ALERT_WEBHOOK", "")
 ALERT_ENABLED = bool(ALERT_WEBHOOK_URL)
@@ -2,18 +2,20 @@
 """FastAPI 应用入口 - API 服务 + 静态前端 + 定时任务"""
 import json
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Callable, Optional
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import API_HOST, API_PORT, LOG_LEVEL, PROJECT_DIR, DATA_DIR
 from .scheduler import start_scheduler, shutdown_scheduler
+from .services.refresh_manager import refresh_manager
 
 # 前端目录
 FRONTEND_DIR = PROJECT_DIR / "frontend"
@@ -106,28 +108,102 @@ def _read_json_with_retry(file_path: Path, max_retries: int = 3) -> dict:
     return None
 
 
+# 解析结果缓存：文件路径 -> (mtime_ns, size, 解析结果)，按最近使用淘汰
+_JSON_CACHE_SIZE = 256
+_json_cache: "OrderedDict[Path, tuple[int, int, Any]]" = OrderedDict()
+
+
+def _read_json_cached(file_path: Path, transform: Optional[Callable[[dict], Any]] = None) -> Any:
+    """
+    读取 JSON 文件并按文件 stat 签名缓存解析结果，文件未变化时不再读取和解析
+
+    刷新任务重写文件后 mtime/size 改变，下次请求重新读取。
+
+    Args:
+        file_path: 文件路径
+        transform: 解析后的预处理（结果一并缓存）
+
+    Returns:
+        解析（及预处理）结果；文件不存在或读取失败时返回 None（不缓存）
+    """
+    try:
+        st = file_path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+
+    cached = _json_cache.get(file_path)
+    if cached is not None and signature is not None and cached[:2] == signature:
+        _json_cache.move_to_end(file_path)
+        return cached[2]
+
+    data = _read_json_with_retry(file_path)
+    if data is None:
+        _json_cache.pop(file_path, None)
+        return None
+    if transform is not None:
+        data = transform(data)
+    # 使用读取前的签名：读取期间文件被重写时，下次请求签名不一致会再次读取
+    if signature is not None:
+        _json_cache[file_path] = (*signature, data)
+        _json_cache.move_to_end(file_path)
+        while len(_json_cache) > _JSON_CACHE_SIZE:
+            _json_cache.popitem(last=False)
+    return data
+
+
+def _ranking_index(data: dict) -> dict:
+    """旧版索引文件（无预排好的降序和标签排列）在缓存前重建一次"""
+    from .services.rankings import build_ranking_index
+
+    if "tag_order" in data:
+        return data
+    return {**build_ranking_index(data.get("rows", [])), "updated_at": data.get("updated_at")}
+
+
 @app.get("/api/hot_stocks")
 async def get_hot_stocks():
     """获取热门股票列表"""
     hot_stocks_file = DATA_DIR / "hot_stocks.json"
 
-    data = _read_json_with_retry(hot_stocks_file)
+    data = _read_json_cached(hot_stocks_file)
     if data is None:
         raise HTTPException(status_code=404, detail="数据尚未生成，请稍后重试")
 
     return data
 
 
-@app.get("/api/stock/{code}")
-async def get_stock_detail(code: str):
-    """获取股票详情"""
+@app.get("/api/rankings")
+async def get_rankings(
+    by: str = Query("heat", description="排序字段"),
+    order: str = Query("asc", description="asc/desc"),
+    tag: Optional[str] = Query(None, description="按标签筛选"),
+    limit: int = Query(20, ge=1, le=500, description="返回数量")
+):
+    """排行榜（基于数据生成时预计算的排序索引，含百分位；索引按文件修改时间缓存）"""
+    from .services.rankings import query_rankings
+
+    index = _read_json_cached(DATA_DIR / "rankings.json", _ranking_index)
+    if index is None:
+        raise HTTPException(status_code=404, detail="排行榜尚未生成，请稍后重试")
+
+    try:
+        result = query_rankings(index, by=by, order=order, tag=tag or None, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"updated_at": index.get("updated_at"), **result}
+
+
+def _load_stock_detail(code: str) -> Optional[dict]:
+    """按股票代码读取详情文件（兼容带/不带 SZ/SH 前缀的文件名，解析结果按文件修改时间缓存）"""
     # 保留原始代码（包含 SZ/SH 前缀）
     clean_code = code.upper()
 
     # 尝试直接使用原始代码查找
     stock_file = DATA_DIR / f"stock_{clean_code}.json"
 
-    data = _read_json_with_retry(stock_file)
+    data = _read_json_cached(stock_file)
     if data is None:
         # 如果找不到，尝试去掉前缀后查找（兼容旧格式）
         bare_code = clean_code
@@ -137,29 +213,129 @@ async def get_stock_detail(code: str):
                 break
         bare_code = bare_code.zfill(6)
         stock_file = DATA_DIR / f"stock_{bare_code}.json"
-        data = _read_json_with_retry(stock_file)
+        data = _read_json_cached(stock_file)
+
+    return data
+
 
+@app.get("/api/stock/{code}")
+async def get_stock_detail(code: str):
+    """获取股票详情"""
+    data = _load_stock_detail(code)
     if data is None:
         raise HTTPException(status_code=404, detail=f"未找到股票 {code} 的数据")
 
     return data
 
 
+@app.get("/api/stock/{code}/kline")
+async def get_stock_kline(
+    code: str,
+    start: Optional[str] = Query(None, alias="from", description="起始日期 YYYY-MM-DD"),
+    end: Optional[str] = Query(None, alias="to", description="结束日期 YYYY-MM-DD"),
+    interval: str = Query("day", description="聚合周期 day/week/month"),
+    max_points: Optional[int] = Query(None, ge=2, description="最大返回点数（LTTB 降采样）")
+):
+    """按日期范围/周期查询 K线（列式数组）"""
+    from .services.kline import query_kline
+
+    data = _load_stock_detail(code)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"未找到股票 {code} 的数据")
+
+    detail = data.get("detail", {})
+    try:
+        result = query_kline(
+            detail.get("kline", []),
+            start=start,
+            end=end,
+            interval=interval,
+            max_points=max_points
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "code": detail.get("code", code),
+        "updated_at": data.get("updated_at"),
+        **result
+    }
+
+
+@app.get("/api/stock/{code}/indicators")
+async def get_stock_indicators(
+    code: str,
+    names: Optional[str] = Query(None, description="指标组，逗号分隔: ma,ema,macd,rsi,boll,atr,volume_z")
+):
+    """获取股票技术指标（列式数组，可按指标组筛选）"""
+    from .services.indicators import compute_for_klines, select_indicators
+
+    data = _load_stock_detail(code)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"未找到股票 {code} 的数据")
+
+    detail = data.get("detail", {})
+    indicators = detail.get("indicators")
+    if indicators is None:
+        # 兼容未包含指标的旧数据文件
+        kline = detail.get("kline", [])
+        indicators = compute_for_klines([kline])[0] if kline else {"date": []}
+
+    selected_names = [n.strip() for n in names.split(",") if n.strip()] if names else None
+    try:
+        selected = select_indicators(indicators, selected_names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "code": detail.get("code", code),
+        "updated_at": data.get("updated_at"),
+        "indicators": selected
+    }
+
+
 @app.post("/api/refresh")
-async def refresh_data(background_tasks: BackgroundTasks):
-    """手动触发数据刷新（后台执行）"""
-    from .services import DataGenerator
+async def refresh_data():
+    """手动触发数据刷新（后台执行，运行中的任务会合并重复请求）"""
+    job, created = refresh_manager.submit(trigger="manual")
+    return {
+        "status": "accepted",
+        "job_id": job.job_id,
+        "coalesced": not created,
+        "message": "数据刷新任务已提交" if created else "已有刷新任务在运行，已合并到该任务"
+    }
 
-    def do_refresh():
-        try:
-            generator = DataGenerator()
-            generator.generate()
-            logger.info("手动数据刷新完成")
-        except Exception as e:
-            logger.error(f"手动数据刷新失败: {e}")
-
-    background_tasks.add_task(do_refresh)
-    return {"status": "accepted", "message": "数据刷新任务已提交"}
+
+@app.get("/api/refresh/{job_id}")
+async def get_refresh_job(job_id: str):
+    """查询刷新任务进度（阶段、完成数/总数、预计剩余时间）"""
+    job = refresh_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"未找到刷新任务 {job_id}")
+    return job.to_dict()
+
+
+@app.get("/api/runs")
+async def get_runs(
+    trigger: Optional[str] = Query(None, description="触发来源 manual/schedule/initial"),
+    status: Optional[str] = Query(None, description="任务状态 success/failed"),
+    since: Optional[str] = Query(None, description="起始时间（ISO 格式，含）"),
+    until: Optional[str] = Query(None, description="结束时间（ISO 格式，不含）"),
+    limit: int = Query(50, ge=0, le=1000, description="返回的最近记录条数")
+):
+    """刷新运行台账（筛选 + 总耗时/各阶段耗时分位数）"""
+    ledger = refresh_manager.ledger
+    if ledger is None:
+        raise HTTPException(status_code=404, detail="运行台账未启用")
+
+    for name, value in (("since", since), ("until", until)):
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"{name} 不是合法的 ISO 时间: {value}")
+
+    return ledger.query(trigger=trigger, status=status, since=since, until=until, limit=limit)
 
 
 # ============== 静态文件服务 ==============
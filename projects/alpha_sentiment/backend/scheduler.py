@@ -4,21 +4,19 @@ import asyncio
 import json
 import logging
 import traceback
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
-import httpx
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from .services import DataGenerator
+from .services.refresh_manager import refresh_manager
+from .services.trading_calendar import is_data_fresh, is_trading_day, last_completed_session
 from .config import DATA_DIR, ALERT_WEBHOOK_URL, ALERT_ENABLED
 
 logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler()
-executor = ThreadPoolExecutor(max_workers=1)
 
 
 class AlertService:
@@ -54,6 +52,8 @@ class AlertService:
                 }
             }
 
+            import httpx
+
             async with httpx.AsyncClient(timeout=10.0) as client:
                 response = await client.post(ALERT_WEBHOOK_URL, json=payload)
                 if response.status_code == 200:
@@ -86,32 +86,23 @@ class AlertService:
         return text
 
 
-def generate_static_data() -> tuple[bool, Optional[str]]:
-    """
-    生成静态数据文件（供定时任务调用）
+async def refresh_data_task(trigger: str = "schedule"):
+    """通过刷新任务管理器执行数据刷新并等待结果（带告警）
 
-    Returns:
-        (成功标志, 错误信息)
+    与手动刷新共用同一个任务队列：已有任务运行时直接等待该任务完成。
     """
-    try:
-        generator = DataGenerator()
-        success = generator.generate()
-        return success, None
-    except Exception as e:
-        error_msg = f"{type(e).__name__}: {str(e)}"
-        logger.error(f"数据生成异常: {error_msg}")
-        logger.debug(traceback.format_exc())
-        return False, error_msg
-
-
-async def refresh_data_task():
-    """异步包装，在线程中运行同步的 generate 方法（带告警）"""
     start_time = datetime.now()
+    if trigger == "schedule" and not is_trading_day(start_time.date()):
+        logger.info(f"{start_time.date()} 非交易日，跳过定时刷新")
+        return
+
     logger.info("开始执行定时数据刷新任务...")
 
     try:
-        loop = asyncio.get_event_loop()
-        success, error_msg = await loop.run_in_executor(executor, generate_static_data)
+        job, created = refresh_manager.submit(trigger=trigger)
+        if not created:
+            logger.info(f"已有刷新任务 {job.job_id} 在运行，等待其完成")
+        success, error_msg = await asyncio.wrap_future(job.future)
 
         elapsed = (datetime.now() - start_time).total_seconds()
 
@@ -160,11 +151,11 @@ async def refresh_data_task():
 
 
 def setup_scheduler():
-    """配置定时任务 - 每天收盘后刷新一次"""
-    # 每天 15:30 收盘后刷新数据
+    """配置定时任务 - 每个交易日收盘后刷新一次"""
+    # 工作日 15:30 收盘后刷新数据（节假日在任务内按交易日历跳过）
     scheduler.add_job(
         refresh_data_task,
-        CronTrigger(hour=15, minute=30),
+        CronTrigger(day_of_week="mon-fri", hour=15, minute=30),
         id="daily_refresh",
         name="每日数据刷新",
         replace_existing=True
@@ -183,10 +174,13 @@ def setup_scheduler():
                 cached = json.load(f)
             updated_at = cached.get("updated_at", "")
             if updated_at:
-                cached_date = datetime.fromisoformat(updated_at).date()
-                if cached_date < datetime.now().date():
+                cached_at = datetime.fromisoformat(updated_at)
+                if not is_data_fresh(cached_at):
                     need_refresh = True
-                    logger.info(f"数据已过期（{cached_date}），需要刷新")
+                    logger.info(
+                        f"数据已过期（{cached_at:%Y-%m-%d %H:%M}，"
+                        f"最近交易日 {last_completed_session()}），需要刷新"
+                    )
         except Exception as e:
             need_refresh = True
             logger.warning(f"读取缓存失败: {e}")
@@ -195,6 +189,7 @@ def setup_scheduler():
         scheduler.add_job(
             refresh_data_task,
             "date",
+            kwargs={"trigger": "initial"},
             id="initial_refresh",
             name="初始数据刷新"
         )
@@ -216,4 +211,5 @@ def start_scheduler():
 def shutdown_scheduler():
     """关闭调度器"""
     scheduler.shutdown()
+    refresh_manager.shutdown()
     logger.info("调度器已关闭")
@@ -1,5 +1,27 @@
-from .data_fetcher import DataFetcher
-from .sentiment import SentimentAnalyzer
-from .data_generator import DataGenerator
+"""服务层
+
+导出项按需加载（PEP 562）：data_fetcher 依赖 akshare/pandas、sentiment 依赖 openai，
+导入较慢，只在刷新任务真正用到时才加载，避免拖慢 API 进程启动。
+"""
+from importlib import import_module
+
+_LAZY_EXPORTS = {
+    "DataFetcher": ".data_fetcher",
+    "SentimentAnalyzer": ".sentiment",
+    "DataGenerator": ".data_generator",
+}
 
 __all__ = ["DataFetcher", "SentimentAnalyzer", "DataGenerator"]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
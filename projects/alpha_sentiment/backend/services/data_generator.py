@@ -11,10 +11,12 @@ import logging
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional
 import shutil
 import tempfile
 
+from .run_ledger import classify_error
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,13 +55,33 @@ def _atomic_write_json(file_path: Path, data: dict) -> None:
 class DataGenerator:
     """静态数据生成器"""
 
-    def __init__(self):
+    def __init__(self, progress_callback: Optional[Callable[[str, int, int], None]] = None):
+        """
+        Args:
+            progress_callback: 进度回调 (stage, done, total)，供刷新任务管理器追踪进度
+        """
         from .data_fetcher import DataFetcher
         from .sentiment import SentimentAnalyzer
         self.data_fetcher = DataFetcher()
         self.sentiment_analyzer = SentimentAnalyzer()
+        self.progress_callback = progress_callback
         # 获取重试配置
         _, _, self.max_retries, self.retry_delay = _get_config()
+        # 运行统计（写入刷新运行台账）
+        self.stats: dict = {"retry_count": 0, "error_categories": {}}
+
+    def _record_error(self, category: str) -> None:
+        errors = self.stats["error_categories"]
+        errors[category] = errors.get(category, 0) + 1
+
+    def _report(self, stage: str, done: int = 0, total: int = 0) -> None:
+        """上报进度（回调异常不影响数据生成）"""
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(stage, done, total)
+        except Exception as e:
+            logger.debug(f"进度回调失败: {e}")
 
     async def _fetch_stock_async(
         self,
@@ -127,11 +149,13 @@ class DataGenerator:
 
             except Exception as e:
                 if attempt < self.max_retries - 1:
+                    self.stats["retry_count"] += 1
                     wait_time = self.retry_delay * (attempt + 1)
                     logger.warning(f"[{index}/{total}] {code} 第 {attempt + 1} 次失败: {e}, {wait_time}秒后重试...")
                     await asyncio.sleep(wait_time)
                 else:
                     logger.error(f"[{index}/{total}] {code} 重试 {self.max_retries} 次后失败: {e}")
+                    self._record_error(classify_error(e))
                     return {"stock": stock, "stock_data": None, "analysis": None}
 
         return {"stock": stock, "stock_data": None, "analysis": None}
@@ -149,10 +173,19 @@ class DataGenerator:
             raw_news: 预获取的全市场新闻原始数据
             all_ratings: 预获取的全市场千股千评数据
         """
-        tasks = [
-            self._fetch_stock_async(stock, i, len(hot_stocks), raw_news, all_ratings)
-            for i, stock in enumerate(hot_stocks, 1)
-        ]
+        total = len(hot_stocks)
+        done = 0
+        self._report("stocks", 0, total)
+
+        async def tracked(stock: Any, index: int) -> dict:
+            nonlocal done
+            try:
+                return await self._fetch_stock_async(stock, index, total, raw_news, all_ratings)
+            finally:
+                done += 1
+                self._report("stocks", done, total)
+
+        tasks = [tracked(stock, i) for i, stock in enumerate(hot_stocks, 1)]
         # 并发执行所有任务
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -161,12 +194,44 @@ class DataGenerator:
         for i, result in enumerate(results):
             if isinstance(result, Exception):
                 logger.error(f"任务 {i+1} 异常: {result}")
+                self._record_error(classify_error(result))
                 processed.append({"stock": hot_stocks[i], "stock_data": None, "analysis": None})
             else:
                 processed.append(result)
 
         return processed
 
+    @staticmethod
+    def _attach_indicators(stock_details: dict[str, dict]) -> None:
+        """为所有股票详情批量计算技术指标（失败不影响主流程）"""
+        if not stock_details:
+            return
+
+        from .indicators import compute_for_klines
+
+        codes = list(stock_details)
+        try:
+            results = compute_for_klines([stock_details[c]["kline"] for c in codes])
+        except Exception as e:
+            logger.warning(f"技术指标计算失败: {e}")
+            return
+
+        for code, indicators in zip(codes, results):
+            stock_details[code]["indicators"] = indicators
+        logger.info(f"技术指标计算完成，共 {len(codes)} 只股票")
+
+    @staticmethod
+    def _save_rankings(data_dir: Path, enriched_stocks: list[dict], timestamp: str) -> None:
+        """预计算排行榜索引并保存（失败不影响主流程）"""
+        from .rankings import build_ranking_index
+
+        try:
+            index = build_ranking_index(enriched_stocks)
+            _atomic_write_json(data_dir / "rankings.json", {"updated_at": timestamp, **index})
+            logger.info(f"保存排行榜索引: {len(index['rows'])} 只股票, {len(index['tags'])} 个标签")
+        except Exception as e:
+            logger.warning(f"排行榜索引生成失败: {e}")
+
     def generate(self) -> bool:
         """
         生成静态数据文件
@@ -175,7 +240,8 @@ class DataGenerator:
         1. 获取热门股票列表
         2. 并发获取每只股票的价格、K线、新闻、千股千评
         3. 对新闻进行 AI 情绪分析
-        4. 保存为静态 JSON 文件（原子性写入）
+        4. 批量计算技术指标
+        5. 保存为静态 JSON 文件（原子性写入）
 
         Returns:
             是否成功
@@ -191,21 +257,26 @@ class DataGenerator:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
 
         # 1. 验证数据源
+        self._report("verify")
         logger.info("验证数据源连接...")
         if not self.data_fetcher.verify_data_source():
             logger.error("数据源验证失败，退出")
+            self._record_error("data_source")
             return False
 
         # 2. 获取热门股票
+        self._report("hot_stocks")
         logger.info(f"获取热门股票 (前 {MAX_HOT_STOCKS} 只)...")
         hot_stocks = self.data_fetcher.get_hot_stocks(limit=MAX_HOT_STOCKS)
         if not hot_stocks:
             logger.error("获取热门股票失败")
+            self._record_error("hot_stocks")
             return False
 
         logger.info(f"获取到 {len(hot_stocks)} 只热门股票")
 
         # 3. 批量预获取全市场新闻和千股千评（各调用一次 API）
+        self._report("prefetch")
         logger.info("批量获取全市场新闻...")
         news_data = self.data_fetcher.fetch_all_news()
         raw_news = news_data.get("_raw", [])
@@ -286,10 +357,20 @@ class DataGenerator:
 
             enriched_stocks.append(enriched_stock)
 
-        # 6. 保存静态文件（原子性写入，确保数据一致性）
+        # 6. 批量计算技术指标（所有股票一次向量化计算）
+        self._report("indicators")
+        self._attach_indicators(stock_details)
+
+        # 7. 保存静态文件（原子性写入，确保数据一致性）
+        self._report("save")
         timestamp = datetime.now().isoformat()
         success_count = len([s for s in enriched_stocks if s.get("sentiment_score") is not None])
         failed_count = len(enriched_stocks) - success_count
+        self.stats.update(
+            total_stocks=len(enriched_stocks),
+            success_count=success_count,
+            failed_count=failed_count
+        )
 
         # 热门股票列表（包含元数据）
         hot_stocks_data = {
@@ -303,6 +384,9 @@ class DataGenerator:
         _atomic_write_json(hot_stocks_file, hot_stocks_data)
         logger.info(f"保存热门股票: {hot_stocks_file} (成功: {success_count}, 失败: {failed_count})")
 
+        # 排行榜索引（排序下标、百分位、标签倒排表）
+        self._save_rankings(DATA_DIR, enriched_stocks, timestamp)
+
         # 股票详情文件
         for code, detail in stock_details.items():
             detail_file = DATA_DIR / f"stock_{code}.json"
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""技术指标引擎 - 基于 NumPy 的批量向量化计算
+
+所有股票的 K线右对齐、左侧用 NaN 补齐后堆叠为 (股票数, 交易日数) 的矩阵，
+一次遍历即可算出全部股票的指标；历史长度不足的位置输出 None。
+
+支持的指标组:
+    ma        MA5 / MA10 / MA20
+    ema       EMA12 / EMA26
+    macd      DIF / DEA / 柱（2 * (DIF - DEA)）
+    rsi       RSI14（Wilder 平滑，以前 14 个涨跌幅的简单平均为初值）
+    boll      布林带（20 日, 2 倍标准差）
+    atr       ATR14（Wilder 平滑，以前 14 个真实波幅的简单平均为初值）
+    volume_z  成交量 20 日 Z 分数
+"""
+from typing import Optional
+
+import numpy as np
+
+# 指标组 -> 输出字段
+INDICATOR_GROUPS: dict[str, list[str]] = {
+    "ma": ["ma5", "ma10", "ma20"],
+    "ema": ["ema12", "ema26"],
+    "macd": ["macd_dif", "macd_dea", "macd_hist"],
+    "rsi": ["rsi14"],
+    "boll": ["boll_mid", "boll_upper", "boll_lower"],
+    "atr": ["atr14"],
+    "volume_z": ["volume_z20"],
+}
+
+_PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def stack_klines(klines: list[list[dict]]) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """
+    将多只股票的 K线堆叠为右对齐的矩阵
+
+    Args:
+        klines: 每只股票的日 K 列表（按日期升序）
+
+    Returns:
+        ({字段: (N, T) 矩阵}, 每只股票的 K线长度)
+    """
+    lengths = np.array([len(k) for k in klines], dtype=int)
+    n = len(klines)
+    t = int(lengths.max()) if n else 0
+
+    # 每个字段先展平为长度 M 的向量，再按 (行, 列) 下标一次性散射到右对齐矩阵
+    total = int(lengths.sum())
+    rows = np.repeat(np.arange(n), lengths)
+    starts = np.cumsum(lengths) - lengths
+    cols = np.arange(total) - np.repeat(starts, lengths) + np.repeat(t - lengths, lengths)
+
+    arrays = {}
+    for field in _PRICE_FIELDS:
+        flat = np.fromiter(
+            (b.get(field) or 0.0 for bars in klines for b in bars), dtype=float, count=total
+        )
+        matrix = np.full((n, t), np.nan)
+        matrix[rows, cols] = flat
+        arrays[field] = matrix
+
+    return arrays, lengths
+
+
+def valid_counts(x: np.ndarray) -> np.ndarray:
+    """每个位置（含）之前的累计有效样本数"""
+    return np.cumsum(~np.isnan(x), axis=1)
+
+
+def rolling_mean(x: np.ndarray, window: int, counts: Optional[np.ndarray] = None) -> np.ndarray:
+    """沿时间轴的滑动均值（累计有效样本不足窗口时为 NaN）"""
+    if counts is None:
+        counts = valid_counts(x)
+    csum = np.cumsum(np.nan_to_num(x, nan=0.0), axis=1)
+
+    wsum = np.empty_like(csum)
+    wsum[:, :window] = csum[:, :window]
+    np.subtract(csum[:, window:], csum[:, :-window], out=wsum[:, window:])
+    wsum /= window
+
+    return np.where(counts >= window, wsum, np.nan)
+
+
+def rolling_std(x: np.ndarray, window: int, counts: Optional[np.ndarray] = None) -> np.ndarray:
+    """沿时间轴的滑动总体标准差（ddof=0）"""
+    if counts is None:
+        counts = valid_counts(x)
+    mean = rolling_mean(x, window, counts)
+    mean_sq = rolling_mean(x * x, window, counts)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def ema(
+    x: np.ndarray,
+    alpha: float,
+    min_periods: int = 1,
+    counts: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    指数移动平均（以每行第一个有效值为初值，按时间步向量化递推）
+
+    要求缺失值只出现在每行左侧（stack_klines 的右对齐布局）。
+
+    Args:
+        x: (N, T) 矩阵
+        alpha: 平滑系数
+        min_periods: 至少需要的有效样本数，不足时输出 NaN
+        counts: 预先计算的 valid_counts(x)（可选）
+    """
+    n, t = x.shape
+    if t == 0:
+        return x.copy()
+    if counts is None:
+        counts = valid_counts(x)
+
+    # 左侧缺失值用首个有效值回填：常数前缀的 EMA 恒等于该值，等价于以首个有效值为初值
+    first = np.minimum(t - counts[:, -1], t - 1)
+    seed = x[np.arange(n), first]
+    filled = np.where(counts == 0, seed[:, None], x)
+
+    # 转置为 (T, N) 连续内存，逐时间步对所有股票同时递推
+    scaled = np.ascontiguousarray(filled.T) * alpha
+    out = np.empty_like(scaled)
+    out[0] = scaled[0] / alpha
+    decay = 1.0 - alpha
+    for j in range(1, t):
+        np.multiply(out[j - 1], decay, out=out[j])
+        out[j] += scaled[j]
+
+    return np.where(counts >= max(min_periods, 1), out.T, np.nan)
+
+
+def wilder(x: np.ndarray, period: int, counts: np.ndarray) -> np.ndarray:
+    """
+    Wilder 平滑：以前 period 个有效值的简单平均为初值，之后 avg = (avg * (period - 1) + x) / period
+
+    要求缺失值只出现在每行左侧；有效样本不足 period 个的位置输出 NaN。
+
+    Args:
+        x: (N, T) 矩阵
+        period: 平滑周期
+        counts: valid_counts(x)
+    """
+    n, t = x.shape
+    if t == 0:
+        return x.copy()
+
+    filled = np.nan_to_num(x, nan=0.0)
+    window = np.cumsum(filled, axis=1)
+    window[:, period:] -= window[:, :-period].copy()
+    # 每行恰好有 period 个有效值的位置用窗口均值作初值
+    seed = np.where(counts == period, window / period, np.nan).T
+    is_seed = (counts == period).T
+
+    xt = np.ascontiguousarray(filled.T) / period
+    out = np.empty((t, n))
+    prev = np.full(n, np.nan)
+    decay = (period - 1) / period
+    for j in range(t):
+        prev = np.where(is_seed[j], seed[j], prev * decay + xt[j])
+        out[j] = prev
+    return out.T
+
+
+def _rsi(close: np.ndarray, counts: np.ndarray, period: int = 14) -> np.ndarray:
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+    # 首个有效价格没有涨跌幅
+    delta_counts = np.maximum(counts - 1, 0)
+
+    avg_gain = wilder(gain, period, delta_counts)
+    avg_loss = wilder(loss, period, delta_counts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # 无下跌时 RSI 为 100；价格不变（涨跌均为 0）时为 50
+    rsi = np.where(avg_loss == 0, 100.0, rsi)
+    return np.where((avg_loss == 0) & (avg_gain == 0), 50.0, rsi)
+
+
+def _atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    counts: np.ndarray,
+    period: int = 14
+) -> np.ndarray:
+    prev_close = np.empty_like(close)
+    prev_close[:, 0] = np.nan
+    prev_close[:, 1:] = close[:, :-1]
+    # 首个交易日没有昨收，fmax 忽略 NaN，真实波幅退化为 high - low
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return wilder(tr, period, counts)
+
+
+def compute_indicators(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    批量计算全部指标
+
+    Args:
+        arrays: stack_klines 返回的 {字段: (N, T) 矩阵}
+
+    Returns:
+        {输出字段: (N, T) 矩阵}
+    """
+    close = arrays["close"]
+    high = arrays["high"]
+    low = arrays["low"]
+    volume = arrays["volume"]
+
+    # 所有价格字段的缺失位置一致（右对齐布局），有效样本数只需计算一次
+    counts = valid_counts(close)
+
+    result: dict[str, np.ndarray] = {}
+    result["ma5"] = rolling_mean(close, 5, counts)
+    result["ma10"] = rolling_mean(close, 10, counts)
+    result["ma20"] = rolling_mean(close, 20, counts)
+
+    ema12 = ema(close, 2.0 / 13, counts=counts)
+    ema26 = ema(close, 2.0 / 27, counts=counts)
+    result["ema12"] = ema12
+    result["ema26"] = ema26
+
+    dif = ema12 - ema26
+    dea = ema(dif, 2.0 / 10, counts=counts)
+    result["macd_dif"] = dif
+    result["macd_dea"] = dea
+    result["macd_hist"] = 2 * (dif - dea)
+
+    result["rsi14"] = _rsi(close, counts, 14)
+
+    mid = result["ma20"]
+    std = rolling_std(close, 20, counts)
+    result["boll_mid"] = mid
+    result["boll_upper"] = mid + 2 * std
+    result["boll_lower"] = mid - 2 * std
+
+    result["atr14"] = _atr(high, low, close, counts, 14)
+
+    vol_mean = rolling_mean(volume, 20, counts)
+    vol_std = rolling_std(volume, 20, counts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["volume_z20"] = np.where(vol_std > 0, (volume - vol_mean) / vol_std, np.nan)
+
+    return result
+
+
+def _to_rows(matrix: np.ndarray) -> list[list[Optional[float]]]:
+    """整矩阵转为嵌套列表（NaN -> None，保留 4 位小数）"""
+    rows = np.round(matrix, 4).astype(object)
+    rows[np.isnan(matrix)] = None
+    return rows.tolist()
+
+
+def compute_for_klines(klines: list[list[dict]]) -> list[dict]:
+    """
+    对多只股票的 K线批量计算指标，按股票拆分为列式结果
+
+    Args:
+        klines: 每只股票的日 K 列表（按日期升序）
+
+    Returns:
+        每只股票一个 {"date": [...], "ma5": [...], ...}，长度与其 K线一致
+    """
+    if not klines:
+        return []
+
+    arrays, lengths = stack_klines(klines)
+    indicators = compute_indicators(arrays)
+    t = arrays["close"].shape[1]
+
+    rows = {key: _to_rows(matrix) for key, matrix in indicators.items()}
+
+    results = []
+    for i, bars in enumerate(klines):
+        offset = t - int(lengths[i])
+        item = {"date": [b.get("date", "") for b in bars]}
+        for key, matrix_rows in rows.items():
+            item[key] = matrix_rows[i][offset:]
+        results.append(item)
+    return results
+
+
+def select_indicators(data: dict, names: Optional[list[str]] = None) -> dict:
+    """
+    按指标组筛选输出字段
+
+    Args:
+        data: compute_for_klines 的单只股票结果
+        names: 指标组名列表，None 表示全部
+
+    Raises:
+        ValueError: 包含未知指标组
+    """
+    if not names:
+        names = list(INDICATOR_GROUPS)
+
+    unknown = [n for n in names if n not in INDICATOR_GROUPS]
+    if unknown:
+        raise ValueError(f"未知指标: {', '.join(unknown)}，可选 {', '.join(INDICATOR_GROUPS)}")
+
+    selected = {"date": data.get("date", [])}
+    for name in names:
+        for key in INDICATOR_GROUPS[name]:
+            selected[key] = data.get(key, [])
+    return selected
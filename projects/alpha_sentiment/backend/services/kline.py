@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""K线查询服务 - 日期范围筛选、周期聚合与 LTTB 降采样
+
+输出为列式数组（每个字段一个列表），比逐条 dict 的体积更小、前端解析更快。
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 支持的聚合周期 -> pandas Period 频率（None 表示不聚合）
+INTERVALS = {"day": None, "week": "W", "month": "M"}
+
+KLINE_COLUMNS = ["date", "open", "high", "low", "close", "volume", "amount"]
+
+
+def _to_frame(bars: list[dict]) -> pd.DataFrame:
+    """将 K线列表转换为按日期升序排列的 DataFrame"""
+    df = pd.DataFrame(bars, columns=KLINE_COLUMNS)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"]).sort_values("date", kind="stable")
+    return df.reset_index(drop=True)
+
+
+def aggregate_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    按周期聚合 OHLCV（开盘取首、收盘取末、高低取极值、量额求和）
+
+    聚合后的 date 为该周期内最后一个交易日。
+    """
+    freq = INTERVALS[interval]
+    if freq is None or df.empty:
+        return df
+
+    keys = df["date"].dt.to_period(freq)
+    grouped = df.groupby(keys, sort=True)
+    return pd.DataFrame({
+        "date": grouped["date"].last(),
+        "open": grouped["open"].first(),
+        "high": grouped["high"].max(),
+        "low": grouped["low"].min(),
+        "close": grouped["close"].last(),
+        "volume": grouped["volume"].sum(),
+        "amount": grouped["amount"].sum(),
+    }).reset_index(drop=True)
+
+
+def lttb_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 降采样，返回保留点的下标
+
+    首尾点固定保留，中间每个桶选出与前一选中点、下一桶均值围成三角形面积最大的点。
+
+    Args:
+        y: 数值序列（x 轴取下标）
+        threshold: 目标点数
+    """
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold <= 2:
+        return np.array([0, n - 1])[:max(threshold, 0)]
+
+    x = np.arange(n, dtype=float)
+    # 中间 threshold - 2 个桶的边界（不含首尾点）
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 下一个桶的均值点（最后一个桶用末尾点）
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs(
+            (x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def query_kline(
+    bars: list[dict],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    interval: str = "day",
+    max_points: Optional[int] = None
+) -> dict:
+    """
+    查询 K线（范围筛选 -> 周期聚合 -> LTTB 降采样）
+
+    Args:
+        bars: 原始日 K 列表（KlineData.model_dump() 格式）
+        start: 起始日期 YYYY-MM-DD（含）
+        end: 结束日期 YYYY-MM-DD（含）
+        interval: 聚合周期 day/week/month
+        max_points: 最大返回点数（超过时按收盘价做 LTTB 降采样）
+
+    Returns:
+        列式数据 {"interval", "count", "date": [...], "open": [...], ...}
+
+    Raises:
+        ValueError: 参数不合法
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"不支持的周期: {interval}，可选 {', '.join(INTERVALS)}")
+    if max_points is not None and max_points < 2:
+        raise ValueError("max_points 至少为 2")
+
+    df = _to_frame(bars)
+
+    if start:
+        df = df[df["date"] >= pd.Timestamp(start)]
+    if end:
+        df = df[df["date"] <= pd.Timestamp(end)]
+
+    df = aggregate_ohlcv(df, interval)
+
+    downsampled = False
+    if max_points is not None and len(df) > max_points:
+        idx = lttb_indices(df["close"].to_numpy(dtype=float), max_points)
+        df = df.iloc[idx]
+        downsampled = True
+
+    return {
+        "interval": interval,
+        "count": len(df),
+        "downsampled": downsampled,
+        "date": df["date"].dt.strftime("%Y-%m-%d").tolist(),
+        "open": df["open"].astype(float).tolist(),
+        "high": df["high"].astype(float).tolist(),
+        "low": df["low"].astype(float).tolist(),
+        "close": df["close"].astype(float).tolist(),
+        "volume": df["volume"].astype("int64").tolist(),
+        "amount": df["amount"].astype(float).tolist(),
+    }
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""排行榜索引 - 每次数据生成时预计算排序下标、百分位和标签倒排表
+
+升序、降序和每个标签在每个字段上的排列都在构建时算好（并列值按股票代码升序，
+两个方向一致，翻页稳定），查询端只做切片，不需要重新排序。
+"""
+from itertools import chain, islice
+from typing import Optional
+
+# 支持排序的数值字段
+RANK_FIELDS = (
+    "heat",
+    "sentiment_score",
+    "rating_score",
+    "institution_ratio",
+    "attention_index",
+    "change",
+    "price",
+)
+
+# 写入索引的股票字段（排行榜响应只返回这些字段）
+ROW_FIELDS = ("code", "name", "tags") + RANK_FIELDS
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_ranking_index(stocks: list[dict]) -> dict:
+    """
+    构建排行榜索引
+
+    Args:
+        stocks: hot_stocks.json 中的股票列表（按热度排名）
+
+    Returns:
+        {
+            "rows": [精简后的股票记录],
+            "order": {字段: 按值升序排列的下标（不含空值，并列按代码升序）},
+            "order_desc": {字段: 按值降序排列的下标（不含空值，并列按代码升序）},
+            "missing": {字段: 空值的下标（保持热度顺序）},
+            "percentile": {字段: 每只股票的百分位（0-100，空值为 None）},
+            "tags": {标签: 下标列表（保持热度顺序）},
+            "tag_order": {"asc"/"desc": {字段: {标签: 排好序的下标（空值在后）}}},
+        }
+    """
+    import numpy as np
+
+    rows = [{field: stock.get(field) for field in ROW_FIELDS} for stock in stocks]
+    for row in rows:
+        row["tags"] = row["tags"] or []
+
+    codes = np.array([str(row["code"] or "") for row in rows])
+    order: dict[str, list[int]] = {}
+    order_desc: dict[str, list[int]] = {}
+    missing: dict[str, list[int]] = {}
+    percentile: dict[str, list[Optional[float]]] = {}
+
+    for field in RANK_FIELDS:
+        values = np.array(
+            [np.nan if (v := _to_float(row[field])) is None else v for row in rows],
+            dtype=float
+        )
+        valid = np.flatnonzero(~np.isnan(values))
+        # lexsort 以最后一个键为主键：值为主序，代码为次序
+        sorted_pos = valid[np.lexsort((codes[valid], values[valid]))]
+        order[field] = sorted_pos.tolist()
+        order_desc[field] = valid[np.lexsort((codes[valid], -values[valid]))].tolist()
+        missing[field] = np.flatnonzero(np.isnan(values)).tolist()
+
+        # 百分位：并列值取平均名次，最大值为 100
+        pct: list[Optional[float]] = [None] * len(rows)
+        if len(valid):
+            sorted_vals = values[sorted_pos]
+            lo = np.searchsorted(sorted_vals, values[valid], side="left")
+            hi = np.searchsorted(sorted_vals, values[valid], side="right") - 1
+            denom = max(len(valid) - 1, 1)
+            ranks = (lo + hi) / 2 / denom * 100 if len(valid) > 1 else np.full(len(valid), 100.0)
+            for pos, value in zip(valid.tolist(), np.round(ranks, 1).tolist()):
+                pct[pos] = value
+        percentile[field] = pct
+
+    tags: dict[str, list[int]] = {}
+    for pos, row in enumerate(rows):
+        for tag in row["tags"]:
+            postings = tags.setdefault(tag, [])
+            if not postings or postings[-1] != pos:
+                postings.append(pos)
+
+    # 每个标签在每个字段、每个方向上的排列：按全量排列过滤，空值保持热度顺序排在最后
+    tag_order: dict[str, dict[str, dict[str, list[int]]]] = {"asc": {}, "desc": {}}
+    for direction, ordered in (("asc", order), ("desc", order_desc)):
+        for field in RANK_FIELDS:
+            ranked: dict[str, list[int]] = {tag: [] for tag in tags}
+            for pos in chain(ordered[field], missing[field]):
+                for tag in dict.fromkeys(rows[pos]["tags"]):
+                    ranked[tag].append(pos)
+            tag_order[direction][field] = ranked
+
+    return {
+        "fields": list(RANK_FIELDS),
+        "rows": rows,
+        "order": order,
+        "order_desc": order_desc,
+        "missing": missing,
+        "percentile": percentile,
+        "tags": tags,
+        "tag_order": tag_order,
+    }
+
+
+def query_rankings(
+    index: dict,
+    by: str = "heat",
+    order: str = "asc",
+    tag: Optional[str] = None,
+    limit: int = 20
+) -> dict:
+    """
+    基于预计算索引查询排行榜
+
+    Args:
+        index: build_ranking_index 的结果
+        by: 排序字段
+        order: asc/desc（空值始终排在最后）
+        tag: 只返回带该标签的股票
+        limit: 返回数量
+
+    Returns:
+        {"by", "order", "tag", "total", "stocks": [...]}
+
+    Raises:
+        ValueError: 参数不合法
+    """
+    if by not in index["order"]:
+        raise ValueError(f"不支持的排序字段: {by}，可选 {', '.join(index['order'])}")
+    if order not in ("asc", "desc"):
+        raise ValueError("order 只能是 asc 或 desc")
+
+    limit = max(limit, 0)
+
+    if "tag_order" not in index:
+        # 旧版索引文件没有预排好的降序和标签排列，从精简记录重建
+        index = build_ranking_index(index["rows"])
+
+    if tag:
+        ranked = index["tag_order"][order][by].get(tag, [])
+        total = len(ranked)
+        top = ranked[:limit]
+    else:
+        sorted_pos = index["order"][by] if order == "asc" else index["order_desc"][by]
+        total = len(sorted_pos) + len(index["missing"][by])
+        top = list(islice(chain(sorted_pos, index["missing"][by]), limit))
+
+    rows = index["rows"]
+    percentile = index["percentile"]
+    result = []
+    for rank, pos in enumerate(top, 1):
+        item = dict(rows[pos])
+        item["rank"] = rank
+        item["percentile"] = {field: percentile[field][pos] for field in percentile}
+        result.append(item)
+
+    return {
+        "by": by,
+        "order": order,
+        "tag": tag,
+        "total": total,
+        "stocks": result,
+    }
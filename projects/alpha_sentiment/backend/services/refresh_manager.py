@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+"""刷新任务管理器 - 定时任务与手动刷新共用的单飞（single-flight）任务队列
+
+同一时刻最多只有一个数据刷新任务在运行：
+- 任务运行期间的重复刷新请求会合并到当前任务，返回同一个 job_id
+- 每个任务记录阶段、股票完成数/总数，并据此估算剩余时间（ETA）
+- 任务结束后写入运行台账（run_ledger），记录各阶段耗时、成功/失败数、重试与错误分类
+- 默认在独立的工作进程（spawn）中执行，进度与结果经队列回传；
+  pandas 解析等 CPU 密集工作不再与 API 请求争抢 GIL，工作进程崩溃或
+  超出内存上限也不会影响 API 进程
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+
+from ..config import DATA_DIR, LOG_LEVEL, REFRESH_ISOLATION, REFRESH_TIMEOUT, WORKER_MAX_MEMORY_MB
+from .run_ledger import RunLedger, classify_error
+
+logger = logging.getLogger(__name__)
+
+# 进度回调签名: (stage, done, total)
+ProgressCallback = Callable[[str, int, int], None]
+
+# 任务状态
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+
+
+def generate_static_data(
+    progress_callback: Optional[ProgressCallback] = None
+) -> tuple[bool, Optional[str], dict]:
+    """
+    生成静态数据文件（刷新任务的默认执行体）
+
+    Args:
+        progress_callback: 进度回调 (stage, done, total)
+
+    Returns:
+        (成功标志, 错误信息, 运行统计)
+    """
+    from .data_generator import DataGenerator
+
+    generator = None
+    try:
+        generator = DataGenerator(progress_callback=progress_callback)
+        success = generator.generate()
+        return success, None if success else "数据生成未完成，详见日志", generator.stats
+    except Exception as e:
+        error_msg = f"{type(e).__name__}: {str(e)}"
+        logger.error(f"数据生成异常: {error_msg}")
+        logger.debug(traceback.format_exc())
+        stats = generator.stats if generator is not None else {}
+        errors = stats.setdefault("error_categories", {})
+        category = classify_error(e)
+        errors[category] = errors.get(category, 0) + 1
+        return False, error_msg, stats
+
+
+def _unpack_result(result: tuple) -> tuple[bool, Optional[str], dict]:
+    """兼容只返回 (成功标志, 错误信息) 的执行体"""
+    success, error_msg, *rest = result
+    return success, error_msg, (rest[0] if rest else None) or {}
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """读取进程常驻内存（MB），仅支持 Linux（/proc）"""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _worker_main(runner: Callable, result_queue, log_level: str) -> None:
+    """工作进程入口：执行任务，经队列回传进度与结果"""
+    logging.basicConfig(
+        level=getattr(logging, log_level, logging.INFO),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    def progress(stage: str, done: int = 0, total: int = 0) -> None:
+        result_queue.put(("progress", stage, done, total))
+
+    try:
+        result = runner(progress)
+    except BaseException as e:
+        result = (False, f"{type(e).__name__}: {str(e)}", {"error_categories": {classify_error(e): 1}})
+    result_queue.put(("result", result))
+
+
+class RefreshJob:
+    """单个刷新任务的状态"""
+
+    def __init__(self, job_id: str, trigger: str):
+        self.job_id = job_id
+        self.trigger = trigger
+        self.status = STATUS_PENDING
+        self.stage = "queued"
+        self.stocks_done = 0
+        self.stocks_total = 0
+        self.coalesced = 0  # 合并进来的重复请求数
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.stage_started_at: Optional[datetime] = None
+        self.stage_durations: dict[str, float] = {}
+        self.stats: dict = {}  # 执行体返回的运行统计（成功/失败数、重试、错误分类）
+        self.future: Optional[Future] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (STATUS_SUCCESS, STATUS_FAILED)
+
+    def update_progress(self, stage: str, done: int = 0, total: int = 0) -> None:
+        """进度回调（由执行线程调用）"""
+        if stage != self.stage:
+            now = datetime.now()
+            self._close_stage(now)
+            self.stage = stage
+            self.stage_started_at = now
+        if stage == "stocks":
+            self.stocks_done = done
+            self.stocks_total = total
+
+    def _close_stage(self, now: datetime) -> None:
+        """累计当前阶段耗时"""
+        if self.stage_started_at is None:
+            return
+        elapsed = (now - self.stage_started_at).total_seconds()
+        self.stage_durations[self.stage] = round(self.stage_durations.get(self.stage, 0.0) + elapsed, 3)
+
+    def finish(self, success: bool, error: Optional[str], stats: Optional[dict] = None) -> None:
+        """标记任务结束"""
+        now = datetime.now()
+        self._close_stage(now)
+        self.stats = stats or {}
+        self.error = error
+        self.finished_at = now
+        self.stage = "done" if success else "failed"
+        self.stage_started_at = now
+        self.status = STATUS_SUCCESS if success else STATUS_FAILED
+
+    def eta_seconds(self) -> Optional[float]:
+        """根据个股阶段的平均耗时估算剩余秒数"""
+        if self.finished:
+            return 0.0
+        if self.stage != "stocks" or not self.stocks_done or not self.stage_started_at:
+            return None
+        elapsed = (datetime.now() - self.stage_started_at).total_seconds()
+        remaining = max(self.stocks_total - self.stocks_done, 0)
+        return round(elapsed / self.stocks_done * remaining, 1)
+
+    def to_dict(self) -> dict:
+        elapsed = None
+        if self.started_at:
+            end = self.finished_at or datetime.now()
+            elapsed = round((end - self.started_at).total_seconds(), 1)
+
+        return {
+            "job_id": self.job_id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "stage": self.stage,
+            "stocks_done": self.stocks_done,
+            "stocks_total": self.stocks_total,
+            "eta_seconds": self.eta_seconds(),
+            "elapsed_seconds": elapsed,
+            "coalesced": self.coalesced,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def to_record(self) -> dict:
+        """运行台账记录"""
+        duration = None
+        if self.started_at and self.finished_at:
+            duration = round((self.finished_at - self.started_at).total_seconds(), 3)
+
+        return {
+            "job_id": self.job_id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "started_at": (self.started_at or self.created_at).isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": duration,
+            "total_stocks": self.stats.get("total_stocks"),
+            "success_count": self.stats.get("success_count"),
+            "failed_count": self.stats.get("failed_count"),
+            "retry_count": self.stats.get("retry_count", 0),
+            "coalesced": self.coalesced,
+            "error": self.error,
+            "stage_durations": self.stage_durations,
+            "error_categories": self.stats.get("error_categories", {}),
+        }
+
+
+class RefreshJobManager:
+    """刷新任务管理器（单飞语义 + 进度追踪）"""
+
+    def __init__(
+        self,
+        runner: Callable[[ProgressCallback], tuple[bool, Optional[str]]] = generate_static_data,
+        max_history: int = 20,
+        isolation: str = REFRESH_ISOLATION,
+        timeout: float = REFRESH_TIMEOUT,
+        max_memory_mb: float = WORKER_MAX_MEMORY_MB,
+        ledger: Optional[RunLedger] = None
+    ):
+        """
+        Args:
+            runner: 任务执行体，接收进度回调，返回 (成功标志, 错误信息[, 运行统计])；
+                进程模式下必须是模块级函数（可被 pickle）
+            max_history: 保留的历史任务数
+            isolation: process（独立工作进程）/ thread（当前进程内线程）
+            timeout: 进程模式下单次任务超时秒数（0 表示不限制）
+            max_memory_mb: 进程模式下工作进程 RSS 上限（0 表示不限制）
+            ledger: 运行台账（None 表示不记录）
+        """
+        if isolation not in ("process", "thread"):
+            raise ValueError(f"不支持的执行方式: {isolation}")
+
+        self._runner = runner
+        self._max_history = max_history
+        self._isolation = isolation
+        self._timeout = timeout
+        self._max_memory_mb = max_memory_mb
+        self.ledger = ledger
+        # 单线程执行器：线程模式下直接执行任务，进程模式下负责监控工作进程
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refresh")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, RefreshJob]" = OrderedDict()
+        self._current: Optional[RefreshJob] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    def submit(self, trigger: str = "manual") -> tuple[RefreshJob, bool]:
+        """
+        提交刷新任务；已有任务运行时合并到该任务
+
+        Args:
+            trigger: 触发来源 (manual/schedule/initial)
+
+        Returns:
+            (任务, 是否新建)
+        """
+        with self._lock:
+            if self._current is not None and not self._current.finished:
+                self._current.coalesced += 1
+                logger.info(f"刷新任务 {self._current.job_id} 运行中，合并 {trigger} 请求")
+                return self._current, False
+
+            job = RefreshJob(uuid.uuid4().hex[:12], trigger)
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self._max_history:
+                self._jobs.popitem(last=False)
+            self._current = job
+            job.future = self._executor.submit(self._run, job)
+            logger.info(f"刷新任务 {job.job_id} 已创建（{trigger}）")
+            return job, True
+
+    def _run(self, job: RefreshJob) -> tuple[bool, Optional[str]]:
+        job.status = STATUS_RUNNING
+        job.started_at = datetime.now()
+        job.update_progress("starting")
+
+        try:
+            if self._isolation == "process":
+                result = self._run_in_process(job)
+            else:
+                result = self._runner(job.update_progress)
+            success, error_msg, stats = _unpack_result(result)
+        except Exception as e:
+            success, error_msg = False, f"{type(e).__name__}: {str(e)}"
+            stats = {"error_categories": {classify_error(e): 1}}
+
+        job.finish(success, error_msg, stats)
+
+        if success:
+            logger.info(f"刷新任务 {job.job_id} 完成")
+        else:
+            logger.error(f"刷新任务 {job.job_id} 失败: {error_msg}")
+
+        if self.ledger is not None:
+            try:
+                self.ledger.record(job.to_record())
+            except Exception as e:
+                logger.warning(f"写入运行台账失败: {e}")
+        return success, error_msg
+
+    def _run_in_process(self, job: RefreshJob) -> tuple:
+        """在独立工作进程中执行任务，监控进度、超时与内存"""
+        ctx = multiprocessing.get_context("spawn")
+        result_queue = ctx.Queue()
+        process = ctx.Process(
+            target=_worker_main,
+            args=(self._runner, result_queue, LOG_LEVEL),
+            name=f"refresh-{job.job_id}",
+            daemon=True
+        )
+        process.start()
+        self._process = process
+        logger.info(f"刷新任务 {job.job_id} 工作进程已启动 (pid={process.pid})")
+
+        deadline = time.monotonic() + self._timeout if self._timeout else None
+        result: Optional[tuple] = None
+        error_msg: Optional[str] = None
+        error_category = "crash"
+
+        try:
+            while result is None:
+                try:
+                    message = result_queue.get(timeout=0.5)
+                except queue.Empty:
+                    if not process.is_alive():
+                        # 进程已退出：再给队列一点时间把最后的消息送达
+                        try:
+                            message = result_queue.get(timeout=1.0)
+                        except queue.Empty:
+                            break
+                    else:
+                        message = None
+
+                if message is not None:
+                    if message[0] == "progress":
+                        job.update_progress(*message[1:])
+                    elif message[0] == "result":
+                        result = message[1]
+                        break
+
+                # 看门狗：超时或内存超限时终止工作进程
+                if deadline is not None and time.monotonic() > deadline:
+                    error_msg = f"刷新超时（>{self._timeout:.0f}秒），已终止工作进程"
+                    error_category = "timeout"
+                    break
+                rss = _rss_mb(process.pid) if self._max_memory_mb else None
+                if rss is not None and rss > self._max_memory_mb:
+                    error_msg = f"工作进程内存 {rss:.0f}MB 超出上限 {self._max_memory_mb:.0f}MB，已终止"
+                    error_category = "memory"
+                    break
+        finally:
+            process.join(timeout=10 if result is not None else 0)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+            result_queue.close()
+            self._process = None
+
+        if result is not None:
+            return result
+        error_msg = error_msg or f"刷新工作进程异常退出 (exitcode={process.exitcode})"
+        return False, error_msg, {"error_categories": {error_category: 1}}
+
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        """按 ID 查询任务"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def current(self) -> Optional[RefreshJob]:
+        """最近一次任务（可能已结束）"""
+        return self._current
+
+    def shutdown(self, wait: bool = False) -> None:
+        """关闭执行器并终止运行中的工作进程"""
+        process = self._process
+        if process is not None and process.is_alive():
+            logger.info(f"终止刷新工作进程 (pid={process.pid})")
+            process.terminate()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# 全局单例（调度器与 API 共用）
+refresh_manager = RefreshJobManager(ledger=RunLedger(DATA_DIR / "runs.db"))
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""刷新运行台账 - 每次刷新任务的耗时、计数与错误分类持久化到本地 SQLite
+
+用于按周观察上游接口变慢、失败率上升等趋势；查询端支持按触发来源、状态、
+时间范围筛选，并给出总耗时与各阶段耗时的分位数。
+"""
+import json
+import logging
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    job_id TEXT PRIMARY KEY,
+    trigger TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    duration_seconds REAL,
+    total_stocks INTEGER,
+    success_count INTEGER,
+    failed_count INTEGER,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    coalesced INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    stage_durations TEXT NOT NULL DEFAULT '{}',
+    error_categories TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+"""
+
+_JSON_COLUMNS = ("stage_durations", "error_categories")
+
+PERCENTILES = (50, 90, 99)
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    按异常类型归类错误（只看类名，不依赖 requests/akshare 等具体库）
+
+    Returns:
+        timeout / connection / http / parse / other
+    """
+    names = [cls.__name__ for cls in type(error).__mro__]
+    if any("Timeout" in n for n in names):
+        return "timeout"
+    if any("Connection" in n for n in names):
+        return "connection"
+    if any(n in ("HTTPError", "HTTPStatusError") for n in names):
+        return "http"
+    if isinstance(error, (ValueError, KeyError, TypeError, IndexError)):
+        return "parse"
+    return "other"
+
+
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    """最近秩法分位数（空列表返回 None）"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(max(math.ceil(pct / 100 * len(ordered)), 1), len(ordered))
+    return round(ordered[rank - 1], 2)
+
+
+def _summarize(values: list[float]) -> dict:
+    summary = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+    summary["max"] = round(max(values), 2) if values else None
+    return summary
+
+
+class RunLedger:
+    """刷新运行台账（SQLite，线程安全）"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    def record(self, run: dict) -> None:
+        """
+        写入（或覆盖）一条运行记录
+
+        Args:
+            run: RefreshJob.to_record() 的结果
+        """
+        row = dict(run)
+        for column in _JSON_COLUMNS:
+            row[column] = json.dumps(row.get(column) or {}, ensure_ascii=False)
+
+        columns = (
+            "job_id", "trigger", "status", "started_at", "finished_at", "duration_seconds",
+            "total_stocks", "success_count", "failed_count", "retry_count", "coalesced",
+            "error", "stage_durations", "error_categories",
+        )
+        placeholders = ", ".join("?" for _ in columns)
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO runs ({', '.join(columns)}) VALUES ({placeholders})",
+                        [row.get(c) for c in columns]
+                    )
+            finally:
+                conn.close()
+
+    def query(
+        self,
+        trigger: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 50
+    ) -> dict:
+        """
+        按条件查询运行记录并汇总分位数
+
+        Args:
+            trigger: 触发来源 (manual/schedule/initial)
+            status: 任务状态 (success/failed)
+            since: 起始时间（ISO 格式，含）
+            until: 结束时间（ISO 格式，不含）
+            limit: 返回的最近记录条数（汇总统计覆盖全部符合条件的记录）
+
+        Returns:
+            {"total", "summary": {...}, "runs": [...]}（runs 按开始时间倒序）
+        """
+        clauses, params = [], []
+        for column, value in (("trigger", trigger), ("status", status)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("started_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    f"SELECT * FROM runs {where} ORDER BY started_at DESC", params
+                ).fetchall()
+            finally:
+                conn.close()
+
+        runs = []
+        for row in rows:
+            run = dict(row)
+            for column in _JSON_COLUMNS:
+                run[column] = json.loads(run[column] or "{}")
+            runs.append(run)
+
+        return {
+            "total": len(runs),
+            "summary": self._aggregate(runs),
+            "runs": runs[:max(limit, 0)],
+        }
+
+    @staticmethod
+    def _aggregate(runs: list[dict]) -> dict:
+        """汇总成功率、总耗时/各阶段耗时分位数、重试与错误分类"""
+        durations = [r["duration_seconds"] for r in runs if r["duration_seconds"] is not None]
+
+        stage_values: dict[str, list[float]] = {}
+        error_categories: dict[str, int] = {}
+        for run in runs:
+            for stage, seconds in run["stage_durations"].items():
+                stage_values.setdefault(stage, []).append(seconds)
+            for category, count in run["error_categories"].items():
+                error_categories[category] = error_categories.get(category, 0) + count
+
+        succeeded = sum(1 for r in runs if r["status"] == "success")
+        return {
+            "count": len(runs),
+            "success_rate": round(succeeded / len(runs), 4) if runs else None,
+            "duration_seconds": _summarize(durations),
+            "stage_durations": {stage: _summarize(v) for stage, v in stage_values.items()},
+            "retry_count": sum(r["retry_count"] or 0 for r in runs),
+            "error_categories": error_categories,
+        }
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""A 股交易日历 - 本地休市表，供定时刷新和缓存过期判断使用
+
+交易日 = 周一至周五且不在休市表中（调休的周末补班日交易所同样休市）。
+休市表按交易所每年 12 月发布的次年休市安排更新；表外年份退化为仅排除周末。
+"""
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 收盘时间：此后抓取的数据才包含当日完整行情
+MARKET_CLOSE = time(15, 0)
+
+# 交易所休市安排（只列工作日）
+HOLIDAYS: dict[int, tuple[str, ...]] = {
+    2024: (
+        "2024-01-01",
+        "2024-02-09", "2024-02-12", "2024-02-13", "2024-02-14", "2024-02-15", "2024-02-16",
+        "2024-04-04", "2024-04-05",
+        "2024-05-01", "2024-05-02", "2024-05-03",
+        "2024-06-10",
+        "2024-09-16", "2024-09-17",
+        "2024-10-01", "2024-10-02", "2024-10-03", "2024-10-04", "2024-10-07",
+    ),
+    2025: (
+        "2025-01-01",
+        "2025-01-28", "2025-01-29", "2025-01-30", "2025-01-31", "2025-02-03", "2025-02-04",
+        "2025-04-04",
+        "2025-05-01", "2025-05-02", "2025-05-05",
+        "2025-06-02",
+        "2025-10-01", "2025-10-02", "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08",
+    ),
+    2026: (
+        "2026-01-01", "2026-01-02",
+        "2026-02-16", "2026-02-17", "2026-02-18", "2026-02-19", "2026-02-20", "2026-02-23",
+        "2026-04-06",
+        "2026-05-01", "2026-05-04", "2026-05-05",
+        "2026-06-19",
+        "2026-09-25",
+        "2026-10-01", "2026-10-02", "2026-10-05", "2026-10-06", "2026-10-07",
+    ),
+}
+
+_HOLIDAY_DATES = frozenset(
+    date.fromisoformat(d) for days in HOLIDAYS.values() for d in days
+)
+
+# 已提示过缺少休市表的年份（每年只告警一次）
+_warned_years: set[int] = set()
+
+
+def is_trading_day(day: date) -> bool:
+    """是否为交易日"""
+    if day.weekday() >= 5:
+        return False
+    if day.year not in HOLIDAYS and day.year not in _warned_years:
+        _warned_years.add(day.year)
+        logger.warning(f"交易日历缺少 {day.year} 年休市安排，仅按周末判断")
+    return day not in _HOLIDAY_DATES
+
+
+def previous_trading_day(day: date) -> date:
+    """严格早于 day 的最近一个交易日"""
+    day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def last_completed_session(now: Optional[datetime] = None) -> date:
+    """
+    最近一个已收盘的交易日
+
+    交易日 15:00 之后返回当天，否则返回上一个交易日。
+    """
+    now = now or datetime.now()
+    today = now.date()
+    if is_trading_day(today) and now.time() >= MARKET_CLOSE:
+        return today
+    return previous_trading_day(today)
+
+
+def is_data_fresh(updated_at: datetime, now: Optional[datetime] = None) -> bool:
+    """缓存数据是否生成于最近一个已完成交易日的收盘之后"""
+    return updated_at >= datetime.combine(last_completed_session(now), MARKET_CLOSE)
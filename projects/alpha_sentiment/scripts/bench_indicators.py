@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""技术指标引擎基准测试
+
+用法:
+    python -m scripts.bench_indicators
+    python scripts/bench_indicators.py --symbols 5000 --bars 250 --budget-ms 1000
+
+指标计算（不含堆叠与列表转换）超出预算时以非零状态码退出，可用于 CI 回归检查。
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backend.services.indicators import compute_for_klines, compute_indicators, stack_klines
+
+
+def make_klines(symbols: int, bars: int, seed: int = 0) -> list[list[dict]]:
+    """生成随机游走的日 K（长度在 bars/2 ~ bars 之间，模拟上市时间不同的股票）"""
+    rng = np.random.default_rng(seed)
+    klines = []
+    for _ in range(symbols):
+        length = int(rng.integers(bars // 2, bars + 1))
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+        volume = rng.integers(100_000, 10_000_000, length)
+        klines.append([
+            {
+                "date": f"d{i}",
+                "open": float(close[i]),
+                "high": float(close[i] * 1.01),
+                "low": float(close[i] * 0.99),
+                "close": float(close[i]),
+                "volume": int(volume[i]),
+            }
+            for i in range(length)
+        ])
+    return klines
+
+
+def best_of(func, repeat: int) -> float:
+    """多次运行取最快耗时（秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched indicator engine")
+    parser.add_argument("--symbols", type=int, default=5000, help="股票数量")
+    parser.add_argument("--bars", type=int, default=250, help="每只股票最多 K线条数")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="指标计算耗时预算（毫秒）")
+    args = parser.parse_args()
+
+    print(f"生成 {args.symbols} 只股票 x 最多 {args.bars} 根 K线...")
+    klines = make_klines(args.symbols, args.bars)
+
+    stack_time = best_of(lambda: stack_klines(klines), args.repeat)
+    arrays, _ = stack_klines(klines)
+    compute_time = best_of(lambda: compute_indicators(arrays), args.repeat)
+    total_time = best_of(lambda: compute_for_klines(klines), args.repeat)
+
+    print(f"  堆叠矩阵:   {stack_time * 1000:8.1f} ms")
+    print(f"  指标计算:   {compute_time * 1000:8.1f} ms")
+    print(f"  端到端:     {total_time * 1000:8.1f} ms（含堆叠与列表转换）")
+    print(f"  单只股票:   {compute_time / args.symbols * 1e6:8.1f} us")
+
+    if compute_time * 1000 > args.budget_ms:
+        print(f"[FAILED] 指标计算超出预算 {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"[OK] 指标计算在预算 {args.budget_ms:.0f} ms 以内")
+
+
+if __name__ == "__main__":
+    main()
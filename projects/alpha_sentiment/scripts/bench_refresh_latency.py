@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""刷新期间 API 延迟基准：对比线程模式与进程模式下 /api/health 的响应延迟
+
+用法:
+    python -m scripts.bench_refresh_latency
+    python scripts/bench_refresh_latency.py --duration 5 --interval-ms 20
+
+以纯 Python 的 CPU 密集任务模拟 pandas 解析阶段，分别在空闲、线程模式刷新、
+进程模式刷新三种情况下通过 ASGI 直接请求 /api/health，统计 p50/p99/最大延迟。
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from functools import partial
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def burn_runner(seconds: float, progress):
+    """模拟刷新任务：持有 GIL 的纯 Python 计算（进程模式需为模块级函数）"""
+    deadline = time.monotonic() + seconds
+    done = 0
+    while time.monotonic() < deadline:
+        sum(i * i for i in range(20000))
+        done += 1
+        progress("stocks", done, 0)
+    return True, None
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    k = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[k]
+
+
+async def sample_latency(app, duration: float, interval: float) -> list[float]:
+    """在 duration 秒内按固定间隔请求 /api/health，返回每次延迟（毫秒）"""
+    import httpx
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            resp = await client.get("/api/health")
+            latencies.append((time.perf_counter() - start) * 1000)
+            resp.raise_for_status()
+            await asyncio.sleep(interval)
+    return latencies
+
+
+def run_case(app, mode: str, duration: float, interval: float) -> list[float]:
+    from backend.services.refresh_manager import RefreshJobManager
+
+    manager = None
+    if mode != "idle":
+        # 模拟任务需覆盖整个采样窗口
+        runner = partial(burn_runner, duration + 1.0)
+        manager = RefreshJobManager(runner=runner, isolation=mode)
+        job, _ = manager.submit(trigger="bench")
+        # 进程模式需等待工作进程启动完成，避免把 spawn 开销计入采样
+        while job.stage in ("queued", "starting"):
+            time.sleep(0.05)
+
+    try:
+        return asyncio.run(sample_latency(app, duration, interval))
+    finally:
+        if manager is not None:
+            job.future.result()
+            manager.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API latency during refresh")
+    parser.add_argument("--duration", type=float, default=4.0, help="每种情况的采样秒数")
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="请求间隔（毫秒）")
+    args = parser.parse_args()
+
+    from backend.main import app
+
+    print(f"{'模式':<10}{'请求数':>8}{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for mode in ("idle", "thread", "process"):
+        latencies = run_case(app, mode, args.duration, args.interval_ms / 1000)
+        print(
+            f"{mode:<10}{len(latencies):>8}"
+            f"{percentile(latencies, 50):>10.2f}"
+            f"{percentile(latencies, 99):>10.2f}"
+            f"{max(latencies):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
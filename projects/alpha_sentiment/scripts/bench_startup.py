@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""API 进程冷启动导入耗时基准（基于 python -X importtime）
+
+用法:
+    python -m scripts.bench_startup
+    python scripts/bench_startup.py --top 15 --budget-ms 800
+
+检查项:
+    1. backend.main 的累计导入耗时（取多次运行的最小值）
+    2. 重量级依赖（akshare/pandas/numpy/openai）不应在 API 进程启动时被导入
+超出预算或出现重量级依赖时以非零状态码退出，可用于 CI 回归检查。
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 只应在刷新任务中导入的重量级模块
+HEAVY_MODULES = ("akshare", "pandas", "numpy", "openai")
+
+
+def measure_import(module: str = "backend.main") -> list[tuple[str, int, int]]:
+    """
+    在子进程中以 -X importtime 导入模块
+
+    Returns:
+        [(模块名, 自身耗时 us, 累计耗时 us)]
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr[-2000:]}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头
+        records.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API cold-start import time")
+    parser.add_argument("--module", default="backend.main", help="要导入的模块")
+    parser.add_argument("--runs", type=int, default=3, help="运行次数（取最小值）")
+    parser.add_argument("--top", type=int, default=10, help="显示累计耗时最高的模块数")
+    parser.add_argument("--budget-ms", type=float, default=None, help="累计导入耗时预算（毫秒）")
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.runs):
+        records = measure_import(args.module)
+        total = next(cum for name, _, cum in records if name == args.module)
+        if best is None or total < best[0]:
+            best = (total, records)
+
+    total_us, records = best
+    imported = {name for name, _, _ in records}
+    heavy = [m for m in HEAVY_MODULES if m in imported]
+
+    print(f"{args.module} 累计导入耗时: {total_us / 1000:.1f} ms（{args.runs} 次取最小）")
+    print(f"共导入 {len(records)} 个模块，累计耗时最高的 {args.top} 个:")
+    for name, self_us, cum_us in sorted(records, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cum_us / 1000:8.1f} ms  (自身 {self_us / 1000:6.1f} ms)  {name}")
+
+    failed = False
+    if heavy:
+        print(f"[FAILED] 启动时导入了重量级依赖: {', '.join(heavy)}")
+        failed = True
+    else:
+        print(f"[OK] 未导入重量级依赖 ({', '.join(HEAVY_MODULES)})")
+
+    if args.budget_ms is not None:
+        if total_us / 1000 > args.budget_ms:
+            print(f"[FAILED] 超出预算 {args.budget_ms:.0f} ms")
+            failed = True
+        else:
+            print(f"[OK] 在预算 {args.budget_ms:.0f} ms 以内")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Tests for the batched technical-indicator engine"""
+import time
+
+import numpy as np
+import pytest
+
+from backend.services.indicators import (
+    INDICATOR_GROUPS,
+    compute_for_klines,
+    compute_indicators,
+    select_indicators,
+    stack_klines,
+)
+
+
+def make_bars(closes, volumes=None):
+    """Build daily bars from a list of close prices"""
+    volumes = volumes or [1000] * len(closes)
+    return [
+        {
+            "date": f"2024-01-{i + 1:02d}",
+            "open": c,
+            "high": c + 1,
+            "low": c - 1,
+            "close": c,
+            "volume": v,
+            "amount": c * v,
+        }
+        for i, (c, v) in enumerate(zip(closes, volumes))
+    ]
+
+
+class TestStackKlines:
+    """Test suite for stack_klines"""
+
+    def test_right_aligned_padding(self):
+        """Test shorter series are left-padded with NaN"""
+        arrays, lengths = stack_klines([make_bars([1, 2, 3]), make_bars([5])])
+
+        assert list(lengths) == [3, 1]
+        assert arrays["close"].shape == (2, 3)
+        assert np.isnan(arrays["close"][1, :2]).all()
+        assert arrays["close"][1, 2] == 5
+
+
+class TestComputeIndicators:
+    """Test suite for indicator computation"""
+
+    def test_moving_average(self):
+        """Test MA5 matches a hand-computed mean"""
+        result = compute_for_klines([make_bars(list(range(1, 11)))])[0]
+
+        assert result["ma5"][:4] == [None] * 4
+        assert result["ma5"][4] == pytest.approx(3.0)
+        assert result["ma5"][-1] == pytest.approx(8.0)
+
+    def test_ema_seeded_with_first_value(self):
+        """Test EMA of a constant series stays constant"""
+        result = compute_for_klines([make_bars([7.0] * 30)])[0]
+
+        assert result["ema12"][0] == pytest.approx(7.0)
+        assert result["ema26"][-1] == pytest.approx(7.0)
+        assert result["macd_hist"][-1] == pytest.approx(0.0)
+
+    def test_rsi_bounds(self):
+        """Test RSI is 100 for a strictly rising series"""
+        result = compute_for_klines([make_bars(list(range(1, 31)))])[0]
+
+        assert result["rsi14"][13] is None
+        assert result["rsi14"][-1] == pytest.approx(100.0)
+
+    def test_rsi_matches_wilder_reference(self):
+        """Test RSI14 against the classic Wilder worked example (SMA-seeded averages)"""
+        closes = [
+            44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08, 45.89,
+            46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64, 46.21, 46.25,
+            45.71, 46.45, 45.78, 45.35, 44.03, 44.18, 44.22, 44.57, 43.42, 42.66, 43.13,
+        ]
+        expected = [
+            70.46, 66.25, 66.48, 69.35, 66.29, 57.92, 62.88, 63.21, 56.01, 62.34,
+            54.67, 50.39, 40.02, 41.49, 41.90, 45.50, 37.32, 33.09, 37.79,
+        ]
+        # 与更长的序列一起计算：该序列右对齐、左侧补 NaN，结果不受影响
+        result = compute_for_klines([make_bars(closes), make_bars([50.0] * 40)])[0]
+
+        assert result["rsi14"][:14] == [None] * 14
+        assert result["rsi14"][14:] == pytest.approx(expected, abs=0.01)
+
+    def test_rsi_flat_series(self):
+        """Test RSI is 50 when the price never changes"""
+        result = compute_for_klines([make_bars([7.0] * 30)])[0]
+
+        assert result["rsi14"][-1] == pytest.approx(50.0)
+
+    def test_atr_matches_wilder_reference(self):
+        """Test ATR14 is seeded with the mean of the first 14 true ranges, then Wilder-smoothed"""
+        closes = [10, 11, 13, 12, 12, 15, 14, 10, 11, 11, 12, 16, 15, 15, 17, 16, 20, 19]
+        # make_bars uses high = close + 1, low = close - 1, so TR = max(2, |close - prev_close| + 1):
+        # TR = 2, 2, 3, 2, 2, 4, 2, 5, 2, 2, 2, 5, 2, 2 | 3, 2, 5, 2
+        # ATR[13] = 37 / 14, then ATR = (ATR * 13 + TR) / 14
+        expected = [2.6429, 2.6684, 2.6206, 2.7906, 2.7341]
+        result = compute_for_klines([make_bars([float(c) for c in closes]), make_bars([50.0] * 30)])[0]
+
+        assert result["atr14"][:13] == [None] * 13
+        assert result["atr14"][13:] == pytest.approx(expected, abs=1e-4)
+
+    def test_atr_constant_range(self):
+        """Test ATR equals the constant high-low range for flat prices"""
+        result = compute_for_klines([make_bars([10.0] * 20)])[0]
+
+        assert result["atr14"][12] is None
+        assert result["atr14"][-1] == pytest.approx(2.0)
+
+    def test_bollinger_and_volume_z(self):
+        """Test Bollinger bands collapse and volume z-score is undefined for flat data"""
+        result = compute_for_klines([make_bars([10.0] * 25)])[0]
+
+        assert result["boll_upper"][-1] == pytest.approx(10.0)
+        assert result["boll_lower"][-1] == pytest.approx(10.0)
+        assert result["volume_z20"][-1] is None
+
+    def test_batch_matches_single(self):
+        """Test batching symbols of different lengths matches per-symbol results"""
+        long_bars = make_bars([10 + np.sin(i) for i in range(40)])
+        short_bars = make_bars([20 + np.cos(i) for i in range(25)])
+
+        batch = compute_for_klines([long_bars, short_bars])
+        single = compute_for_klines([short_bars])[0]
+
+        assert batch[1] == single
+        assert len(batch[0]["ma20"]) == 40
+        assert len(batch[1]["ma20"]) == 25
+
+    def test_empty_input(self):
+        """Test empty input returns empty output"""
+        assert compute_for_klines([]) == []
+
+
+class TestSelectIndicators:
+    """Test suite for select_indicators"""
+
+    def test_select_groups(self):
+        """Test selecting indicator groups returns only their fields"""
+        data = compute_for_klines([make_bars(list(range(1, 31)))])[0]
+
+        selected = select_indicators(data, ["macd", "rsi"])
+
+        assert set(selected) == {"date", "macd_dif", "macd_dea", "macd_hist", "rsi14"}
+
+    def test_select_all_by_default(self):
+        """Test no selection returns every group"""
+        data = compute_for_klines([make_bars(list(range(1, 31)))])[0]
+
+        selected = select_indicators(data)
+
+        expected = {"date"} | {key for keys in INDICATOR_GROUPS.values() for key in keys}
+        assert set(selected) == expected
+
+    def test_unknown_group(self):
+        """Test unknown group raises ValueError"""
+        with pytest.raises(ValueError):
+            select_indicators({"date": []}, ["kdj"])
+
+
+@pytest.mark.slow
+class TestIndicatorPerformance:
+    """Benchmark guard: thousands of symbols in well under a second"""
+
+    def test_batched_compute_speed(self):
+        """Test 3000 symbols x 250 bars computes within 1 second"""
+        rng = np.random.default_rng(0)
+        n, t = 3000, 250
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, (n, t)), axis=1))
+        arrays = {
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.integers(100_000, 1_000_000, (n, t)).astype(float),
+        }
+
+        start = time.perf_counter()
+        result = compute_indicators(arrays)
+        elapsed = time.perf_counter() - start
+
+        assert result["ma20"].shape == (n, t)
+        assert elapsed < 1.0
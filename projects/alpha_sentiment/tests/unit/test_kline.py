@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Tests for K-line query service (range, resampling, LTTB)"""
+import numpy as np
+import pytest
+
+from backend.services.kline import query_kline, lttb_indices
+
+
+def make_bars(dates, start_price=10.0):
+    """Build daily bars with increasing prices"""
+    bars = []
+    for i, date in enumerate(dates):
+        price = start_price + i
+        bars.append({
+            "date": date,
+            "open": price,
+            "high": price + 0.5,
+            "low": price - 0.5,
+            "close": price + 0.2,
+            "volume": 100 * (i + 1),
+            "amount": 1000.0 * (i + 1),
+        })
+    return bars
+
+
+@pytest.fixture
+def two_week_bars():
+    """Two trading weeks of daily bars (2024-01-01 is a Monday)"""
+    dates = [
+        "2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05",
+        "2024-01-08", "2024-01-09", "2024-01-10", "2024-01-11", "2024-01-12",
+    ]
+    return make_bars(dates)
+
+
+class TestQueryKline:
+    """Test suite for query_kline"""
+
+    def test_columnar_output(self, two_week_bars):
+        """Test daily output is columnar and complete"""
+        result = query_kline(two_week_bars)
+
+        assert result["interval"] == "day"
+        assert result["count"] == 10
+        assert result["date"][0] == "2024-01-01"
+        assert result["close"][0] == pytest.approx(10.2)
+        assert len(result["volume"]) == 10
+
+    def test_date_range(self, two_week_bars):
+        """Test from/to range is inclusive"""
+        result = query_kline(two_week_bars, start="2024-01-03", end="2024-01-08")
+
+        assert result["date"] == ["2024-01-03", "2024-01-04", "2024-01-05", "2024-01-08"]
+
+    def test_weekly_aggregation(self, two_week_bars):
+        """Test weekly OHLCV aggregation"""
+        result = query_kline(two_week_bars, interval="week")
+
+        assert result["count"] == 2
+        assert result["date"] == ["2024-01-05", "2024-01-12"]
+        assert result["open"][0] == 10.0
+        assert result["close"][0] == pytest.approx(14.2)
+        assert result["high"][0] == pytest.approx(14.5)
+        assert result["low"][0] == pytest.approx(9.5)
+        assert result["volume"][0] == 100 + 200 + 300 + 400 + 500
+
+    def test_monthly_aggregation(self, two_week_bars):
+        """Test monthly aggregation collapses to one bar"""
+        result = query_kline(two_week_bars, interval="month")
+
+        assert result["count"] == 1
+        assert result["volume"][0] == sum(100 * i for i in range(1, 11))
+
+    def test_max_points_downsamples(self, two_week_bars):
+        """Test max_points limits output and keeps endpoints"""
+        result = query_kline(two_week_bars, max_points=4)
+
+        assert result["count"] == 4
+        assert result["downsampled"] is True
+        assert result["date"][0] == "2024-01-01"
+        assert result["date"][-1] == "2024-01-12"
+
+    def test_invalid_interval(self, two_week_bars):
+        """Test unknown interval raises ValueError"""
+        with pytest.raises(ValueError):
+            query_kline(two_week_bars, interval="hour")
+
+    def test_empty_bars(self):
+        """Test empty input returns empty columns"""
+        result = query_kline([], interval="week")
+
+        assert result["count"] == 0
+        assert result["date"] == []
+
+
+class TestLttb:
+    """Test suite for LTTB downsampling"""
+
+    def test_keeps_peak(self):
+        """Test LTTB keeps a prominent spike"""
+        y = np.zeros(100)
+        y[37] = 50.0
+
+        idx = lttb_indices(y, 10)
+
+        assert len(idx) == 10
+        assert 37 in idx
+        assert idx[0] == 0 and idx[-1] == 99
+        assert list(idx) == sorted(idx)
+
+    def test_threshold_larger_than_data(self):
+        """Test no downsampling when threshold >= length"""
+        idx = lttb_indices(np.arange(5, dtype=float), 10)
+
+        assert list(idx) == [0, 1, 2, 3, 4]
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Tests for the precomputed ranking index"""
+import asyncio
+import json
+import os
+
+import pytest
+
+from backend.services.rankings import build_ranking_index, query_rankings
+
+
+@pytest.fixture
+def ranking_index():
+    """Ranking index over four stocks (heat order)"""
+    stocks = [
+        {"code": "000001", "name": "A", "heat": 1, "change": 2.5, "sentiment_score": 70,
+         "rating_score": 80.0, "tags": ["业绩预增", "行业龙头"]},
+        {"code": "000002", "name": "B", "heat": 2, "change": -1.0, "sentiment_score": None,
+         "tags": []},
+        {"code": "600000", "name": "C", "heat": 3, "change": 5.0, "sentiment_score": 40,
+         "rating_score": 60.0, "tags": ["业绩预增"]},
+        {"code": "600001", "name": "D", "heat": 4, "change": 0.0, "sentiment_score": 90,
+         "rating_score": 70.0, "tags": ["行业龙头"]},
+    ]
+    return build_ranking_index(stocks)
+
+
+class TestRankingIndex:
+    """Test suite for build_ranking_index"""
+
+    def test_sorted_order_and_missing(self, ranking_index):
+        """Test ascending order excludes null values"""
+        assert ranking_index["order"]["sentiment_score"] == [2, 0, 3]
+        assert ranking_index["missing"]["sentiment_score"] == [1]
+
+    def test_percentiles(self, ranking_index):
+        """Test percentile ranks range from 0 to 100"""
+        pct = ranking_index["percentile"]["change"]
+        assert pct == [66.7, 0.0, 100.0, 33.3]
+        assert ranking_index["percentile"]["sentiment_score"][1] is None
+
+    def test_tag_postings(self, ranking_index):
+        """Test tag posting lists keep heat order"""
+        assert ranking_index["tags"]["业绩预增"] == [0, 2]
+        assert ranking_index["tags"]["行业龙头"] == [0, 3]
+
+
+class TestQueryRankings:
+    """Test suite for query_rankings"""
+
+    def test_default_heat_order(self, ranking_index):
+        """Test default ranking follows heat"""
+        result = query_rankings(ranking_index)
+
+        assert [s["code"] for s in result["stocks"]] == ["000001", "000002", "600000", "600001"]
+        assert result["stocks"][0]["rank"] == 1
+
+    def test_desc_with_nulls_last(self, ranking_index):
+        """Test descending sort keeps nulls last"""
+        result = query_rankings(ranking_index, by="sentiment_score", order="desc")
+
+        assert [s["code"] for s in result["stocks"]] == ["600001", "000001", "600000", "000002"]
+        assert result["total"] == 4
+
+    def test_tag_filter(self, ranking_index):
+        """Test tag filter answers from posting list"""
+        result = query_rankings(ranking_index, by="change", order="desc", tag="业绩预增")
+
+        assert [s["code"] for s in result["stocks"]] == ["600000", "000001"]
+        assert result["total"] == 2
+        assert result["stocks"][0]["percentile"]["change"] == 100.0
+
+    def test_unknown_tag(self, ranking_index):
+        """Test unknown tag returns empty result"""
+        result = query_rankings(ranking_index, tag="不存在")
+
+        assert result["stocks"] == []
+        assert result["total"] == 0
+
+    def test_limit(self, ranking_index):
+        """Test limit truncates but total counts all"""
+        result = query_rankings(ranking_index, by="rating_score", order="desc", limit=2)
+
+        assert [s["code"] for s in result["stocks"]] == ["000001", "600001"]
+        assert result["total"] == 4
+
+    def test_ties_broken_by_code(self):
+        """Test equal values are ordered by code in both directions"""
+        stocks = [
+            {"code": code, "name": code, "heat": heat, "change": 1.0, "tags": ["T"]}
+            for code, heat in (("600002", 1), ("000003", 2), ("300001", 3))
+        ]
+        stocks.append({"code": "000001", "name": "X", "heat": 4, "change": 2.0, "tags": ["T"]})
+        index = build_ranking_index(stocks)
+
+        cases = {
+            "asc": ["000003", "300001", "600002", "000001"],
+            "desc": ["000001", "000003", "300001", "600002"],
+        }
+        for order, expected in cases.items():
+            plain = query_rankings(index, by="change", order=order)
+            tagged = query_rankings(index, by="change", order=order, tag="T")
+            assert [s["code"] for s in plain["stocks"]] == expected
+            assert [s["code"] for s in tagged["stocks"]] == expected
+
+    def test_tag_order_is_precomputed(self, ranking_index):
+        """Test tag queries slice a pre-sorted list with nulls last"""
+        ranked = ranking_index["tag_order"]["desc"]["sentiment_score"]["业绩预增"]
+        assert ranked == [0, 2]
+        assert ranking_index["tag_order"]["asc"]["rating_score"]["行业龙头"] == [3, 0]
+
+    def test_legacy_index_without_tag_order(self, ranking_index):
+        """Test an index file written before tag_order existed is rebuilt on query"""
+        legacy = {k: v for k, v in ranking_index.items() if k not in ("tag_order", "order_desc")}
+        result = query_rankings(legacy, by="change", order="desc", tag="业绩预增")
+
+        assert [s["code"] for s in result["stocks"]] == ["600000", "000001"]
+
+    def test_invalid_field(self, ranking_index):
+        """Test unknown field raises ValueError"""
+        with pytest.raises(ValueError):
+            query_rankings(ranking_index, by="unknown")
+
+    def test_invalid_order(self, ranking_index):
+        """Test invalid order raises ValueError"""
+        with pytest.raises(ValueError):
+            query_rankings(ranking_index, order="sideways")
+
+
+@pytest.fixture
+def rankings_api(tmp_path, monkeypatch, ranking_index):
+    """backend.main pointed at a temporary rankings.json, counting file reads"""
+    from backend import main
+
+    reads = []
+    read_json = main._read_json_with_retry
+
+    def counting_read(file_path, *args, **kwargs):
+        reads.append(file_path)
+        return read_json(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(main, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(main, "_read_json_with_retry", counting_read)
+    monkeypatch.setattr(main, "_json_cache", type(main._json_cache)())
+
+    path = tmp_path / "rankings.json"
+    path.write_text(json.dumps({"updated_at": "t1", **ranking_index}), encoding="utf-8")
+
+    def query(**kwargs):
+        params = {"by": "heat", "order": "asc", "tag": None, "limit": 20, **kwargs}
+        return asyncio.run(main.get_rankings(**params))
+
+    return main, path, reads, query
+
+
+class TestRankingsEndpoint:
+    """Test suite for the cached /api/rankings endpoint"""
+
+    def test_index_parsed_once(self, rankings_api):
+        """Test repeated requests reuse the parsed index"""
+        _, _, reads, query = rankings_api
+        first = query()
+        second = query(by="change", order="desc")
+
+        assert len(reads) == 1
+        assert first["updated_at"] == "t1"
+        assert [s["code"] for s in second["stocks"]][:2] == ["600000", "000001"]
+
+    def test_reload_after_rewrite(self, rankings_api):
+        """Test a rewritten file with a new mtime is re-read"""
+        _, path, reads, query = rankings_api
+        query()
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        path.write_text(json.dumps({**data, "updated_at": "t2"}), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert query()["updated_at"] == "t2"
+        assert len(reads) == 2
+
+    def test_legacy_index_rebuilt_once(self, rankings_api, monkeypatch):
+        """Test an index without tag_order is rebuilt at load time, not per request"""
+        main, path, _, query = rankings_api
+        data = json.loads(path.read_text(encoding="utf-8"))
+        legacy = {k: v for k, v in data.items() if k not in ("tag_order", "order_desc")}
+        path.write_text(json.dumps(legacy), encoding="utf-8")
+
+        from backend.services import rankings
+        builds = []
+        build = rankings.build_ranking_index
+
+        def counting_build(rows):
+            builds.append(len(rows))
+            return build(rows)
+
+        monkeypatch.setattr(rankings, "build_ranking_index", counting_build)
+        for _ in range(3):
+            result = query(by="change", order="desc", tag="业绩预增")
+
+        assert builds == [4]
+        assert [s["code"] for s in result["stocks"]] == ["600000", "000001"]
+
+    def test_missing_file(self, rankings_api):
+        """Test a missing rankings file returns 404"""
+        from fastapi import HTTPException
+
+        _, path, _, query = rankings_api
+        path.unlink()
+        with pytest.raises(HTTPException) as exc:
+            query()
+        assert exc.value.status_code == 404
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Tests for RefreshJobManager (single-flight refresh jobs)"""
+import os
+import threading
+import time
+
+import pytest
+
+from backend.services.refresh_manager import RefreshJobManager, RefreshJob
+
+
+# 进程模式下的执行体需为模块级函数（spawn 启动的子进程通过 pickle 引用）
+def _progress_runner(progress):
+    progress("stocks", 1, 2)
+    progress("stocks", 2, 2)
+    return True, None
+
+
+def _crashing_runner(progress):
+    os._exit(3)
+
+
+def _slow_runner(progress):
+    time.sleep(30)
+    return True, None
+
+
+def _hungry_runner(progress):
+    blob = bytearray(256 * 1024 * 1024)
+    time.sleep(30)
+    return True, len(blob)
+
+
+class TestRefreshJobManager:
+    """Test suite for RefreshJobManager"""
+
+    def test_submit_runs_job(self):
+        """Test a submitted job runs and reports success"""
+        manager = RefreshJobManager(runner=lambda progress: (True, None), isolation="thread")
+
+        job, created = manager.submit(trigger="manual")
+
+        assert created is True
+        assert job.future.result(timeout=5) == (True, None)
+        assert job.status == "success"
+        assert job.stage == "done"
+        assert manager.get(job.job_id) is job
+        manager.shutdown()
+
+    def test_duplicate_requests_coalesce(self):
+        """Test requests during a running job join that job"""
+        release = threading.Event()
+
+        def runner(progress):
+            release.wait(timeout=5)
+            return True, None
+
+        manager = RefreshJobManager(runner=runner, isolation="thread")
+        first, created_first = manager.submit(trigger="schedule")
+        second, created_second = manager.submit(trigger="manual")
+
+        assert created_first is True
+        assert created_second is False
+        assert second.job_id == first.job_id
+        assert first.coalesced == 1
+
+        release.set()
+        first.future.result(timeout=5)
+
+        third, created_third = manager.submit(trigger="manual")
+        assert created_third is True
+        assert third.job_id != first.job_id
+        third.future.result(timeout=5)
+        manager.shutdown()
+
+    def test_runner_exception_marks_failed(self):
+        """Test runner exceptions are captured as failed jobs"""
+        def runner(progress):
+            raise RuntimeError("boom")
+
+        manager = RefreshJobManager(runner=runner, isolation="thread")
+        job, _ = manager.submit()
+
+        success, error = job.future.result(timeout=5)
+        assert success is False
+        assert "boom" in error
+        assert job.status == "failed"
+        assert job.to_dict()["error"] == error
+        manager.shutdown()
+
+    def test_progress_reporting(self):
+        """Test progress callback updates stage and stock counters"""
+        seen = {}
+
+        def runner(progress):
+            progress("stocks", 0, 4)
+            progress("stocks", 2, 4)
+            seen.update(manager.current.to_dict())
+            return True, None
+
+        manager = RefreshJobManager(runner=runner, isolation="thread")
+        job, _ = manager.submit()
+        job.future.result(timeout=5)
+
+        assert seen["stage"] == "stocks"
+        assert seen["stocks_done"] == 2
+        assert seen["stocks_total"] == 4
+        assert seen["eta_seconds"] is not None
+        manager.shutdown()
+
+    def test_history_is_bounded(self):
+        """Test old jobs are evicted beyond max_history"""
+        manager = RefreshJobManager(runner=lambda progress: (True, None), max_history=2, isolation="thread")
+        jobs = []
+        for _ in range(3):
+            job, _ = manager.submit()
+            job.future.result(timeout=5)
+            jobs.append(job)
+
+        assert manager.get(jobs[0].job_id) is None
+        assert manager.get(jobs[2].job_id) is jobs[2]
+        manager.shutdown()
+
+
+class TestProcessIsolation:
+    """Test suite for RefreshJobManager in process mode"""
+
+    def test_process_runner_reports_progress(self):
+        """Test progress and result travel back from the worker process"""
+        manager = RefreshJobManager(runner=_progress_runner, isolation="process")
+        job, _ = manager.submit()
+
+        assert job.future.result(timeout=60) == (True, None)
+        assert job.status == "success"
+        assert job.stocks_done == 2
+        assert job.stocks_total == 2
+        manager.shutdown()
+
+    def test_worker_crash_marks_failed(self):
+        """Test a crashing worker fails the job without taking down the caller"""
+        manager = RefreshJobManager(runner=_crashing_runner, isolation="process")
+        job, _ = manager.submit()
+
+        success, error = job.future.result(timeout=60)
+        assert success is False
+        assert "exitcode=3" in error
+        assert job.status == "failed"
+
+        # 管理器仍可继续接收新任务
+        manager._runner = _progress_runner
+        job, created = manager.submit()
+        assert created is True
+        assert job.future.result(timeout=60) == (True, None)
+        manager.shutdown()
+
+    def test_timeout_terminates_worker(self):
+        """Test workers exceeding the timeout are terminated"""
+        manager = RefreshJobManager(runner=_slow_runner, isolation="process", timeout=1)
+        job, _ = manager.submit()
+
+        success, error = job.future.result(timeout=60)
+        assert success is False
+        assert "超时" in error
+        manager.shutdown()
+
+    def test_memory_limit_terminates_worker(self):
+        """Test workers exceeding the RSS limit are terminated"""
+        manager = RefreshJobManager(runner=_hungry_runner, isolation="process", max_memory_mb=128)
+        job, _ = manager.submit()
+
+        success, error = job.future.result(timeout=60)
+        assert success is False
+        assert "内存" in error
+        manager.shutdown()
+
+    def test_invalid_isolation_rejected(self):
+        """Test unknown isolation modes raise ValueError"""
+        with pytest.raises(ValueError):
+            RefreshJobManager(isolation="fiber")
+
+
+class TestRefreshJob:
+    """Test suite for RefreshJob"""
+
+    def test_eta_unknown_before_stock_stage(self):
+        """Test ETA is None until stocks start completing"""
+        job = RefreshJob("abc", "manual")
+        job.update_progress("prefetch")
+        assert job.eta_seconds() is None
+
+        job.update_progress("stocks", 0, 10)
+        assert job.eta_seconds() is None
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Tests for the refresh run ledger"""
+import socket
+
+from backend.services.refresh_manager import RefreshJobManager
+from backend.services.run_ledger import RunLedger, classify_error, percentile
+
+
+def _record(job_id, started_at, duration, status="success", trigger="schedule", **extra):
+    run = {
+        "job_id": job_id,
+        "trigger": trigger,
+        "status": status,
+        "started_at": started_at,
+        "finished_at": started_at,
+        "duration_seconds": duration,
+        "retry_count": 0,
+        "coalesced": 0,
+        "stage_durations": {"stocks": duration / 2},
+        "error_categories": {},
+    }
+    run.update(extra)
+    return run
+
+
+class TestRunLedger:
+    """Test suite for RunLedger"""
+
+    def test_record_and_filter(self, tmp_path):
+        """Test runs are persisted and filtered by trigger, status and time"""
+        ledger = RunLedger(tmp_path / "runs.db")
+        ledger.record(_record("a", "2025-03-03T15:30:00", 100))
+        ledger.record(_record("b", "2025-03-04T15:30:00", 200, status="failed",
+                              error_categories={"timeout": 2}))
+        ledger.record(_record("c", "2025-03-05T09:00:00", 300, trigger="manual"))
+
+        result = ledger.query()
+        assert result["total"] == 3
+        assert [r["job_id"] for r in result["runs"]] == ["c", "b", "a"]
+        assert result["runs"][1]["error_categories"] == {"timeout": 2}
+
+        assert [r["job_id"] for r in ledger.query(trigger="manual")["runs"]] == ["c"]
+        assert [r["job_id"] for r in ledger.query(status="failed")["runs"]] == ["b"]
+        window = ledger.query(since="2025-03-04", until="2025-03-05")
+        assert [r["job_id"] for r in window["runs"]] == ["b"]
+
+    def test_creates_missing_directory(self, tmp_path):
+        """Test the first write creates the ledger's parent directory"""
+        ledger = RunLedger(tmp_path / "nested" / "dir" / "runs.db")
+        ledger.record(_record("a", "2025-03-03T15:30:00", 100))
+        assert ledger.query()["total"] == 1
+
+    def test_summary_percentiles(self, tmp_path):
+        """Test aggregate percentiles cover all matching runs, not just the page"""
+        ledger = RunLedger(tmp_path / "runs.db")
+        for i in range(1, 11):
+            ledger.record(_record(f"r{i}", f"2025-03-{i:02d}T15:30:00", i * 10.0, retry_count=1))
+
+        result = ledger.query(limit=2)
+        summary = result["summary"]
+        assert len(result["runs"]) == 2
+        assert summary["count"] == 10
+        assert summary["success_rate"] == 1.0
+        assert summary["duration_seconds"]["p50"] == 50.0
+        assert summary["duration_seconds"]["p90"] == 90.0
+        assert summary["duration_seconds"]["max"] == 100.0
+        assert summary["stage_durations"]["stocks"]["p50"] == 25.0
+        assert summary["retry_count"] == 10
+
+    def test_record_overwrites_same_job(self, tmp_path):
+        """Test recording the same job twice keeps one row"""
+        ledger = RunLedger(tmp_path / "runs.db")
+        ledger.record(_record("a", "2025-03-03T15:30:00", 100))
+        ledger.record(_record("a", "2025-03-03T15:30:00", 120))
+        assert ledger.query()["runs"][0]["duration_seconds"] == 120
+
+
+class TestRunLedgerHelpers:
+    """Test suite for ledger helper functions"""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentile"""
+        assert percentile([], 50) is None
+        assert percentile([3.0], 99) == 3.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
+
+    def test_classify_error(self):
+        """Test exceptions are grouped by type name"""
+        assert classify_error(socket.timeout()) == "timeout"
+        assert classify_error(ConnectionResetError()) == "connection"
+        assert classify_error(KeyError("x")) == "parse"
+        assert classify_error(RuntimeError("x")) == "other"
+
+
+class TestManagerLedger:
+    """Test suite for RefreshJobManager ledger integration"""
+
+    def test_finished_jobs_are_recorded(self, tmp_path):
+        """Test the manager writes stage durations and runner stats"""
+        def runner(progress):
+            progress("prefetch")
+            progress("stocks", 1, 2)
+            stats = {"total_stocks": 2, "success_count": 1, "failed_count": 1,
+                     "retry_count": 3, "error_categories": {"connection": 1}}
+            return True, None, stats
+
+        ledger = RunLedger(tmp_path / "runs.db")
+        manager = RefreshJobManager(runner=runner, isolation="thread", ledger=ledger)
+        job, _ = manager.submit(trigger="manual")
+        assert job.future.result(timeout=5) == (True, None)
+        manager.shutdown()
+
+        run = ledger.query()["runs"][0]
+        assert run["job_id"] == job.job_id
+        assert run["trigger"] == "manual"
+        assert run["status"] == "success"
+        assert run["success_count"] == 1
+        assert run["failed_count"] == 1
+        assert run["retry_count"] == 3
+        assert run["error_categories"] == {"connection": 1}
+        assert set(run["stage_durations"]) == {"starting", "prefetch", "stocks"}
+
+    def test_runner_exception_is_categorized(self, tmp_path):
+        """Test failed runs record the error category"""
+        def runner(progress):
+            raise TimeoutError("upstream")
+
+        ledger = RunLedger(tmp_path / "runs.db")
+        manager = RefreshJobManager(runner=runner, isolation="thread", ledger=ledger)
+        job, _ = manager.submit()
+        job.future.result(timeout=5)
+        manager.shutdown()
+
+        run = ledger.query(status="failed")["runs"][0]
+        assert run["error_categories"] == {"timeout": 1}
+        assert "upstream" in run["error"]
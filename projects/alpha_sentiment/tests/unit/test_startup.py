@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Cold-start regression guard: the API process must not import heavy deps"""
+from scripts.bench_startup import HEAVY_MODULES, measure_import
+
+
+class TestStartupImports:
+    """Test suite for lazy loading of heavy modules"""
+
+    def test_api_import_skips_heavy_modules(self):
+        """Test importing backend.main does not pull in akshare/pandas/numpy/openai"""
+        imported = {name for name, _, _ in measure_import("backend.main")}
+
+        assert "backend.main" in imported
+        assert not [m for m in HEAVY_MODULES if m in imported]
+
+    def test_services_exports_still_resolve(self):
+        """Test lazy package exports load on first attribute access"""
+        import backend.services as services
+
+        assert services.DataGenerator.__name__ == "DataGenerator"
+        assert "DataFetcher" in dir(services)
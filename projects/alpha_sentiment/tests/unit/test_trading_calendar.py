@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Tests for the A-share trading calendar"""
+from datetime import date, datetime
+
+from backend.services.trading_calendar import (
+    is_data_fresh,
+    is_trading_day,
+    last_completed_session,
+    previous_trading_day,
+)
+
+
+class TestTradingCalendar:
+    """Test suite for trading-day helpers"""
+
+    def test_weekends_are_closed(self):
+        """Test Saturdays and Sundays are never trading days"""
+        assert is_trading_day(date(2025, 3, 8)) is False
+        assert is_trading_day(date(2025, 3, 9)) is False
+        assert is_trading_day(date(2025, 3, 10)) is True
+
+    def test_holidays_are_closed(self):
+        """Test weekday exchange holidays are not trading days"""
+        assert is_trading_day(date(2025, 10, 1)) is False
+        assert is_trading_day(date(2026, 2, 17)) is False
+        # 调休补班的周末交易所仍休市
+        assert is_trading_day(date(2025, 9, 28)) is False
+
+    def test_unknown_year_falls_back_to_weekdays(self):
+        """Test years outside the table only exclude weekends"""
+        assert is_trading_day(date(2031, 1, 1)) is True
+        assert is_trading_day(date(2031, 1, 4)) is False
+
+    def test_previous_trading_day_skips_holidays(self):
+        """Test previous trading day skips weekends and holidays"""
+        assert previous_trading_day(date(2025, 3, 10)) == date(2025, 3, 7)
+        assert previous_trading_day(date(2025, 10, 9)) == date(2025, 9, 30)
+
+    def test_last_completed_session(self):
+        """Test the session only counts as completed after the close"""
+        assert last_completed_session(datetime(2025, 3, 12, 10, 0)) == date(2025, 3, 11)
+        assert last_completed_session(datetime(2025, 3, 12, 15, 5)) == date(2025, 3, 12)
+        assert last_completed_session(datetime(2025, 3, 9, 20, 0)) == date(2025, 3, 7)
+
+
+class TestDataFreshness:
+    """Test suite for cache staleness checks"""
+
+    def test_friday_close_is_fresh_on_monday_morning(self):
+        """Test data from the last session's close is fresh over the weekend"""
+        cached = datetime(2025, 3, 7, 15, 40)
+        assert is_data_fresh(cached, datetime(2025, 3, 10, 9, 0)) is True
+
+    def test_fresh_across_holiday(self):
+        """Test data stays fresh through an exchange holiday"""
+        cached = datetime(2025, 9, 30, 16, 0)
+        assert is_data_fresh(cached, datetime(2025, 10, 8, 12, 0)) is True
+
+    def test_stale_after_new_session_closes(self):
+        """Test data becomes stale once a newer session has closed"""
+        cached = datetime(2025, 3, 7, 15, 40)
+        assert is_data_fresh(cached, datetime(2025, 3, 10, 15, 10)) is False
+
+    def test_intraday_data_is_stale(self):
+        """Test data fetched before the close does not cover that session"""
+        cached = datetime(2025, 3, 7, 11, 0)
+        assert is_data_fresh(cached, datetime(2025, 3, 8, 9, 0)) is False
@@ -22,6 +22,43 @@ PORT = int(os.getenv("SOLAR_NEWS_PORT", "5000"))
 WORKERS = int(os.getenv("SOLAR_NEWS_WORKERS", "4"))
 LOG_LEVEL = os.getenv("SOLAR_NEWS_LOG_LEVEL", "INFO")
 
+# 数据文件监视间隔（秒），检测到新文件后在后台重新加载
+WATCH_INTERVAL = float(os.getenv("SOLAR_NEWS_WATCH_INTERVAL", "2"))
+
+# 查询线程池大小：筛选、分页、归档查询和 JSON 序列化在线程池中执行，不占用事件循环
+QUERY_WORKERS = int(os.getenv("SOLAR_NEWS_QUERY_WORKERS", "4"))
+
+# 查询结果缓存条数（LRU，0 表示禁用）
+QUERY_CACHE_SIZE = int(os.getenv("SOLAR_NEWS_QUERY_CACHE_SIZE", "256"))
+
+# 历史新闻归档数据库（SQLite + FTS5），设为空字符串禁用归档
+ARCHIVE_DB = os.getenv("SOLAR_NEWS_ARCHIVE_DB", str(DATA_DIR / "news_archive.db"))
+
+# 翻译请求间隔（秒）：每个翻译提供方独立自适应调整，成功时缩短、被限流（429/5xx）时加倍
+TRANSLATE_INTERVAL = float(os.getenv("SOLAR_NEWS_TRANSLATE_INTERVAL", "2"))
+TRANSLATE_MIN_INTERVAL = float(os.getenv("SOLAR_NEWS_TRANSLATE_MIN_INTERVAL", "0.2"))
+TRANSLATE_MAX_INTERVAL = float(os.getenv("SOLAR_NEWS_TRANSLATE_MAX_INTERVAL", "60"))
+# 并发翻译线程数
+TRANSLATE_WORKERS = int(os.getenv("SOLAR_NEWS_TRANSLATE_WORKERS", "4"))
+# 翻译提供方优先顺序（逗号分隔）：批量翻译按此顺序尝试，逐条翻译时作为端点健康度相同时的顺序；
+# llm 使用下方 LLM 配置，未配置时自动跳过
+TRANSLATE_PROVIDERS = [
+    name.strip() for name in
+    os.getenv("SOLAR_NEWS_TRANSLATE_PROVIDERS", "llm,libretranslate,mymemory,simplytranslate").split(",")
+    if name.strip()
+]
+# LLM 翻译每批标题数
+TRANSLATE_LLM_BATCH_SIZE = int(os.getenv("SOLAR_NEWS_TRANSLATE_LLM_BATCH_SIZE", "40"))
+# 自定义翻译术语表（JSON 文件 {"英文术语": "中文译法"}），与内置术语表合并
+TRANSLATION_GLOSSARY_FILE = os.getenv("SOLAR_NEWS_TRANSLATION_GLOSSARY", "")
+
+# 翻译缓存（SQLite），按最久未访问淘汰；超过天数未访问的条目删除（0 表示不限）
+TRANSLATION_CACHE_DB = os.getenv("SOLAR_NEWS_TRANSLATION_CACHE_DB", str(DATA_DIR / "translation_cache.db"))
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("SOLAR_NEWS_TRANSLATION_CACHE_MAX_ENTRIES", "100000"))
+TRANSLATION_CACHE_MAX_AGE_DAYS = float(os.getenv("SOLAR_NEWS_TRANSLATION_CACHE_MAX_AGE_DAYS", "365"))
+# 新译文累积多少条提交一次
+TRANSLATION_CACHE_FLUSH_EVERY = int(os.getenv("SOLAR_NEWS_TRANSLATION_CACHE_FLUSH_EVERY", "50"))
+
 # LLM 配置（统一命名，两个项目共用）
 LLM_API_KEY = os.getenv("LLM_API_KEY", "")
 LLM_BASE_URL = os.getenv("LLM_BASE_URL", "")
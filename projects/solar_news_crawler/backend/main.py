@@ -2,10 +2,11 @@
 """FastAPI 应用入口"""
 import logging
 from contextlib import asynccontextmanager
+from typing import List, Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import FRONTEND_DIR, HOST, PORT, LOG_LEVEL
@@ -23,9 +24,11 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     logger.info("Solar News Crawler 启动中...")
+    news_service.start_watcher()
     start_scheduler()
     yield
     stop_scheduler()
+    news_service.shutdown()
 
 
 app = FastAPI(
@@ -52,20 +55,42 @@ async def health():
     return {"status": "ok"}
 
 
+def _parse_fields(fields: str) -> Optional[List[str]]:
+    """fields=title,date,link -> ["title", "date", "link"]"""
+    parsed = [f.strip() for f in fields.split(",") if f.strip()]
+    return parsed or None
+
+
 @app.get("/api/news")
 async def get_news(
     start_date: str = None,
     end_date: str = None,
     keyword: str = "",
-    source: str = ""
+    source: str = "",
+    limit: Optional[int] = Query(None, ge=0, le=1000, description="每页条数，不传返回全部，0 只返回统计"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    fields: str = Query("", description="返回字段，逗号分隔，如 title,date,source,link"),
+    scope: Optional[str] = Query(None, description="latest 最新数据 / archive 历史归档，不传时按 start_date 自动选择"),
+    sort: str = Query("date", description="date 按日期倒序 / relevance 按关键词相关度（BM25）"),
+    collapse: bool = Query(False, description="近似重复的新闻只返回一条")
 ):
     """国内新闻"""
-    return news_service.get_news(
-        start_date=start_date,
-        end_date=end_date,
-        keyword=keyword.strip() or None,
-        source=source.strip() or None
-    )
+    try:
+        payload = await news_service.get_news_json(
+            start_date=start_date,
+            end_date=end_date,
+            keyword=keyword.strip() or None,
+            source=source.strip() or None,
+            limit=limit,
+            cursor=cursor or None,
+            fields=_parse_fields(fields),
+            scope=scope or None,
+            sort=sort or None,
+            collapse=collapse
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=payload, media_type="application/json")
 
 
 @app.get("/api/news/stats")
@@ -73,20 +98,45 @@ async def get_news_stats():
     return news_service.get_news_stats()
 
 
+@app.get("/api/news/timeline")
+async def get_news_timeline(start_date: str = None, end_date: str = None):
+    """国内新闻按日 × 来源统计（用于趋势图）"""
+    try:
+        return news_service.get_news_timeline(start_date=start_date, end_date=end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/api/international")
 async def get_international_news(
     start_date: str = None,
     end_date: str = None,
     keyword: str = "",
-    source: str = ""
+    source: str = "",
+    limit: Optional[int] = Query(None, ge=0, le=1000, description="每页条数，不传返回全部，0 只返回统计"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    fields: str = Query("", description="返回字段，逗号分隔，如 title_translated,publish_date,source,url"),
+    scope: Optional[str] = Query(None, description="latest 最新数据 / archive 历史归档，不传时按 start_date 自动选择"),
+    sort: str = Query("date", description="date 按日期倒序 / relevance 按关键词相关度（BM25）"),
+    collapse: bool = Query(False, description="近似重复的新闻只返回一条")
 ):
     """国际新闻"""
-    return news_service.get_international_news(
-        start_date=start_date,
-        end_date=end_date,
-        keyword=keyword.strip() or None,
-        source=source.strip() or None
-    )
+    try:
+        payload = await news_service.get_international_news_json(
+            start_date=start_date,
+            end_date=end_date,
+            keyword=keyword.strip() or None,
+            source=source.strip() or None,
+            limit=limit,
+            cursor=cursor or None,
+            fields=_parse_fields(fields),
+            scope=scope or None,
+            sort=sort or None,
+            collapse=collapse
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=payload, media_type="application/json")
 
 
 @app.get("/api/international/stats")
@@ -94,10 +144,28 @@ async def get_international_stats():
     return news_service.get_international_stats()
 
 
+@app.get("/api/international/timeline")
+async def get_international_timeline(start_date: str = None, end_date: str = None):
+    """国际新闻按日 × 来源统计（用于趋势图）"""
+    try:
+        return news_service.get_international_timeline(start_date=start_date, end_date=end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """运行指标（查询缓存命中率、内存占用）"""
+    return news_service.get_metrics()
+
+
 @app.get("/api/summary/{news_type}")
-async def get_ai_summary(news_type: str):
+async def get_ai_summary(news_type: str, date: Optional[str] = Query(None, description="总结日期 YYYY-MM-DD，不传返回全部历史")):
     """AI总结 (domestic/international)"""
-    return news_service.get_ai_summary(news_type)
+    payload = news_service.get_ai_summary_payload(news_type, date)
+    if payload is not None:
+        return Response(content=payload, media_type="application/json")
+    return news_service.get_ai_summary(news_type, date)
 
 
 # ==================== 页面路由 ====================
@@ -162,6 +162,7 @@ def stop_scheduler():
     """停止调度器"""
     if scheduler.running:
         scheduler.shutdown()
+        translator_service.shutdown()
         print("调度器已停止")
 
 
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""翻译端点健康度 - EWMA 延迟 / 错误率 + 冷却
+
+每个端点（提供方 + URL）记录最近请求的指数加权平均延迟和错误率：
+- 尝试顺序按 延迟 / (1 - 错误率) 从小到大；还没有样本的端点需要先探测一次：
+  order() 在锁内为调用方预约第一个无人探测的未知端点并排在最前，其余未知端点排在最后，
+  因此每个未知主机同时只有一个线程在探测，不会让并发线程一起等待同一个不可用的主机；
+  没有可用的已知端点、未知端点又都已被预约时，order() 等待探测结果后再排序；
+  预约在探测结果记录后释放，超过 PROBE_TIMEOUT 秒未记录（请求未发出）的预约失效
+- 请求失败（网络错误、超时、非 2xx）后端点进入冷却，连续失败时冷却时间倍增；
+  冷却中的端点不参与排序，不会再等待已知不可用的主机
+- 请求成功清零连续失败次数
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# EWMA 平滑系数（新样本权重）
+EWMA_ALPHA = 0.3
+# 首次失败的冷却秒数，连续失败时倍增，直到上限
+COOLDOWN_BASE = 30.0
+COOLDOWN_MAX = 600.0
+# 探测预约的有效秒数（应大于单次请求的超时）
+PROBE_TIMEOUT = 120.0
+
+Endpoint = Tuple[str, str]
+
+
+class EndpointHealth:
+    """单个端点的健康度"""
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def record(self, success: bool, latency: float, now: float):
+        self.requests += 1
+        self.latency = latency if self.latency is None else (
+            EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+        )
+        self.error_rate = EWMA_ALPHA * (0.0 if success else 1.0) + (1 - EWMA_ALPHA) * self.error_rate
+        if success:
+            self.consecutive_failures = 0
+            self.cooldown_until = 0.0
+            return
+        self.failures += 1
+        self.consecutive_failures += 1
+        cooldown = min(COOLDOWN_BASE * 2 ** (self.consecutive_failures - 1), COOLDOWN_MAX)
+        self.cooldown_until = now + cooldown
+
+    def score(self) -> float:
+        """排序分值（越小越优先），没有样本为 0"""
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(1.0 - self.error_rate, 0.05)
+
+
+class EndpointHealthTracker:
+    """所有端点的健康度（线程安全）"""
+
+    def __init__(self):
+        self._health: Dict[Endpoint, EndpointHealth] = {}
+        # 还没有样本、已被预约探测的端点 -> 预约时间
+        self._probing: Dict[Endpoint, float] = {}
+        # 记录探测结果时唤醒等待的 order()
+        self._lock = threading.Condition()
+
+    def order(self, endpoints: Sequence[Endpoint]) -> List[Endpoint]:
+        """
+        可用端点按健康度排序，并为调用方预约至多一个未知端点的探测
+
+        Args:
+            endpoints: 候选端点（分值相同时保持该顺序）
+
+        Returns:
+            不在冷却中的端点，最优先的在前：预约到的未知端点、有样本的端点、其余未知端点
+        """
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                ranked, probing = [], []
+                reserved = False
+                for i, endpoint in enumerate(endpoints):
+                    health = self._health.get(endpoint)
+                    if health is None:
+                        probing_since = self._probing.get(endpoint)
+                        if not reserved and (probing_since is None or now - probing_since > PROBE_TIMEOUT):
+                            self._probing[endpoint] = now
+                            reserved = True
+                            ranked.append((float("-inf"), i, endpoint))
+                        else:
+                            probing.append(probing_since)
+                            ranked.append((float("inf"), i, endpoint))
+                    elif health.cooldown_until <= now:
+                        ranked.append((health.score(), i, endpoint))
+                ranked.sort()
+                if not ranked or ranked[0][0] != float("inf"):
+                    return [endpoint for _, _, endpoint in ranked]
+                # 候选端点都在被其他线程探测：等待探测结果（或预约失效）再排序
+                self._lock.wait(max(min(probing) + PROBE_TIMEOUT - now, 0.0))
+
+    def record(self, endpoint: Endpoint, success: bool, latency: float):
+        with self._lock:
+            self._probing.pop(endpoint, None)
+            health = self._health.setdefault(endpoint, EndpointHealth())
+            health.record(success, latency, time.monotonic())
+            self._lock.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """{"提供方 URL": 健康度}"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{provider} {url}": {
+                    "requests": health.requests,
+                    "failures": health.failures,
+                    "latency_ms": round(health.latency * 1000, 1) if health.latency is not None else None,
+                    "error_rate": round(health.error_rate, 3),
+                    "cooldown_seconds": round(max(health.cooldown_until - now, 0.0), 1),
+                }
+                for (provider, url), health in self._health.items()
+            }
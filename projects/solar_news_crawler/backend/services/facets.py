@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""分面索引 - 来源、日期、内容类型、分类的倒排表和计数
+
+随新闻集合一起构建（每个数据快照一次）：
+- 全量计数和按日 × 来源的时间线在构建时算好，统计接口直接返回
+- 筛选后的计数由命中位置与各分面值的倒排表求交集得到，不再逐条读取记录
+- 纯日期范围筛选的来源统计由按日计数累加得到，代价只与范围内的天数有关
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+# 分面字段 -> 缺失时的统计标签（None 表示缺失值不计入统计）
+FACET_FIELDS = {
+    "source": "Unknown",
+    "content_type": None,
+    "category": None,
+}
+
+
+def _facet_value(news: Dict, field: str) -> Optional[str]:
+    value = news.get(field)
+    if value is None or value == "":
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _day(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+
+class FacetIndex:
+    """分面倒排表（构建后只读）"""
+
+    def __init__(self, records: Sequence[Dict], ordinals: Sequence[Optional[int]], undated: Iterable[int]):
+        """
+        Args:
+            records: 排序后的新闻记录，下标即位置
+            ordinals: 每条记录的日期 ordinal（无法解析为 None）
+            undated: 无日期记录的位置（日期筛选时总是保留）
+        """
+        self._postings: Dict[str, Dict[Optional[str], Set[int]]] = {name: {} for name in FACET_FIELDS}
+        self._day_postings: Dict[int, Set[int]] = {}
+        # 日期 ordinal -> {来源: 条数}
+        self._day_sources: Dict[int, Dict[str, int]] = {}
+
+        for pos, news in enumerate(records):
+            for name in FACET_FIELDS:
+                self._postings[name].setdefault(_facet_value(news, name), set()).add(pos)
+
+            ordinal = ordinals[pos]
+            if ordinal is not None:
+                self._day_postings.setdefault(ordinal, set()).add(pos)
+                sources = self._day_sources.setdefault(ordinal, {})
+                src = self._label("source", _facet_value(news, "source"))
+                sources[src] = sources.get(src, 0) + 1
+
+        # 全量计数（按记录顺序首次出现排列）
+        self._counts: Dict[str, Dict[str, int]] = {
+            name: self._count_all(name, records) for name in FACET_FIELDS
+        }
+        self._days: List[int] = sorted(self._day_postings)
+        self._undated_sources: Dict[str, int] = self.counts("source", list(undated))
+
+        # 时间线（按日期升序），构建一次，请求时只做切片
+        self._timeline: List[Dict[str, Any]] = [
+            {
+                "date": _day(ordinal),
+                "total": sum(self._day_sources[ordinal].values()),
+                "sources": self._day_sources[ordinal],
+            }
+            for ordinal in self._days
+        ]
+        self.sources: List[str] = list(self._counts["source"])
+
+    @staticmethod
+    def _label(name: str, value: Optional[str]) -> Optional[str]:
+        return FACET_FIELDS[name] if value is None else value
+
+    def _count_all(self, name: str, records: Sequence[Dict]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for news in records:
+            label = self._label(name, _facet_value(news, name))
+            if label is not None:
+                counts[label] = counts.get(label, 0) + 1
+        return counts
+
+    def postings(self, name: str, value: str) -> Set[int]:
+        """分面值对应的记录位置集合"""
+        return self._postings[name].get(value, set())
+
+    def counts(self, name: str, positions: Optional[Sequence[int]] = None) -> Dict[str, int]:
+        """
+        分面计数
+
+        Args:
+            name: 分面名（source / content_type / category / day）
+            positions: 筛选后的记录位置，None 表示全部记录
+
+        Returns:
+            {分面值: 条数}，不含零计数
+        """
+        if name == "day":
+            postings = {_day(ordinal): p for ordinal, p in self._day_postings.items()}
+        else:
+            if positions is None:
+                return dict(self._counts[name])
+            postings = self._postings[name]
+
+        if positions is None:
+            return {value: len(p) for value, p in postings.items()}
+
+        selected = set(positions)
+        counts: Dict[str, int] = {}
+        for value, p in postings.items():
+            label = value if name == "day" else self._label(name, value)
+            if label is None:
+                continue
+            hit = len(selected & p)
+            if hit:
+                counts[label] = counts.get(label, 0) + hit
+        return counts
+
+    def range_source_counts(self, start: int, end: int) -> Dict[str, int]:
+        """日期范围 [start, end]（含无日期记录）内的来源计数，由按日计数累加"""
+        counts = dict(self._undated_sources)
+        for ordinal in self._days[bisect_left(self._days, start):bisect_right(self._days, end)]:
+            for src, n in self._day_sources[ordinal].items():
+                counts[src] = counts.get(src, 0) + n
+        return counts
+
+    def timeline(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """按日 × 来源的计数（日期升序），可按 ordinal 范围截取"""
+        lo = 0 if start is None else bisect_left(self._days, start)
+        hi = len(self._days) if end is None else bisect_right(self._days, end)
+        return self._timeline[lo:hi]
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""LLM 批量翻译后端
+
+使用 backend/config.py 中配置的 LLM（OpenAI 兼容的 /chat/completions 接口，JSON 模式），
+一次请求翻译一批标题：
+- 输入是带序号的 JSON 数组，输出按序号对应回原文，缺失或多余的序号不会错位
+- 提示词中注入本批标题涉及的光伏行业术语表，保证术语译法一致；
+  可用 SOLAR_NEWS_TRANSLATION_GLOSSARY 指定 JSON 文件（{"英文术语": "中文译法"}）补充或覆盖
+- 只负责构造请求和解析响应，HTTP 请求由翻译服务统一发送（共用限速、端点健康度和缓存）
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.config import LLM_API_KEY, LLM_BASE_URL, LLM_ENABLED, LLM_MODEL, TRANSLATION_GLOSSARY_FILE
+
+# 光伏行业术语表（英文术语 -> 中文译法）
+GLOSSARY: Dict[str, str] = {
+    "PERC": "PERC（钝化发射极及背面接触）",
+    "TOPCon": "TOPCon（隧穿氧化层钝化接触）",
+    "HJT": "HJT（异质结）",
+    "heterojunction": "异质结",
+    "IBC": "IBC（背接触）",
+    "perovskite": "钙钛矿",
+    "tandem": "叠层",
+    "bifacial": "双面",
+    "polysilicon": "多晶硅",
+    "wafer": "硅片",
+    "module": "组件",
+    "inverter": "逆变器",
+    "tracker": "跟踪支架",
+    "curtailment": "弃电（限电）",
+    "grid parity": "平价上网",
+    "capacity factor": "容量系数",
+    "levelized cost of electricity": "平准化度电成本",
+    "LCOE": "LCOE（平准化度电成本）",
+    "feed-in tariff": "上网电价补贴",
+    "power purchase agreement": "购电协议",
+    "PPA": "PPA（购电协议）",
+    "utility-scale": "公用事业规模",
+    "rooftop solar": "屋顶光伏",
+    "distributed generation": "分布式发电",
+    "energy storage": "储能",
+    "BESS": "BESS（电池储能系统）",
+    "green hydrogen": "绿氢",
+    "IRENA": "国际可再生能源署（IRENA）",
+    "IEA": "国际能源署（IEA）",
+    "Energy Transition Accelerator Financing": "能源转型加速器融资平台",
+    "ETAF": "ETAF（能源转型加速器融资平台）",
+    "Climate Investment Platform": "气候投资平台",
+    "SIDS Lighthouses Initiative": "小岛屿发展中国家灯塔倡议",
+    "Coalition for Action": "行动联盟",
+    "World Energy Transitions Outlook": "《世界能源转型展望》",
+    "Renewable Capacity Statistics": "《可再生能源装机容量统计》",
+    "Renewable Power Generation Costs": "《可再生能源发电成本》",
+    "World Energy Outlook": "《世界能源展望》",
+}
+
+_SYSTEM_PROMPT = """你是光伏和可再生能源行业的专业翻译。将用户给出的英文新闻标题翻译成简体中文。
+要求：
+1. 译文准确、简洁，符合中文新闻标题习惯，不要添加解释
+2. 公司名、产品型号保留英文原文
+3. 术语表中的术语必须使用给定译法
+4. 只输出 JSON：{"translations": [{"id": 序号, "text": "译文"}]}，每个输入序号对应一条"""
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def load_glossary(path: Optional[str] = TRANSLATION_GLOSSARY_FILE) -> Dict[str, str]:
+    """内置术语表，合并自定义术语表文件"""
+    glossary = dict(GLOSSARY)
+    if not path:
+        return glossary
+    try:
+        with open(Path(path), "r", encoding="utf-8") as f:
+            extra = json.load(f)
+        glossary.update({str(k): str(v) for k, v in extra.items()})
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"加载翻译术语表失败: {e}")
+    return glossary
+
+
+class LLMTranslator:
+    """LLM 批量翻译（构造请求、解析响应）"""
+
+    name = "llm"
+
+    def __init__(self, glossary: Optional[Dict[str, str]] = None):
+        self.enabled = LLM_ENABLED
+        self.endpoint = f"{LLM_BASE_URL.rstrip('/')}/chat/completions" if LLM_BASE_URL else ""
+        self.model = LLM_MODEL
+        self.glossary = load_glossary() if glossary is None else glossary
+        self._patterns = {
+            term: re.compile(rf"(?<![A-Za-z0-9]){re.escape(term)}(?![A-Za-z0-9])", re.IGNORECASE)
+            for term in self.glossary
+        }
+
+    def glossary_for(self, texts: Sequence[str]) -> Dict[str, str]:
+        """本批文本中出现的术语"""
+        joined = "\n".join(texts)
+        return {term: self.glossary[term] for term, pattern in self._patterns.items() if pattern.search(joined)}
+
+    def build_request(self, texts: Sequence[str]) -> Dict[str, Any]:
+        """requests 参数（json / headers / timeout）"""
+        system = _SYSTEM_PROMPT
+        terms = self.glossary_for(texts)
+        if terms:
+            system += "\n\n术语表：\n" + "\n".join(f"- {en} => {zh}" for en, zh in terms.items())
+
+        items = [{"id": i, "text": text} for i, text in enumerate(texts)]
+        return {
+            "json": {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": json.dumps(items, ensure_ascii=False)},
+                ],
+                "temperature": 0.1,
+                "response_format": {"type": "json_object"},
+            },
+            "headers": {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {LLM_API_KEY}",
+            },
+            "timeout": 60,
+        }
+
+    @staticmethod
+    def parse_response(body: Dict[str, Any], count: int) -> Optional[List[Optional[str]]]:
+        """
+        解析响应
+
+        Args:
+            body: /chat/completions 的响应 JSON
+            count: 本批原文条数
+
+        Returns:
+            按序号排列的译文（缺失的序号为 None），无法解析返回 None
+        """
+        try:
+            content = body["choices"][0]["message"]["content"]
+            data = json.loads(_CODE_FENCE.sub("", content.strip()))
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        if isinstance(data, dict):
+            data = data.get("translations")
+        if not isinstance(data, list):
+            return None
+
+        results: List[Optional[str]] = [None] * count
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            text = item.get("text")
+            if 0 <= index < count and isinstance(text, str):
+                results[index] = text.strip()
+        return results
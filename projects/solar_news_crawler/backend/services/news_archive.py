@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+"""新闻归档 - 所有爬虫输出文件写入本地 SQLite，支持历史数据检索
+
+- 数据目录中的每个 combined_*.json / translator_*.json 只导入一次（按文件 stat 签名判断），
+  记录按链接或规范化标题去重，后导入的文件覆盖同一条新闻的内容
+- 检索文本预先按 search_index 的规则分词（中文 bigram + 英文单词，保留词频）写入 FTS5 表
+  的标题、原标题（国际新闻的英文原文）、正文三列，关键词查询先用 FTS5 求候选集，再按子串语义校验；与内存索引一致，
+  英文片段可以是单词的任意部分：先在 FTS5 词表（fts5vocab）中查找包含该片段的词，再按这些词求候选集
+- 按相关度排序时使用 FTS5 内置的 bm25()，列权重与内存索引的字段权重一致
+- 日期和来源筛选走普通索引，排序和分页与内存中的新闻集合一致（日期倒序 + keyset 游标）；
+  count 和 source_stats 只在第一页（不带游标）计算，翻页请求不再重复全量分组统计
+"""
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.services.news_collection import (
+    decode_cursor,
+    domestic_date,
+    domestic_search_fields,
+    encode_cursor,
+    international_date,
+    international_search_fields,
+    project,
+    record_id,
+)
+from backend.services.search_index import FIELD_WEIGHTS, keyword_terms, token_stream
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    rowid INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    news_id TEXT NOT NULL,
+    link TEXT,
+    title_key TEXT,
+    sort_key TEXT NOT NULL,
+    ordinal INTEGER,
+    undated INTEGER NOT NULL DEFAULT 0,
+    source TEXT,
+    search_text TEXT NOT NULL,
+    record TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_news_id ON news (dataset, news_id);
+CREATE INDEX IF NOT EXISTS idx_news_link ON news (dataset, link);
+CREATE INDEX IF NOT EXISTS idx_news_title ON news (dataset, title_key);
+CREATE INDEX IF NOT EXISTS idx_news_order ON news (dataset, sort_key DESC, news_id);
+CREATE INDEX IF NOT EXISTS idx_news_date ON news (dataset, ordinal);
+CREATE INDEX IF NOT EXISTS idx_news_source ON news (dataset, source, sort_key DESC);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    records INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+"""
+
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts "
+    "USING fts5(title, title_original, body, tokenize = 'unicode61 remove_diacritics 0')"
+)
+# FTS 词表（只读视图，用于英文片段的子串查找）
+_VOCAB_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts_vocab USING fts5vocab(news_fts, row)"
+
+# 英文片段在词表中命中的词超过该数量时不用 FTS 缩小候选集（查询表达式过长），只做子串校验
+_MAX_FRAGMENT_WORDS = 256
+# 英文片段 -> 词表匹配结果的缓存上限（导入新记录时清空）
+_FRAGMENT_CACHE_SIZE = 1024
+
+# 结构版本（PRAGMA user_version）：2 起 FTS 表分列并保留词频，3 起国际新闻的英文原标题单独一列
+_SCHEMA_VERSION = 3
+
+# 数据集 -> (日期提取函数, 检索字段提取函数)
+DATASETS: Dict[str, Tuple[Callable, Callable]] = {
+    "domestic": (domestic_date, domestic_search_fields),
+    "international": (international_date, international_search_fields),
+}
+
+_TITLE_NOISE = re.compile(r"[\W_]+")
+
+
+def title_key(news: Dict) -> Optional[str]:
+    """规范化标题（小写，去掉空白和标点），用于跨文件去重"""
+    key = _TITLE_NOISE.sub("", (news.get("title") or "").lower())
+    return key or None
+
+
+def _read_records(path: Path) -> Optional[List[Dict]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "news_list" in data:
+        data = data["news_list"]
+    return data if isinstance(data, list) else None
+
+
+def _fts_columns(fields: Sequence[str]) -> Tuple[str, str, str]:
+    """小写后的检索字段 -> FTS 列文本（标题、原标题、其余字段），词之间以空格分隔"""
+    columns = [" ".join(token_stream(text)) for text in fields[:2]] + ["", ""]
+    body = " ".join(token for text in fields[2:] for token in token_stream(text))
+    return columns[0], columns[1], body
+
+
+def _search_columns(dataset: str, news: Dict) -> Tuple[str, Tuple[str, str, str]]:
+    """记录 -> (用于子串校验的检索文本, FTS 列文本)"""
+    fields = [(text or "").lower() for text in DATASETS[dataset][1](news)]
+    return "\n".join(fields), _fts_columns(fields)
+
+
+class NewsArchive:
+    """新闻归档（SQLite + FTS5，线程安全）"""
+
+    def __init__(self, db_path: Path):
+        """
+        Raises:
+            sqlite3.Error: 数据库无法创建，或 SQLite 未编译 FTS5
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 只串行化写入；WAL 模式下查询不受导入影响
+        self._lock = threading.Lock()
+        # 英文片段 -> 词表中包含该片段的词（None 表示词太多）
+        self._fragment_cache: Dict[str, Optional[List[str]]] = {}
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            conn.execute(_VOCAB_SCHEMA)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """旧版本的检索文本和 FTS 表（单列或不含原标题）按归档的记录 JSON 重建"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            return
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS news_fts_vocab")
+            conn.execute("DROP TABLE IF EXISTS news_fts")
+            conn.execute(_FTS_SCHEMA)
+            for rowid, dataset, record in conn.execute("SELECT rowid, dataset, record FROM news").fetchall():
+                search_text, columns = _search_columns(dataset, json.loads(record))
+                conn.execute("UPDATE news SET search_text = ? WHERE rowid = ?", (search_text, rowid))
+                conn.execute(
+                    "INSERT INTO news_fts (rowid, title, title_original, body) VALUES (?, ?, ?, ?)",
+                    (rowid, *columns)
+                )
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    # ==================== 导入 ====================
+
+    def ingest_files(self, files: Iterable[Tuple[str, Path]]) -> int:
+        """
+        导入尚未导入（或导入后又被修改）的文件，按修改时间从旧到新处理
+
+        Args:
+            files: (数据集, 文件路径)
+
+        Returns:
+            本次导入的记录条数
+        """
+        pending = []
+        for dataset, path in files:
+            try:
+                st = Path(path).stat()
+            except OSError:
+                continue
+            pending.append((st.st_mtime_ns, st.st_size, dataset, str(path)))
+        pending.sort()
+
+        total = 0
+        with self._lock:
+            conn = self._connect()
+            try:
+                for mtime_ns, size, dataset, path in pending:
+                    done = conn.execute(
+                        "SELECT 1 FROM ingested_files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                        (path, size, mtime_ns)
+                    ).fetchone()
+                    if done:
+                        continue
+                    try:
+                        records = _read_records(Path(path))
+                    except (OSError, ValueError) as e:
+                        # 文件可能仍在写入，签名变化后会再次尝试
+                        print(f"Error archiving {path}: {e}")
+                        continue
+                    if records is None:
+                        continue
+
+                    with conn:
+                        count = self._upsert(conn, dataset, records)
+                        conn.execute(
+                            "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?, ?)",
+                            (path, size, mtime_ns, count, datetime.now().isoformat(timespec="seconds"))
+                        )
+                    total += count
+            finally:
+                conn.close()
+            if total:
+                self._fragment_cache = {}
+        return total
+
+    def _upsert(self, conn: sqlite3.Connection, dataset: str, records: List[Dict]) -> int:
+        """写入一批记录（同一链接或同一规范化标题视为同一条新闻）"""
+        date_field, _ = DATASETS[dataset]
+        now = datetime.now().isoformat(timespec="seconds")
+        count = 0
+
+        for news in records:
+            if not isinstance(news, dict):
+                continue
+            sort_key, ordinal, _, undated = date_field(news)
+            link = news.get("link") or news.get("url") or None
+            key = title_key(news)
+            search_text, columns = _search_columns(dataset, news)
+
+            existing = self._find(conn, dataset, record_id(news), link, key)
+            news_id = existing[1] if existing else record_id(news)
+            record = json.dumps({**news, "id": news_id}, ensure_ascii=False)
+            values = (
+                link, key, sort_key, ordinal, int(undated), news.get("source"),
+                search_text, record, now,
+            )
+
+            if existing:
+                rowid = existing[0]
+                conn.execute(
+                    "UPDATE news SET link = ?, title_key = ?, sort_key = ?, ordinal = ?, undated = ?, "
+                    "source = ?, search_text = ?, record = ?, last_seen = ? WHERE rowid = ?",
+                    values + (rowid,)
+                )
+                conn.execute("DELETE FROM news_fts WHERE rowid = ?", (rowid,))
+            else:
+                rowid = conn.execute(
+                    "INSERT INTO news (link, title_key, sort_key, ordinal, undated, source, search_text, "
+                    "record, last_seen, dataset, news_id, first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    values + (dataset, news_id, now)
+                ).lastrowid
+            conn.execute(
+                "INSERT INTO news_fts (rowid, title, title_original, body) VALUES (?, ?, ?, ?)", (rowid, *columns)
+            )
+            count += 1
+        return count
+
+    @staticmethod
+    def _find(
+        conn: sqlite3.Connection, dataset: str, news_id: str, link: Optional[str], key: Optional[str]
+    ) -> Optional[Tuple[int, str]]:
+        """按 id、链接、规范化标题依次查找已归档的同一条新闻（逐列查询以各自走索引）"""
+        for column, value in (("news_id", news_id), ("link", link), ("title_key", key)):
+            if value is None:
+                continue
+            row = conn.execute(
+                f"SELECT rowid, news_id FROM news WHERE dataset = ? AND {column} = ? LIMIT 1",
+                (dataset, value)
+            ).fetchone()
+            if row:
+                return row
+        return None
+
+    # ==================== 查询 ====================
+
+    def _fragment_words(self, conn: sqlite3.Connection, fragment: str) -> Optional[List[str]]:
+        """FTS 词表中包含该英文片段的词（超过 _MAX_FRAGMENT_WORDS 个时返回 None）"""
+        cache = self._fragment_cache
+        if fragment in cache:
+            return cache[fragment]
+        words = [row[0] for row in conn.execute(
+            "SELECT term FROM news_fts_vocab WHERE instr(term, ?) > 0 LIMIT ?",
+            (fragment, _MAX_FRAGMENT_WORDS + 1)
+        )]
+        result = words if len(words) <= _MAX_FRAGMENT_WORDS else None
+        if len(cache) >= _FRAGMENT_CACHE_SIZE:
+            cache.clear()
+        cache[fragment] = result
+        return result
+
+    def _fts_query(self, conn: sqlite3.Connection, keyword: str) -> Optional[str]:
+        """
+        关键词 -> FTS5 查询表达式（None 表示无法用 FTS 缩小范围，只能逐条校验）
+
+        英文片段替换为词表中包含该片段的所有词的 OR；没有这样的词时保留片段本身（不命中任何记录）。
+        """
+        grams, fragments = keyword_terms(keyword)
+        terms = [f'"{g}"' for g in grams]
+        for fragment in dict.fromkeys(fragments):
+            words = self._fragment_words(conn, fragment)
+            if words is not None:
+                terms.append("(" + " OR ".join(f'"{w}"' for w in words or [fragment]) + ")")
+        return " AND ".join(terms) if terms else None
+
+    def count(self, dataset: str) -> int:
+        """数据集的归档记录总数"""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM news WHERE dataset = ?", (dataset,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _where(dataset: str, query: Tuple, match: Optional[str]) -> Tuple[str, List[Any]]:
+        """
+        规范化筛选条件（见 news_collection.normalize_query）-> WHERE 子句
+
+        Args:
+            match: FTS 候选条件（_fts_query 的结果；相关度查询在 JOIN 中单独 MATCH 时传 None）
+        """
+        date_filter, start, end, keyword, source = query
+        clauses, params = ["dataset = ?"], [dataset]
+
+        if date_filter:
+            if start is None:
+                clauses.append("undated = 1")
+            else:
+                clauses.append("(ordinal BETWEEN ? AND ? OR undated = 1)")
+                params.extend([start, end])
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if keyword:
+            if match:
+                clauses.append("rowid IN (SELECT rowid FROM news_fts WHERE news_fts MATCH ?)")
+                params.append(match)
+            clauses.append("instr(search_text, ?) > 0")
+            params.append(keyword)
+        return " AND ".join(clauses), params
+
+    def _page_sql(
+        self, dataset: str, query: Tuple, match: Optional[str], cursor: Optional[str], sort: str
+    ) -> Tuple[str, List[Any]]:
+        """当前页的查询语句（不含 LIMIT）；每行前三列为 (排序键, 记录 id, 记录 JSON)"""
+        if match is None or sort != "relevance":
+            where, params = self._where(dataset, query, match)
+            if cursor:
+                sort_key, news_id = decode_cursor(cursor)
+                where += " AND (sort_key < ? OR (sort_key = ? AND news_id > ?))"
+                params.extend([sort_key, sort_key, news_id])
+            return f"SELECT sort_key, news_id, record FROM news WHERE {where} ORDER BY sort_key DESC, news_id", params
+
+        # bm25() 越小越相关；第一列输出得分文本作为游标排序键
+        where, params = self._where(dataset, query, None)
+        sql = (
+            "SELECT printf('%!.17g', f.score), n.news_id, n.record FROM "
+            "(SELECT rowid AS fts_rowid, bm25(news_fts, ?, ?, ?) AS score FROM news_fts WHERE news_fts MATCH ?) AS f "
+            f"JOIN news AS n ON n.rowid = f.fts_rowid WHERE {where}"
+        )
+        params = [*FIELD_WEIGHTS, match] + params
+        if cursor:
+            score_key, news_id = decode_cursor(cursor)
+            try:
+                score = float(score_key)
+            except ValueError:
+                raise ValueError(f"Invalid cursor: {cursor}")
+            sql += " AND (f.score > ? OR (f.score = ? AND n.news_id > ?))"
+            params.extend([score, score, news_id])
+        return sql + " ORDER BY f.score, n.news_id", params
+
+    def page(
+        self,
+        dataset: str,
+        query: Tuple,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        sort: str = "date"
+    ) -> Dict[str, Any]:
+        """
+        分页查询归档（筛选、排序、游标语义与 NewsCollection.page 一致）
+
+        sort 为 relevance 且关键词可用 FTS 检索时按 bm25() 排序，游标编码 (得分, 记录 id)
+
+        Returns:
+            {"data", "count", "source_stats", "next_cursor"}；count 和 source_stats 只在第一页
+            （cursor 为空）返回，limit 为 None 时不返回 next_cursor
+
+        Raises:
+            ValueError: 游标非法
+        """
+        conn = self._connect()
+        try:
+            match = self._fts_query(conn, query[3]) if query[3] else None
+            page_sql, page_params = self._page_sql(dataset, query, match, cursor, sort)
+            source_stats = None
+            if not cursor:
+                where, params = self._where(dataset, query, match)
+                source_stats = {
+                    src: n for src, n in conn.execute(
+                        f"SELECT COALESCE(source, 'Unknown'), COUNT(*) FROM news WHERE {where} GROUP BY 1",
+                        params
+                    )
+                }
+            rows = []
+            if limit is None or limit > 0:
+                if limit is not None:
+                    page_sql += " LIMIT ?"
+                    page_params.append(limit + 1)
+                rows = conn.execute(page_sql, page_params).fetchall()
+        finally:
+            conn.close()
+
+        result = {"data": [project(json.loads(row[2]), fields) for row in rows[:limit]]}
+        if source_stats is not None:
+            result["count"] = sum(source_stats.values())
+            result["source_stats"] = source_stats
+        if limit is not None:
+            result["next_cursor"] = (
+                encode_cursor(rows[limit - 1][0], rows[limit - 1][1]) if limit and len(rows) > limit else None
+            )
+        return result
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""近似重复新闻聚类 - MinHash + LSH
+
+同一条新闻常被多个来源以略有差异的标题转载（中国政府网 / 国家能源局，
+PV Magazine / IEA / IRENA 的译文标题）。加载时对标题做聚类：
+
+1. 标题规范化（小写、去掉空白和标点）后取字符 3-gram 集合
+2. 计算 MinHash 签名（BANDS * ROWS 个相互独立的哈希 (a * h + b) mod p），按 band 分桶（LSH），
+   同桶记录成为候选
+3. 候选对按 3-gram 集合的 Jaccard 相似度校验，超过阈值则合并（并查集）；
+   新记录与桶内所有尚未同簇的记录比较，簇是相似关系的连通分量，与输入顺序无关
+
+签名使用确定性哈希和固定种子，同一份数据在不同进程中得到相同的聚类结果。
+"""
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+SHINGLE_SIZE = 3
+# 签名长度 = BANDS * ROWS；band 越多召回越高，ROWS 越大越严格
+BANDS = 8
+ROWS = 4
+# Jaccard 相似度阈值
+SIMILARITY_THRESHOLD = 0.6
+
+_NOISE = re.compile(r"[\W_]+")
+# 梅森素数 2^61 - 1
+_PRIME = (1 << 61) - 1
+# 以固定种子生成的哈希系数 (a, b)，每组对应一个独立的哈希函数 (a * h + b) mod p
+_rng = random.Random(20240601)
+_COEFFICIENTS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(BANDS * ROWS)]
+
+
+def shingles(text: str) -> Set[str]:
+    """规范化文本的字符 3-gram 集合（短文本整体作为一个 shingle）"""
+    normalized = _NOISE.sub("", (text or "").lower())
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _hash_values(shingle: str) -> Tuple[int, ...]:
+    """shingle 在每个哈希函数下的值"""
+    h = _hash(shingle)
+    return tuple((a * h + b) % _PRIME for a, b in _COEFFICIENTS)
+
+
+def minhash(shingle_set: Set[str], cache: Optional[Dict[str, Tuple[int, ...]]] = None) -> Tuple[int, ...]:
+    """
+    MinHash 签名
+
+    Args:
+        cache: shingle -> 各哈希函数的值（同一批文本共用，重复出现的 shingle 只计算一次）
+    """
+    if cache is None:
+        cache = {}
+    values = []
+    for shingle in shingle_set:
+        value = cache.get(shingle)
+        if value is None:
+            value = cache[shingle] = _hash_values(shingle)
+        values.append(value)
+    return tuple(map(min, zip(*values)))
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def cluster_heads(texts: Sequence[str]) -> List[int]:
+    """
+    对文本聚类
+
+    Args:
+        texts: 每条记录的标题（下标即记录位置）
+
+    Returns:
+        每条记录所在簇的代表位置（簇内最小位置）；未与其他记录聚合的记录代表自身
+    """
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    sets = [shingles(text) for text in texts]
+    cache: Dict[str, Tuple[int, ...]] = {}
+    # (band 序号, band 签名) -> 桶内记录；已在同一簇的记录不再比较
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+    for i, shingle_set in enumerate(sets):
+        if not shingle_set:
+            continue
+        signature = minhash(shingle_set, cache)
+        for band in range(BANDS):
+            members = buckets.setdefault((band, signature[band * ROWS:(band + 1) * ROWS]), [])
+            for j in members:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and jaccard(shingle_set, sets[j]) >= SIMILARITY_THRESHOLD:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+            members.append(i)
+
+    return [find(i) for i in range(len(texts))]
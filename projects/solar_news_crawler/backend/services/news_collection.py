@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""新闻集合 - 加载时一次性完成排序、日期解析和索引构建，查询时只做查找
+
+记录按日期字符串倒序排列（与接口返回顺序一致），日期统一解析为 ordinal：
+- 标准格式（YYYY-MM-DD 开头）的记录日期随位置单调递减，日期范围查询为两次 bisect
+- 可解析但非标准格式的记录（如 2024-1-5）单独存放，查询时逐条比较（数量很少）
+
+记录 id 由内容决定（链接的哈希，无链接时用标题 + 日期），重新加载后保持不变；
+id、cluster_id、cluster_size 写在集合持有的记录副本上，不修改加载得到的原始记录。
+
+分页采用 keyset 游标：游标编码最后一条记录的 (日期排序键, 记录 id)，
+翻页时按 id 定位到其位置继续，翻页代价与归档规模无关。
+按相关度排序（sort=relevance，需要关键词）时游标编码 (BM25 得分, 记录 id)。
+
+加载时对标题做近似重复聚类（news_clusters.py），记录带有 cluster_id（簇代表记录的 id）
+和 cluster_size；collapse 模式下每个簇只返回排在最前的一条命中记录。
+
+查询分两步：match() 按规范化后的筛选条件得到命中位置和来源统计（可缓存），
+paginate() 在命中结果上做游标分页和字段投影。来源筛选和统计使用分面索引（facets.py）。
+"""
+import base64
+import hashlib
+import heapq
+import json
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from backend.services.facets import FacetIndex
+from backend.services.news_clusters import cluster_heads
+from backend.services.search_index import SearchIndex
+
+_CANONICAL_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def parse_query_date(value: str) -> Optional[int]:
+    """解析查询参数中的日期（YYYY-MM-DD），非法时返回 None"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_query(
+    start_date: str = None,
+    end_date: str = None,
+    keyword: str = None,
+    source: str = None
+) -> Tuple:
+    """
+    规范化筛选参数，语义相同的参数组合得到相同的结果（可作为缓存键）
+
+    日期筛选仅在起止日期都提供时生效；任一日期非法时只有无日期的记录能通过，
+    两种写法统一为 (True, None, None)。关键词匹配不区分大小写，统一转小写。
+
+    Returns:
+        (是否按日期筛选, 起始 ordinal, 结束 ordinal, 关键词, 来源)
+    """
+    date_filter = bool(start_date and end_date)
+    start = parse_query_date(start_date) if date_filter else None
+    end = parse_query_date(end_date) if date_filter else None
+    if start is None or end is None:
+        start = end = None
+    return date_filter, start, end, (keyword or "").lower() or None, source or None
+
+
+SORT_MODES = ("date", "relevance")
+
+
+def normalize_sort(sort: Optional[str], keyword: Optional[str]) -> str:
+    """
+    规范化排序方式：相关度排序只在有关键词时生效，否则按日期
+
+    Raises:
+        ValueError: 排序方式非法
+    """
+    if sort is None:
+        return "date"
+    if sort not in SORT_MODES:
+        raise ValueError(f"Invalid sort: {sort}. Use 'date' or 'relevance'.")
+    return sort if keyword else "date"
+
+
+def domestic_date(news: Dict) -> Tuple[str, Optional[int], bool, bool]:
+    """
+    国内新闻日期：date 字段，整体按 %Y-%m-%d 解析
+
+    Returns:
+        (排序键, ordinal, 是否标准格式, 是否无日期)
+    """
+    raw = news.get("date") or ""
+    ordinal = parse_query_date(raw) if raw else None
+    return raw, ordinal, ordinal is not None and bool(_CANONICAL_DATE.fullmatch(raw)), False
+
+
+def international_date(news: Dict) -> Tuple[str, Optional[int], bool, bool]:
+    """
+    国际新闻日期：publish_date 优先，其次 date，取前 10 位解析；无日期的记录不参与日期筛选
+
+    Returns:
+        (排序键, ordinal, 是否标准格式, 是否无日期)
+    """
+    raw = news.get("publish_date") or news.get("date") or ""
+    if not raw:
+        return raw, None, False, True
+    ordinal = parse_query_date(raw[:10]) if _CANONICAL_DATE.match(raw) else None
+    return raw, ordinal, ordinal is not None, False
+
+
+def record_id(news: Dict) -> str:
+    """记录 id：链接的哈希（无链接时用标题 + 日期）"""
+    basis = news.get("link") or news.get("url") or f"{news.get('title', '')}|{news.get('date', '')}"
+    return hashlib.md5(basis.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(sort_key: str, news_id: str) -> str:
+    """生成不透明的翻页游标"""
+    raw = json.dumps([sort_key, news_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    解析翻页游标
+
+    Raises:
+        ValueError: 游标格式非法
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, news_id = json.loads(raw.decode("utf-8"))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(sort_key, str) or not isinstance(news_id, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return sort_key, news_id
+
+
+def project(news: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    """字段投影（fields 为空时返回完整记录）"""
+    if not fields:
+        return news
+    return {field: news[field] for field in fields if field in news}
+
+
+def domestic_search_fields(news: Dict) -> List[str]:
+    """国内新闻参与关键词检索的字段"""
+    return [news.get("title", "")]
+
+
+def international_search_fields(news: Dict) -> List[str]:
+    """
+    国际新闻参与关键词检索的字段：标题（优先使用译文）、英文原标题、摘要
+
+    原标题与第一个字段相同（未翻译或翻译失败）时留空，避免重复计入词频
+    """
+    original = news.get("title_original", "") or news.get("title", "")
+    title = news.get("title_translated", "") or original
+    return [title, original if original != title else "", news.get("summary", "")]
+
+
+class QueryMatch(NamedTuple):
+    """筛选结果（构建后只读，可在请求间共享）"""
+    positions: Optional[List[int]]  # 命中记录位置（日期排序时升序），None 表示全部记录
+    count: int
+    source_stats: Dict[str, int]
+    scores: Optional[List[float]] = None  # 相关度排序时与 positions 对应的得分（降序）
+
+
+class NewsCollection:
+    """按日期倒序排列的新闻记录及其索引（构建后只读）"""
+
+    def __init__(
+        self,
+        records: List[Dict],
+        date_field: Callable[[Dict], Tuple[str, Optional[int], bool, bool]],
+        search_fields: Callable[[Dict], List[str]],
+        previous: Optional["NewsCollection"] = None
+    ):
+        """
+        Args:
+            records: 原始新闻记录
+            date_field: 日期提取函数，返回 (排序键, ordinal, 是否标准格式, 是否无日期)
+            search_fields: 关键词检索字段提取函数
+            previous: 同一数据集的上一代集合（检索索引基于它增量构建）
+        """
+        dated = [(date_field(news), news) for news in records]
+        # 与原接口一致：按日期字符串倒序（稳定排序，同日期保持原顺序）
+        dated.sort(key=lambda item: item[0][0], reverse=True)
+
+        # 记录副本（id 和聚类字段只写在副本上）
+        self.records: List[Dict] = [
+            {**news, "id": str(news.get("id") or record_id(news))} for _, news in dated
+        ]
+        # 排序键升序副本（供游标定位）
+        self._sort_keys_asc: List[str] = [key for (key, _, _, _), _ in reversed(dated)]
+        # 游标 id -> 位置；同一 id 的第 n 条（n >= 1）重复记录的游标 id 为 "id~n"
+        self._id_positions: Dict[str, int] = {}
+        self._ordinals: List[Optional[int]] = []
+        self._undated: List[int] = []
+        self._irregular: List[int] = []
+        self._dated_positions: List[int] = []
+        self._date_keys: List[int] = []  # -ordinal，随位置升序，供 bisect 使用
+
+        occurrences: Counter = Counter()
+        self._cursor_ids: List[str] = []
+        for pos, ((_, ordinal, canonical, undated), _) in enumerate(dated):
+            news_id = self.records[pos]["id"]
+            seen = occurrences[news_id]
+            occurrences[news_id] += 1
+            cursor_id = f"{news_id}~{seen}" if seen else news_id
+            self._cursor_ids.append(cursor_id)
+            self._id_positions[cursor_id] = pos
+
+            self._ordinals.append(ordinal)
+            if undated:
+                self._undated.append(pos)
+            elif canonical:
+                self._dated_positions.append(pos)
+                self._date_keys.append(-ordinal)
+            elif ordinal is not None:
+                self._irregular.append(pos)
+
+        self._undated_set = set(self._undated)
+        # 最早的可解析日期（用于判断查询是否超出本集合的时间范围）
+        self.earliest_ordinal: Optional[int] = min(
+            (o for o in self._ordinals if o is not None), default=None
+        )
+        documents = [search_fields(news) for news in self.records]
+        self.search_index = SearchIndex(documents, previous.search_index if previous is not None else None)
+
+        # 近似重复聚类：簇代表为簇内位置最小（日期最新）的记录
+        self._cluster_heads: List[int] = cluster_heads([fields[0] if fields else "" for fields in documents])
+        cluster_sizes = Counter(self._cluster_heads)
+        for pos, head in enumerate(self._cluster_heads):
+            self.records[pos]["cluster_id"] = self.records[head]["id"]
+            self.records[pos]["cluster_size"] = cluster_sizes[head]
+        self._canonical_positions: List[int] = [
+            pos for pos, head in enumerate(self._cluster_heads) if pos == head
+        ]
+        self.facets = FacetIndex(self.records, self._ordinals, self._undated)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _in_range(self, pos: int, start: Optional[int], end: Optional[int]) -> bool:
+        ordinal = self._ordinals[pos]
+        if ordinal is None:
+            return pos in self._undated_set
+        return start is not None and end is not None and start <= ordinal <= end
+
+    def _date_range(self, start: Optional[int], end: Optional[int]) -> List[int]:
+        """日期范围内的记录位置（升序，即日期倒序）"""
+        if start is None or end is None:
+            # 查询日期非法：只有无日期的记录能通过筛选
+            return list(self._undated)
+
+        lo = bisect_left(self._date_keys, -end)
+        hi = bisect_right(self._date_keys, -start)
+        positions = self._dated_positions[lo:hi]
+
+        extra = [p for p in self._irregular if start <= self._ordinals[p] <= end]
+        extra.extend(self._undated)
+        if extra:
+            positions = list(heapq.merge(positions, sorted(extra)))
+        return positions
+
+    def _positions(self, query: Tuple) -> Optional[List[int]]:
+        """筛选后的记录位置（升序，即日期倒序）；None 表示不过滤"""
+        date_filter, start, end, keyword, source = query
+
+        if keyword:
+            positions = self.search_index.search(keyword)
+            if date_filter:
+                positions = [p for p in positions if self._in_range(p, start, end)]
+        elif date_filter:
+            positions = self._date_range(start, end)
+        else:
+            positions = None
+
+        if source:
+            postings = self.facets.postings("source", source)
+            positions = sorted(postings) if positions is None else [p for p in positions if p in postings]
+        return positions
+
+    def match(self, query: Tuple, sort: str = "date", collapse: bool = False) -> QueryMatch:
+        """
+        按规范化后的筛选条件（见 normalize_query）求命中位置和来源统计
+
+        Args:
+            sort: date 按日期倒序；relevance 按 BM25 得分降序（同分按日期），需要关键词
+            collapse: 每个近似重复簇只保留排序最前的一条，count 和 source_stats 按保留的记录统计
+
+        Returns:
+            QueryMatch，结果不依赖分页参数
+        """
+        positions = self._positions(query)
+        date_filter, start, end, keyword, source = query
+        scores = None
+
+        if sort == "relevance" and keyword:
+            raw = self.search_index.scores(keyword, positions)
+            order = sorted(range(len(positions)), key=lambda i: (-raw[i], positions[i]))
+            positions = [positions[i] for i in order]
+            scores = [raw[i] for i in order]
+
+        if collapse:
+            positions, scores = self._collapse(positions, scores)
+            source_stats = self.facets.counts("source", positions)
+        elif positions is None:
+            source_stats = self.facets.counts("source")
+        elif source:
+            source_stats = {source: len(positions)} if positions else {}
+        elif date_filter and not keyword and start is not None:
+            source_stats = self.facets.range_source_counts(start, end)
+        else:
+            source_stats = self.facets.counts("source", positions)
+
+        count = len(self.records) if positions is None else len(positions)
+        return QueryMatch(positions, count, source_stats, scores)
+
+    def _collapse(
+        self, positions: Optional[List[int]], scores: Optional[List[float]]
+    ) -> Tuple[List[int], Optional[List[float]]]:
+        """每个簇只保留第一条（按当前排序）"""
+        if positions is None:
+            return self._canonical_positions, None
+
+        seen = set()
+        kept, kept_scores = [], []
+        for i, pos in enumerate(positions):
+            head = self._cluster_heads[pos]
+            if head in seen:
+                continue
+            seen.add(head)
+            kept.append(pos)
+            if scores is not None:
+                kept_scores.append(scores[i])
+        return kept, (kept_scores if scores is not None else None)
+
+    def _cursor_position(self, cursor: str) -> int:
+        """游标对应的最后一条记录的位置；记录已不存在时退回到排序键之前"""
+        sort_key, news_id = decode_cursor(cursor)
+        pos = self._id_positions.get(news_id)
+        if pos is not None:
+            return pos
+        # 数据已重新加载且该记录被移除：从排序键严格小于游标的第一条继续
+        return len(self.records) - bisect_left(self._sort_keys_asc, sort_key) - 1
+
+    def _ranked_start(self, positions: List[int], scores: List[float], cursor: str) -> int:
+        """
+        相关度排序结果中游标之后的第一条的下标
+
+        结果按 (-得分, 位置) 升序排列，按游标的 (得分, 位置) 二分查找；
+        记录已不存在时从得分更低的第一条继续。
+        """
+        score_key, news_id = decode_cursor(cursor)
+        try:
+            score = float(score_key)
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+        pos = self._id_positions.get(news_id)
+        target = (-score, len(self.records) if pos is None else pos)
+        lo, hi = 0, len(positions)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (-scores[mid], positions[mid]) <= target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def query(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        keyword: str = None,
+        source: str = None
+    ) -> List[Dict]:
+        """
+        按日期范围（起止日期都提供时生效）、关键词、来源筛选，结果按日期倒序
+
+        Returns:
+            命中的记录列表
+        """
+        positions = self._positions(normalize_query(start_date, end_date, keyword, source))
+        return self.records if positions is None else [self.records[p] for p in positions]
+
+    def page(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        keyword: str = None,
+        source: str = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        分页查询（筛选语义同 query）
+
+        Args:
+            limit: 每页条数，None 表示返回全部，0 表示只返回统计
+            cursor: 上一页返回的 next_cursor
+            fields: 返回字段，为空时返回完整记录
+
+        Returns:
+            {"data", "count", "source_stats", "next_cursor"}，count 和 source_stats 覆盖全部命中记录；
+            limit 为 None 时不分页，不返回 next_cursor
+
+        Raises:
+            ValueError: 游标非法
+        """
+        return self.paginate(
+            self.match(normalize_query(start_date, end_date, keyword, source)), limit, cursor, fields
+        )
+
+    def paginate(
+        self,
+        match: QueryMatch,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        在筛选结果上做游标分页和字段投影（参数和返回值同 page）
+
+        Raises:
+            ValueError: 游标非法
+        """
+        positions, count, source_stats, scores = match
+        records = self.records
+
+        start = 0
+        if cursor and scores is not None:
+            start = self._ranked_start(positions, scores, cursor)
+        elif cursor:
+            after = self._cursor_position(cursor)
+            start = after + 1 if positions is None else bisect_right(positions, after)
+
+        end = count if limit is None else min(start + max(limit, 0), count)
+        page_positions = (
+            range(start, end) if positions is None else positions[start:end]
+        )
+        data = [project(records[pos], fields) for pos in page_positions]
+
+        result = {
+            "data": data,
+            "count": count,
+            "source_stats": dict(source_stats),
+        }
+        if limit is not None:
+            next_cursor = None
+            if limit and end < count:
+                last = page_positions[-1]
+                sort_key = self._sort_key(last) if scores is None else repr(scores[end - 1])
+                next_cursor = encode_cursor(sort_key, self._cursor_ids[last])
+            result["next_cursor"] = next_cursor
+        return result
+
+    def _sort_key(self, pos: int) -> str:
+        return self._sort_keys_asc[len(self.records) - 1 - pos]
@@ -1,36 +1,136 @@
 # -*- coding: utf-8 -*-
-"""新闻数据服务"""
+"""新闻数据服务
+
+同步方法（get_news 等）供脚本和测试直接调用；API 层使用 async 方法（*_json），
+查询和序列化在有界线程池中执行，数据加载在后台监视线程中完成，事件循环上不做磁盘和 CPU 密集工作。
+"""
+import asyncio
 import glob
-import hashlib
 import json
 import os
-import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-from backend.config import DATA_DIR
+from backend.config import ARCHIVE_DB, DATA_DIR, QUERY_WORKERS, WATCH_INTERVAL
+from backend.services.news_archive import NewsArchive
+from backend.services.news_collection import NewsCollection, normalize_query, normalize_sort, parse_query_date
+from backend.services.news_snapshot import (
+    SUMMARY_TYPES,
+    NewsSnapshot,
+    domestic_collection,
+    international_collection,
+)
+from backend.services.query_cache import QueryCache
+
+# 数据集 -> 文件名模式（取最新的一个文件）
+DATA_FILE_PATTERNS = {
+    "combined": "combined_*.json",
+    "irena": "irena_*_translated.json",
+    "translator": "translator_*.json",
+    "summary_domestic": "summary_domestic.json",
+    "summary_international": "summary_international.json",
+}
+
+# AI 总结文件 -> 总结类型
+SUMMARY_FILES = {
+    "summary_domestic": "domestic",
+    "summary_international": "international",
+}
+
+# 写入归档的数据集：文件模式名 -> 归档数据集（导入全部历史文件，而不只是最新的一个）
+ARCHIVE_DATASETS = {
+    "combined": "domestic",
+    "translator": "international",
+}
+
+QUERY_SCOPES = ("latest", "archive")
+
+
+def _dumps(result: Dict[str, Any]) -> bytes:
+    """响应序列化（与 FastAPI 默认 JSON 响应的格式一致）"""
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _file_signature(filepath: Optional[str]) -> Optional[tuple]:
+    """文件签名 (路径, inode, 大小, 修改时间 ns)，只读 stat，不读取内容"""
+    if not filepath:
+        return None
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (filepath, st.st_ino, st.st_size, st.st_mtime_ns)
 
 
 class NewsService:
     """新闻数据服务类"""
 
     def __init__(self):
-        self.news_data: List[Dict] = []
-        self.irena_news_data: List[Dict] = []
-        self.translated_news_data: List[Dict] = []
-        self.domestic_ai_summary: Dict = {}
-        self.international_ai_summary: Dict = {}
-
-        self.last_update_time: Optional[datetime] = None
-        self.last_irena_update_time: Optional[datetime] = None
-        self.last_translated_update_time: Optional[datetime] = None
-
-        self.file_hashes = {"combined": None, "irena": None, "translator": None}
+        # 当前数据快照：只通过整体替换更新，读者无需加锁
+        self.snapshot = NewsSnapshot()
+        # 筛选结果缓存（键含快照版本，重新加载后自动失效）
+        self.query_cache = QueryCache()
+        self.archive = self._open_archive()
+
+        # 后台文件监视线程（由应用生命周期启动/停止）
+        self._watcher: Optional[threading.Thread] = None
+        self._watcher_stop = threading.Event()
+        # 只串行化写者（重新加载），读者从不获取该锁
+        self._reload_lock = threading.Lock()
+        # 数据集 -> 最近一次尝试加载的文件签名（含加载失败的，失败的文件在签名变化前不再重试）
+        self._attempted: Dict[str, tuple] = {}
+        # 已写入归档的文件 -> 导入时的签名（签名不变的文件不再交给归档）
+        self._archived: Dict[str, tuple] = {}
+
+        # 查询线程池（首次使用时创建，shutdown 后可重新创建）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
         # 初始化加载数据
         self.initialize_data()
 
+    # 以下属性为当前快照的只读视图（同一请求内需要多项数据时应先取 self.snapshot）
+    @property
+    def news_data(self) -> List[Dict]:
+        return self.snapshot.domestic.records
+
+    @property
+    def irena_news_data(self) -> List[Dict]:
+        return self.snapshot.irena
+
+    @property
+    def translated_news_data(self) -> List[Dict]:
+        return self.snapshot.international.records
+
+    @property
+    def last_update_time(self) -> Optional[datetime]:
+        return self.snapshot.domestic_updated
+
+    @property
+    def last_irena_update_time(self) -> Optional[datetime]:
+        return self.snapshot.irena_updated
+
+    @property
+    def last_translated_update_time(self) -> Optional[datetime]:
+        return self.snapshot.international_updated
+
+    @property
+    def domestic_ai_summary(self) -> Any:
+        return self.snapshot.summaries["domestic"]
+
+    @property
+    def international_ai_summary(self) -> Any:
+        return self.snapshot.summaries["international"]
+
+    @property
+    def file_signatures(self) -> Dict[str, Optional[tuple]]:
+        return dict(self.snapshot.signatures)
+
     def _find_latest_file(self, pattern: str, directory: Path = None) -> Optional[str]:
         """查找指定模式的最新文件"""
         if directory is None:
@@ -46,330 +146,429 @@ class NewsService:
         files.sort(key=os.path.getmtime, reverse=True)
         return files[0]
 
-    def _calculate_file_hash(self, filepath: str) -> Optional[str]:
-        """计算文件的MD5哈希值"""
-        if not os.path.exists(filepath):
+    def _open_archive(self) -> Optional[NewsArchive]:
+        """打开历史归档（未配置或 SQLite 不支持 FTS5 时返回 None，只提供最新数据）"""
+        if not ARCHIVE_DB:
             return None
         try:
-            with open(filepath, "rb") as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception:
+            return NewsArchive(Path(ARCHIVE_DB))
+        except sqlite3.Error as e:
+            print(f"News archive disabled: {e}")
             return None
 
-    def initialize_data(self):
-        """初始化数据（从文件加载）"""
-
-        if self._load_news_from_file():
-            self.last_update_time = datetime.now()
-            latest = self._find_latest_file("combined_*.json")
-            if latest:
-                self.file_hashes["combined"] = self._calculate_file_hash(latest)
-            print(f"Loaded {len(self.news_data)} domestic news")
-
-        if self._load_irena_news_from_file():
-            self.last_irena_update_time = datetime.now()
-            latest = self._find_latest_file("irena_*_translated.json")
-            if latest:
-                self.file_hashes["irena"] = self._calculate_file_hash(latest)
-            print(f"Loaded {len(self.irena_news_data)} IRENA news")
-
-        if self._load_translated_news_from_file():
-            self.last_translated_update_time = datetime.now()
-            latest = self._find_latest_file("translator_*.json")
-            if latest:
-                self.file_hashes["translator"] = self._calculate_file_hash(latest)
-            print(f"Loaded {len(self.translated_news_data)} translated news")
-
-        self._load_ai_summaries()
-
-    def check_and_reload_data(self) -> bool:
-        """检查数据文件是否有更新，如果有则重新加载"""
-        reload_flags = {"combined": False, "irena": False, "translator": False}
-
-        # 检查 combined 文件
-        latest_combined = self._find_latest_file("combined_*.json")
-        if latest_combined:
-            current_hash = self._calculate_file_hash(latest_combined)
-            if current_hash and current_hash != self.file_hashes["combined"]:
-                self.file_hashes["combined"] = current_hash
-                reload_flags["combined"] = True
-
-        # 检查 irena 翻译文件
-        latest_irena = self._find_latest_file("irena_*_translated.json")
-        if latest_irena:
-            current_hash = self._calculate_file_hash(latest_irena)
-            if current_hash and current_hash != self.file_hashes["irena"]:
-                self.file_hashes["irena"] = current_hash
-                reload_flags["irena"] = True
-
-        # 检查 translator 文件
-        latest_translator = self._find_latest_file("translator_*.json")
-        if latest_translator:
-            current_hash = self._calculate_file_hash(latest_translator)
-            if current_hash and current_hash != self.file_hashes["translator"]:
-                self.file_hashes["translator"] = current_hash
-                reload_flags["translator"] = True
-
-        # 重新加载数据
-        if reload_flags["combined"] and self._load_news_from_file():
-            self.last_update_time = datetime.now()
-
-        if reload_flags["irena"] and self._load_irena_news_from_file():
-            self.last_irena_update_time = datetime.now()
-
-        if reload_flags["translator"] and self._load_translated_news_from_file():
-            self.last_translated_update_time = datetime.now()
-
-        return any(reload_flags.values())
-
-    def _load_news_from_file(self) -> bool:
-        """加载国内新闻数据"""
+    def _ingest_archive(self):
+        """将数据目录中新出现或有变化的爬虫输出写入归档（调用方持有 _reload_lock）"""
+        if self.archive is None or not DATA_DIR.exists():
+            return
+        changed = []
+        for name, dataset in ARCHIVE_DATASETS.items():
+            for path in glob.glob(str(DATA_DIR / DATA_FILE_PATTERNS[name])):
+                signature = _file_signature(path)
+                if signature is not None and signature != self._archived.get(path):
+                    changed.append((dataset, path, signature))
+        if not changed:
+            return
         try:
-            latest_file = self._find_latest_file("combined_*.json")
-            if not latest_file:
-                return False
+            count = self.archive.ingest_files((dataset, Path(path)) for dataset, path, _ in changed)
+        except sqlite3.Error as e:
+            print(f"Error archiving news: {e}")
+            return
+        # 读取失败（仍在写入）的文件同样记录：写完后签名变化会再次导入
+        self._archived.update((path, signature) for _, path, signature in changed)
+        if count:
+            print(f"Archived {count} news records")
 
+    def initialize_data(self):
+        """初始化数据（从文件加载；归档导入由监视线程完成，不在导入模块时进行）"""
+        self.check_and_reload_data(ingest=False)
+        snap = self.snapshot
+        print(f"Loaded {len(snap.domestic)} domestic news")
+        print(f"Loaded {len(snap.irena)} IRENA news")
+        print(f"Loaded {len(snap.international)} translated news")
+
+    def check_and_reload_data(self, ingest: bool = True) -> bool:
+        """
+        检查数据文件是否有更新（只比较 stat 签名），有则构建并发布新快照
+
+        由后台监视线程周期调用，请求处理路径不访问磁盘。
+        新快照在锁外的读者不可见，直到构建完成后一次性替换 self.snapshot；
+        没有任何数据集加载成功时保留当前快照和版本号。
+
+        Args:
+            ingest: 是否同时把新出现或有变化的爬虫输出文件写入历史归档（与重新加载在同一把锁内进行）
+        """
+        with self._reload_lock:
+            current = self.snapshot
+            # 新闻集合基于上一代集合增量构建检索索引
+            loaders = {
+                "combined": ("domestic", partial(self._load_news_from_file, previous=current.domestic)),
+                "irena": ("irena", self._load_irena_news_from_file),
+                "translator": (
+                    "international", partial(self._load_translated_news_from_file, previous=current.international)
+                ),
+                "summary_domestic": ("summaries", self._load_summary_from_file),
+                "summary_international": ("summaries", self._load_summary_from_file),
+            }
+            signatures = dict(current.signatures)
+            changes, summaries = {}, {}
+            for name, pattern in DATA_FILE_PATTERNS.items():
+                latest = self._find_latest_file(pattern)
+                signature = _file_signature(latest)
+                if signature is None or signature in (signatures.get(name), self._attempted.get(name)):
+                    continue
+
+                # 先记录尝试过的签名：文件仍在写入时加载会失败，写完后签名变化会再次触发
+                self._attempted[name] = signature
+                attr, loader = loaders[name]
+                loaded = loader(latest)
+                if loaded is None:
+                    continue
+                signatures[name] = signature
+                if name in SUMMARY_FILES:
+                    summaries[SUMMARY_FILES[name]] = loaded
+                else:
+                    changes[attr] = loaded
+                    changes[f"{attr}_updated"] = datetime.now()
+
+            if summaries:
+                changes["summaries"] = summaries
+            if changes:
+                self.snapshot = current.evolve(signatures=signatures, **changes)
+            if ingest:
+                self._ingest_archive()
+
+        return bool(changes)
+
+    def _watch_loop(self, interval: float):
+        # 启动后立即检查一次，首次的完整归档导入在此线程中进行
+        while True:
+            try:
+                if self.check_and_reload_data():
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] 新闻数据已重新加载")
+            except Exception as e:
+                print(f"Error reloading news data: {e}")
+            if self._watcher_stop.wait(interval):
+                return
+
+    def start_watcher(self, interval: float = WATCH_INTERVAL):
+        """启动后台文件监视线程（轮询 stat 签名，变化时在后台重新加载并写入归档）"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="news-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self):
+        """停止后台文件监视线程"""
+        self._watcher_stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=QUERY_WORKERS, thread_name_prefix="news-query"
+                )
+            return self._executor
+
+    def shutdown(self):
+        """停止后台文件监视线程和查询线程池"""
+        self.stop_watcher()
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    async def _run(self, func, *args, **kwargs):
+        """在查询线程池中执行同步方法"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+
+    async def get_news_json(self, **kwargs) -> bytes:
+        """get_news 的非阻塞版本，返回序列化后的响应（参数同 get_news）"""
+        return await self._run(lambda: _dumps(self.get_news(**kwargs)))
+
+    async def get_international_news_json(self, **kwargs) -> bytes:
+        """get_international_news 的非阻塞版本，返回序列化后的响应"""
+        return await self._run(lambda: _dumps(self.get_international_news(**kwargs)))
+
+    def _load_news_from_file(
+        self, latest_file: str, previous: Optional[NewsCollection] = None
+    ) -> Optional[NewsCollection]:
+        """加载国内新闻数据，失败返回 None"""
+        try:
             with open(latest_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
             if isinstance(data, list):
-                self.news_data = data
-                return True
-            return False
+                return domestic_collection(data, previous)
+            return None
         except Exception as e:
             print(f"Error loading news: {e}")
-            return False
+            return None
 
-    def _load_irena_news_from_file(self) -> bool:
-        """加载 IRENA 新闻数据"""
+    def _load_irena_news_from_file(self, latest_file: str) -> Optional[List[Dict]]:
+        """加载 IRENA 新闻数据，失败返回 None"""
         try:
-            latest_file = self._find_latest_file("irena_*_translated.json")
-            if not latest_file:
-                return False
-
             with open(latest_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
             if isinstance(data, list):
-                self.irena_news_data = data
-                return True
+                return data
             elif isinstance(data, dict) and "news_list" in data:
-                self.irena_news_data = data["news_list"]
-                return True
-            return False
+                return data["news_list"]
+            return None
         except Exception as e:
             print(f"Error loading IRENA news: {e}")
-            return False
+            return None
 
-    def _load_translated_news_from_file(self) -> bool:
-        """加载翻译新闻数据"""
+    def _load_translated_news_from_file(
+        self, latest_file: str, previous: Optional[NewsCollection] = None
+    ) -> Optional[NewsCollection]:
+        """加载翻译新闻数据，失败返回 None"""
         try:
-            latest_file = self._find_latest_file("translator_*.json")
-            if not latest_file:
-                return False
-
             with open(latest_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
             if isinstance(data, dict) and "news_list" in data:
-                self.translated_news_data = data["news_list"]
-                return True
-            elif isinstance(data, list):
-                self.translated_news_data = data
-                return True
-            return False
+                data = data["news_list"]
+            elif not isinstance(data, list):
+                return None
+
+            return international_collection(data, previous)
         except Exception as e:
             print(f"Error loading translated news: {e}")
-            return False
-
-    def _load_ai_summaries(self):
-        """加载 AI 总结数据"""
-        domestic_file = DATA_DIR / "summary_domestic.json"
-        international_file = DATA_DIR / "summary_international.json"
+            return None
 
+    def _load_summary_from_file(self, latest_file: str) -> Any:
+        """加载 AI 总结数据，失败返回 None"""
         try:
-            if domestic_file.exists():
-                with open(domestic_file, "r", encoding="utf-8") as f:
-                    self.domestic_ai_summary = json.load(f)
-        except Exception:
-            pass
+            with open(latest_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading AI summary: {e}")
+            return None
 
-        try:
-            if international_file.exists():
-                with open(international_file, "r", encoding="utf-8") as f:
-                    self.international_ai_summary = json.load(f)
-        except Exception:
-            pass
+    def _use_archive(self, collection: NewsCollection, query: tuple, scope: Optional[str]) -> bool:
+        """
+        选择数据范围：latest 为最新文件（内存），archive 为历史归档；
+        不指定时，起始日期早于最新文件中最早的新闻则查询归档
+
+        Raises:
+            ValueError: scope 非法或归档未启用
+        """
+        if scope is not None and scope not in QUERY_SCOPES:
+            raise ValueError(f"Invalid scope: {scope}. Use 'latest' or 'archive'.")
+        if scope == "archive" and self.archive is None:
+            raise ValueError("News archive is disabled")
+        if scope is not None:
+            return scope == "archive"
+
+        date_filter, start = query[0], query[1]
+        earliest = collection.earliest_ordinal
+        return (
+            self.archive is not None and date_filter and start is not None
+            and earliest is not None and start < earliest
+        )
+
+    def _page(
+        self,
+        snap: NewsSnapshot,
+        dataset: str,
+        start_date: str,
+        end_date: str,
+        keyword: str,
+        source: str,
+        limit: Optional[int],
+        cursor: Optional[str],
+        fields: Optional[List[str]],
+        scope: Optional[str] = None,
+        sort: Optional[str] = None,
+        collapse: bool = False
+    ) -> Dict[str, Any]:
+        """在快照的指定数据集（筛选结果走缓存）或历史归档上查询，再分页"""
+        collection = getattr(snap, dataset)
+        query = normalize_query(start_date, end_date, keyword, source)
+        sort = normalize_sort(sort, query[3])
+        if self._use_archive(collection, query, scope):
+            page = self.archive.page(dataset, query, limit, cursor, fields, sort)
+            if cursor:
+                # 归档的统计只在第一页计算
+                return {**page, "scope": "archive"}
+            return {**page, "scope": "archive", "total_count": self.archive.count(dataset)}
+
+        match = self.query_cache.get_or_compute(
+            (dataset, snap.version, sort, collapse) + query, lambda: collection.match(query, sort, collapse)
+        )
+        page = collection.paginate(match, limit, cursor, fields)
+        return {**page, "scope": "latest", "total_count": len(collection)}
 
     def get_news(
         self,
         start_date: str = None,
         end_date: str = None,
         keyword: str = None,
-        source: str = None
+        source: str = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        scope: Optional[str] = None,
+        sort: Optional[str] = None,
+        collapse: bool = False
     ) -> Dict[str, Any]:
-        """获取筛选后的国内新闻"""
-        self.check_and_reload_data()
-
-        filtered = []
-        for news in self.news_data:
-            include = True
-
-            # 日期筛选
-            if start_date and end_date:
-                try:
-                    news_date = datetime.strptime(news["date"], "%Y-%m-%d").date()
-                    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-                    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-                    if not (start <= news_date <= end):
-                        include = False
-                except ValueError:
-                    include = False
-
-            # 关键词筛选
-            if include and keyword:
-                if keyword.lower() not in news.get("title", "").lower():
-                    include = False
-
-            # 来源筛选
-            if include and source:
-                if news.get("source") != source:
-                    include = False
-
-            if include:
-                filtered.append(news)
-
-        # 按日期排序
-        filtered.sort(key=lambda x: x.get("date", ""), reverse=True)
-
-        # 统计来源
-        source_stats = {}
-        for news in filtered:
-            src = news.get("source", "Unknown")
-            source_stats[src] = source_stats.get(src, 0) + 1
+        """
+        获取筛选后的国内新闻
+
+        limit 为 None 时返回全部命中记录；否则按 keyset 游标分页，
+        count 和 source_stats 始终覆盖全部命中记录（查询归档时只在第一页返回）。
+        scope 为 latest 时查询最新数据文件，为 archive 时查询历史归档，
+        不指定时按起始日期自动选择（见 _use_archive）。
+        sort 为 relevance 时按 BM25 相关度排序（需要关键词），默认按日期倒序。
+        collapse 为 True 时近似重复的新闻只返回一条（带 cluster_size），仅作用于最新数据。
+
+        Raises:
+            ValueError: 游标、scope 或 sort 非法
+        """
+        snap = self.snapshot
+        page = self._page(snap, "domestic", start_date, end_date, keyword, source, limit, cursor, fields, scope, sort, collapse)
 
         return {
             "success": True,
-            "data": filtered,
-            "count": len(filtered),
-            "total_count": len(self.news_data),
-            "source_stats": source_stats,
-            "last_update": self.last_update_time.strftime("%Y-%m-%d %H:%M:%S") if self.last_update_time else None
+            **page,
+            "last_update": snap.domestic_last_update
         }
 
     def get_news_stats(self) -> Dict[str, Any]:
         """获取国内新闻统计"""
-        source_stats = {}
-        for news in self.news_data:
-            src = news.get("source", "Unknown")
-            source_stats[src] = source_stats.get(src, 0) + 1
-
-        return {
-            "success": True,
-            "total_count": len(self.news_data),
-            "source_stats": source_stats,
-            "last_update": self.last_update_time.strftime("%Y-%m-%d %H:%M:%S") if self.last_update_time else None
-        }
+        snap = self.snapshot
+        return self._stats(snap.domestic, snap.domestic_last_update)
 
     def get_international_news(
         self,
         start_date: str = None,
         end_date: str = None,
         keyword: str = None,
-        source: str = None
+        source: str = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        scope: Optional[str] = None,
+        sort: Optional[str] = None,
+        collapse: bool = False
     ) -> Dict[str, Any]:
-        """获取筛选后的国际新闻（翻译合并数据）"""
-        self.check_and_reload_data()
-
-        filtered = []
-        for news in self.translated_news_data:
-            include = True
-
-            # 日期筛选
-            if start_date and end_date:
-                try:
-                    date_str = news.get("publish_date") or news.get("date", "")
-                    if date_str:
-                        if re.match(r"\d{4}-\d{2}-\d{2}", date_str):
-                            news_date = datetime.strptime(date_str[:10], "%Y-%m-%d").date()
-                        else:
-                            include = False
-                            continue
-
-                        start = datetime.strptime(start_date, "%Y-%m-%d").date()
-                        end = datetime.strptime(end_date, "%Y-%m-%d").date()
-                        if not (start <= news_date <= end):
-                            include = False
-                except ValueError:
-                    include = False
-
-            # 关键词筛选
-            if include and keyword:
-                kw_lower = keyword.lower()
-                title = news.get("title_translated", "") or news.get("title", "")
-                summary = news.get("summary", "")
-                if kw_lower not in title.lower() and kw_lower not in summary.lower():
-                    include = False
-
-            # 来源筛选
-            if include and source:
-                if news.get("source") != source:
-                    include = False
-
-            if include:
-                filtered.append(news)
-
-        # 按日期排序
-        filtered.sort(key=lambda x: x.get("publish_date") or x.get("date", ""), reverse=True)
-
-        # 统计来源
-        source_stats = {}
-        for news in filtered:
-            src = news.get("source", "Unknown")
-            source_stats[src] = source_stats.get(src, 0) + 1
+        """
+        获取筛选后的国际新闻（翻译合并数据），分页、scope、sort 和 collapse 参数同 get_news
+
+        Raises:
+            ValueError: 游标、scope 或 sort 非法
+        """
+        snap = self.snapshot
+        page = self._page(snap, "international", start_date, end_date, keyword, source, limit, cursor, fields, scope, sort, collapse)
 
         return {
             "success": True,
-            "data": filtered,
-            "count": len(filtered),
-            "total_count": len(self.translated_news_data),
-            "source_stats": source_stats,
-            "last_update": self.last_translated_update_time.strftime("%Y-%m-%d %H:%M:%S") if self.last_translated_update_time else None
+            **page,
+            "last_update": snap.international_last_update
         }
 
     def get_international_stats(self) -> Dict[str, Any]:
         """获取国际新闻统计"""
-        source_stats = {}
-        for news in self.translated_news_data:
-            src = news.get("source", "Unknown")
-            source_stats[src] = source_stats.get(src, 0) + 1
+        snap = self.snapshot
+        return self._stats(snap.international, snap.international_last_update)
 
+    def _stats(self, collection: NewsCollection, last_update: Optional[str]) -> Dict[str, Any]:
+        """全量统计（分面计数在快照构建时已算好）"""
+        facets = collection.facets
         return {
             "success": True,
-            "total_count": len(self.translated_news_data),
-            "source_stats": source_stats,
-            "last_update": self.last_translated_update_time.strftime("%Y-%m-%d %H:%M:%S") if self.last_translated_update_time else None
+            "total_count": len(collection),
+            "source_stats": facets.counts("source"),
+            "content_type_stats": facets.counts("content_type"),
+            "category_stats": facets.counts("category"),
+            "last_update": last_update
         }
 
-    def get_ai_summary(self, news_type: str) -> Dict[str, Any]:
-        """获取 AI 总结"""
-        self._load_ai_summaries()
+    def _timeline(
+        self,
+        collection: NewsCollection,
+        last_update: Optional[str],
+        start_date: str = None,
+        end_date: str = None
+    ) -> Dict[str, Any]:
+        """
+        按日 × 来源的新闻数量（日期升序），用于绘制趋势图
+
+        Raises:
+            ValueError: 日期格式非法
+        """
+        bounds = []
+        for value in (start_date, end_date):
+            ordinal = parse_query_date(value) if value else None
+            if value and ordinal is None:
+                raise ValueError(f"Invalid date: {value}")
+            bounds.append(ordinal)
+
+        facets = collection.facets
+        return {
+            "success": True,
+            "data": facets.timeline(*bounds),
+            "sources": facets.sources,
+            "last_update": last_update
+        }
 
-        if news_type == "domestic":
-            return {
-                "success": True,
-                "data": self.domestic_ai_summary
-            }
-        elif news_type == "international":
+    def get_news_timeline(self, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+        """国内新闻按日统计"""
+        snap = self.snapshot
+        return self._timeline(snap.domestic, snap.domestic_last_update, start_date, end_date)
+
+    def get_international_timeline(self, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+        """国际新闻按日统计"""
+        snap = self.snapshot
+        return self._timeline(snap.international, snap.international_last_update, start_date, end_date)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """服务运行指标（数据版本、查询缓存命中率和内存占用）"""
+        snap = self.snapshot
+        return {
+            "success": True,
+            "snapshot_version": snap.version,
+            "domestic_count": len(snap.domestic),
+            "international_count": len(snap.international),
+            "query_cache": self.query_cache.stats(),
+        }
+
+    def get_ai_summary_payload(self, news_type: str, date: Optional[str] = None) -> Optional[bytes]:
+        """
+        预先序列化的 AI 总结响应（随快照构建，请求时只做一次字典查找）
+
+        Args:
+            news_type: domestic / international
+            date: 总结日期 (YYYY-MM-DD)，不传返回全部历史
+
+        Returns:
+            JSON 字节串；类型非法或该日期没有总结时返回 None
+        """
+        return self.snapshot.summary_payloads.get((news_type, date or None))
+
+    def get_ai_summary(self, news_type: str, date: Optional[str] = None) -> Dict[str, Any]:
+        """获取 AI 总结（date 为空时返回全部历史）"""
+        if news_type not in SUMMARY_TYPES:
             return {
-                "success": True,
-                "data": self.international_ai_summary
+                "success": False,
+                "error": "Invalid news type. Use 'domestic' or 'international'."
             }
-        else:
+
+        payload = self.get_ai_summary_payload(news_type, date)
+        if payload is None:
             return {
                 "success": False,
-                "error": "Invalid news type. Use 'domestic' or 'international'."
+                "error": f"No {news_type} summary for {date}."
             }
+        return json.loads(payload)
 
 
 # 全局单例
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""新闻数据快照 - 某一代数据（记录、索引、AI 总结、更新时间、文件签名）的只读视图
+
+重新加载时在后台构建完整的新快照（未变化的数据集直接复用旧快照中的对象），
+构建完成后通过一次属性赋值整体发布。请求处理开始时取一次当前快照并只读取它，
+因此同一请求内的筛选、统计和更新时间必然来自同一代数据，加载过程也不阻塞读者。
+"""
+import json
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from backend.services.news_collection import (
+    NewsCollection,
+    domestic_date,
+    domestic_search_fields,
+    international_date,
+    international_search_fields,
+)
+
+
+def domestic_collection(records: List[Dict], previous: Optional[NewsCollection] = None) -> NewsCollection:
+    """构建国内新闻集合（previous 为上一代集合，用于增量构建检索索引）"""
+    return NewsCollection(records, domestic_date, domestic_search_fields, previous)
+
+
+def international_collection(records: List[Dict], previous: Optional[NewsCollection] = None) -> NewsCollection:
+    """构建国际新闻集合（previous 为上一代集合，用于增量构建检索索引）"""
+    return NewsCollection(records, international_date, international_search_fields, previous)
+
+
+SUMMARY_TYPES = ("domestic", "international")
+
+
+def summary_payloads(news_type: str, summary: Any) -> Dict[Tuple[str, Optional[str]], bytes]:
+    """
+    预先序列化 AI 总结接口的响应
+
+    Args:
+        news_type: domestic / international
+        summary: 总结文件内容（按日期倒序的每日总结列表，最多 30 天）
+
+    Returns:
+        {(类型, None): 全部历史, (类型, 日期): 当日总结}，值为 JSON 字节串
+    """
+    def dump(data: Any) -> bytes:
+        return json.dumps(
+            {"success": True, "data": data}, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    payloads = {(news_type, None): dump(summary)}
+    if isinstance(summary, list):
+        for item in summary:
+            day = item.get("date") if isinstance(item, dict) else None
+            # 同一日期只保留最新的一条（文件按日期倒序）
+            if day and (news_type, day) not in payloads:
+                payloads[(news_type, day)] = dump([item])
+    return payloads
+
+
+def _format_time(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else None
+
+
+@dataclass(frozen=True)
+class NewsSnapshot:
+    """
+    一代新闻数据（发布后不再修改）
+
+    Attributes:
+        version: 快照版本号，每次发布新快照递增
+        domestic: 国内新闻集合
+        international: 国际新闻集合（翻译合并数据）
+        irena: IRENA 新闻记录
+        domestic_updated: 国内新闻加载时间
+        international_updated: 国际新闻加载时间
+        irena_updated: IRENA 新闻加载时间
+        summaries: 类型 -> AI 总结文件内容
+        summary_payloads: (类型, 日期或 None) -> 预先序列化的总结接口响应
+        signatures: 数据集 -> 已加载文件的 stat 签名
+    """
+
+    version: int = 0
+    domestic: NewsCollection = field(default_factory=lambda: domestic_collection([]))
+    international: NewsCollection = field(default_factory=lambda: international_collection([]))
+    irena: List[Dict] = field(default_factory=list)
+    domestic_updated: Optional[datetime] = None
+    international_updated: Optional[datetime] = None
+    irena_updated: Optional[datetime] = None
+    summaries: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({news_type: {} for news_type in SUMMARY_TYPES})
+    )
+    summary_payloads: Mapping[Tuple[str, Optional[str]], bytes] = field(
+        default_factory=lambda: MappingProxyType({
+            key: payload for news_type in SUMMARY_TYPES for key, payload in summary_payloads(news_type, {}).items()
+        })
+    )
+    signatures: Mapping[str, Optional[tuple]] = field(default_factory=lambda: MappingProxyType({}))
+
+    def evolve(self, **changes) -> "NewsSnapshot":
+        """
+        基于当前快照生成下一代快照（未指定的部分沿用当前对象）
+
+        summaries 只需给出变化的类型，响应字节串随之重新生成。
+        """
+        if "signatures" in changes:
+            changes["signatures"] = MappingProxyType(dict(changes["signatures"]))
+        if "summaries" in changes:
+            summaries = {**self.summaries, **changes["summaries"]}
+            payloads = {}
+            for news_type, summary in summaries.items():
+                payloads.update(summary_payloads(news_type, summary))
+            changes["summaries"] = MappingProxyType(summaries)
+            changes["summary_payloads"] = MappingProxyType(payloads)
+        return replace(self, version=self.version + 1, **changes)
+
+    @property
+    def domestic_last_update(self) -> Optional[str]:
+        return _format_time(self.domestic_updated)
+
+    @property
+    def international_last_update(self) -> Optional[str]:
+        return _format_time(self.international_updated)
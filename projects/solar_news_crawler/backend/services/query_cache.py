@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""查询结果缓存 - 有界 LRU
+
+键由数据集、快照版本和规范化后的筛选参数组成：数据重新加载后版本号变化，
+旧结果不会再被命中，随后按 LRU 顺序被淘汰，无需显式失效。
+缓存的是筛选结果（命中位置 + 来源统计），分页和字段投影每次请求单独计算。
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from backend.config import QUERY_CACHE_SIZE
+from backend.services.news_collection import QueryMatch
+
+
+def _match_size(match: QueryMatch) -> int:
+    """结果占用内存的估算值（字节，只计容器本身，记录对象与快照共享）"""
+    size = sys.getsizeof(match) + sys.getsizeof(match.source_stats)
+    if match.positions is not None:
+        size += sys.getsizeof(match.positions)
+    if match.scores is not None:
+        size += sys.getsizeof(match.scores) + sys.getsizeof(0.0) * len(match.scores)
+    return size
+
+
+class QueryCache:
+    """线程安全的有界 LRU 查询结果缓存"""
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE):
+        """
+        Args:
+            max_entries: 最多缓存的结果数，0 表示禁用缓存
+        """
+        self.max_entries = max(max_entries, 0)
+        self._entries: "OrderedDict[Hashable, QueryMatch]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], QueryMatch]) -> QueryMatch:
+        """命中则返回缓存结果，否则调用 compute 计算并缓存（计算过程不持锁）"""
+        with self._lock:
+            match = self._entries.get(key)
+            if match is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return match
+            self.misses += 1
+
+        match = compute()
+        if self.max_entries == 0:
+            return match
+
+        size = _match_size(match)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = match
+                self._sizes[key] = size
+                self.bytes += size
+                while len(self._entries) > self.max_entries:
+                    old_key, _ = self._entries.popitem(last=False)
+                    self.bytes -= self._sizes.pop(old_key)
+                    self.evictions += 1
+        return match
+
+    def clear(self):
+        """清空缓存（统计计数保留）"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """命中率和内存占用"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "approx_bytes": self.bytes,
+            }
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""翻译提供方的自适应限速器 - AIMD
+
+每个提供方（LibreTranslate / MyMemory / SimplyTranslate）一个限速器，只对真实的上游请求生效，
+缓存命中不等待：
+- 请求成功：请求间隔线性缩短（加性增速），直到下限
+- 429 / 5xx：请求间隔成倍增加（乘性减速），直到上限；带 Retry-After 时至少等待该时长
+- 网络错误和其他状态码只计入失败，不改变速率
+
+线程安全：多个线程共用一个限速器时按预约的时间片依次放行。
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backend.config import TRANSLATE_INTERVAL, TRANSLATE_MAX_INTERVAL, TRANSLATE_MIN_INTERVAL
+
+# 成功一次缩短的间隔（秒）
+SUCCESS_STEP = 0.1
+# 被限流时间隔的放大倍数
+BACKOFF_FACTOR = 2.0
+
+
+def is_throttled(status: int) -> bool:
+    """状态码是否表示上游过载（需要减速）"""
+    return status == 429 or status >= 500
+
+
+class AdaptiveRateLimiter:
+    """单个提供方的 AIMD 限速器"""
+
+    def __init__(
+        self,
+        name: str,
+        interval: float = TRANSLATE_INTERVAL,
+        min_interval: float = TRANSLATE_MIN_INTERVAL,
+        max_interval: float = TRANSLATE_MAX_INTERVAL,
+    ):
+        self.name = name
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """清零计数（当前速率保留）"""
+        with self._lock:
+            self.calls = 0
+            self.successes = 0
+            self.failures = 0
+            self.throttled = 0
+            self.slept = 0.0
+
+    def acquire(self):
+        """等待下一个请求时间片（在锁内预约，锁外睡眠）"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self.interval
+            wait = start - now
+            self.calls += 1
+            self.slept += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, status: Optional[int], retry_after: Optional[float] = None):
+        """
+        记录请求结果并调整速率
+
+        Args:
+            status: HTTP 状态码，网络错误 / 超时为 None
+            retry_after: 上游要求的等待秒数（Retry-After）
+        """
+        with self._lock:
+            if status is not None and 200 <= status < 300:
+                self.successes += 1
+                self.interval = max(self.min_interval, self.interval - SUCCESS_STEP)
+                return
+
+            if status is not None and is_throttled(status):
+                self.throttled += 1
+                self.interval = min(self.max_interval, self.interval * BACKOFF_FACTOR)
+                pause = max(self.interval, retry_after or 0.0)
+                self._next_at = max(self._next_at, time.monotonic() + pause)
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "throttled": self.throttled,
+                "slept_seconds": round(self.slept, 3),
+                "interval": round(self.interval, 3),
+            }
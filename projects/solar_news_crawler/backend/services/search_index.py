@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""关键词倒排索引
+
+分词规则（统一转小写）：
+- 中日韩文字：单字 + 相邻二元组（bigram）
+- 其他文字（英文、数字、翻译后的标题/摘要）：按单词切分
+
+查询时对关键词做同样的切分，中文取 bigram（单字查询取单字）的倒排表求交集；
+英文片段可能只是单词的一部分（如 "solar" 命中 "photovoltaic-solar"、"pow" 命中 "power"），
+因此先在词表中查找包含该片段的词，再合并它们的倒排表。
+索引只用于缩小候选范围，最终仍按原有的子串语义逐条校验，结果与线性扫描完全一致。
+
+倒排表以 NumPy 数组存储（按词连续排列的记录下标、各字段词频，词 -> 区间偏移），
+候选集合的求交 / 求并和打分都是数组运算，不逐条遍历倒排项。
+
+相关度排序使用 BM25F：建索引时把各字段的词频按字段权重和长度归一化合并成一个值
+（对全部倒排项一次向量化计算），查询时每个检索词对命中记录做一次 np.add.at 累加
+和一次 idf * tf / (k1 + tf) 运算。
+
+数据重新加载时基于上一代索引构建（previous）：未变化记录（检索字段相同）的倒排项
+按新下标整体平移复用，只对新记录分词；字段平均长度变化后的权重随之重新向量化计算。
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# 中日韩文字（CJK 统一汉字、扩展 A、兼容汉字、假名、谚文）
+_CJK = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_CJK_RUN = re.compile(f"[{_CJK}]+")
+_SPLIT = re.compile(r"[\W_]+")
+_CHUNK = re.compile(f"[{_CJK}]+|[^{_CJK}]+")
+
+# 英文片段 -> 词表匹配结果的缓存上限（索引重建时随之丢弃）
+_FRAGMENT_CACHE_SIZE = 1024
+
+# BM25 参数与字段权重（依次对应检索字段：标题、英文原标题、摘要），标题命中的权重更高
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = (2.0, 2.0, 1.0)
+
+
+def _runs(text: str) -> List[str]:
+    """将小写文本切分为连续的中文片段和单词片段"""
+    runs = []
+    for chunk in _SPLIT.split(text):
+        if chunk:
+            runs.extend(_CHUNK.findall(chunk))
+    return runs
+
+
+def token_stream(text: str) -> List[str]:
+    """文本分词，保留重复（用于统计词频）"""
+    tokens = []
+    for run in _runs(text.lower()):
+        if _CJK_RUN.fullmatch(run):
+            tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def tokenize(text: str) -> Set[str]:
+    """文本分词（用于建索引）"""
+    return set(token_stream(text))
+
+
+def _idf(doc_count: int, df: int) -> float:
+    return math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+
+def keyword_terms(keyword: str) -> Tuple[List[str], List[str]]:
+    """
+    关键词（已转小写）的检索词
+
+    Returns:
+        (中文检索词, 英文片段)：中文取 bigram（单字取单字），英文片段可能只是单词的一部分
+    """
+    grams, fragments = [], []
+    for run in _runs(keyword):
+        if _CJK_RUN.fullmatch(run):
+            grams.extend([run] if len(run) == 1 else [run[i:i + 2] for i in range(len(run) - 1)])
+        else:
+            fragments.append(run)
+    return grams, fragments
+
+
+class SearchIndex:
+    """关键词倒排索引（构建后只读）"""
+
+    def __init__(self, documents: Sequence[Sequence[str]], previous: Optional["SearchIndex"] = None):
+        """
+        Args:
+            documents: 每条记录参与检索的字段文本（如 [标题] 或 [标题, 摘要]），
+                下标即记录在原列表中的位置
+            previous: 上一代索引（复用未变化记录的倒排项），结果与全量构建一致
+        """
+        self._fields: List[Tuple[str, ...]] = [tuple((text or "").lower() for text in fields) for fields in documents]
+        self._fragment_cache: Dict[str, Tuple[np.ndarray, List[int]]] = {}
+        doc_count = len(self._fields)
+        field_count = max((len(fields) for fields in self._fields), default=0)
+        if previous is not None and previous._lengths.shape[1] != field_count:
+            previous = None
+
+        # 上一代记录下标 -> 新下标（-1 为已移除），其余为需要分词的新记录
+        remap = np.full(len(previous._fields) if previous is not None else 0, -1, dtype=np.int64)
+        new_docs: List[int] = []
+        unchanged: Dict[Tuple[str, ...], List[int]] = {}
+        if previous is not None:
+            for old_id, fields in enumerate(previous._fields):
+                unchanged.setdefault(fields, []).append(old_id)
+        for doc_id, fields in enumerate(self._fields):
+            old_ids = unchanged.get(fields)
+            if old_ids:
+                remap[old_ids.pop()] = doc_id
+            else:
+                new_docs.append(doc_id)
+
+        # 词 -> 词编号（倒排表在数组中的区间序号）
+        vocab: Dict[str, int] = dict(previous._vocab) if previous is not None else {}
+        self._lengths = np.zeros((doc_count, field_count), dtype=np.int64)
+        term_parts, doc_parts, tf_parts = [], [], []
+        if previous is not None:
+            kept = remap >= 0
+            self._lengths[remap[kept]] = previous._lengths[kept]
+            old_terms = np.repeat(np.arange(len(previous._offsets) - 1), np.diff(previous._offsets))
+            old_docs = remap[previous._doc_ids]
+            live = old_docs >= 0
+            term_parts.append(old_terms[live])
+            doc_parts.append(old_docs[live])
+            tf_parts.append(previous._tfs[live])
+
+        new_terms, new_doc_ids, new_matrix = self._count_new(new_docs, vocab, field_count)
+        term_parts.append(new_terms)
+        doc_parts.append(new_doc_ids)
+        tf_parts.append(new_matrix)
+
+        terms = np.concatenate(term_parts)
+        doc_ids = np.concatenate(doc_parts)
+        tfs_matrix = np.concatenate(tf_parts)
+
+        # 去掉已没有记录的词，词编号重新连续编排
+        df = np.bincount(terms, minlength=len(vocab))
+        if not df.all():
+            live_terms = df > 0
+            renumber = (np.cumsum(live_terms) - 1).tolist()
+            vocab = {token: renumber[i] for token, i in vocab.items() if live_terms[i]}
+            terms = np.asarray(renumber, dtype=np.int64)[terms]
+            df = df[live_terms]
+
+        # 按 (词, 记录下标) 排序，每个词的倒排项连续且记录下标升序
+        order = np.lexsort((doc_ids, terms))
+        self._vocab = vocab
+        self._offsets = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+        self._doc_ids = doc_ids[order]
+        self._tfs = tfs_matrix[order]
+
+        # 各字段的平均长度（BM25 长度归一化），全部倒排项的加权归一化词频一次算出
+        totals = self._lengths.sum(axis=0)
+        self._avg_lengths = np.where(totals > 0, totals / max(doc_count, 1), 1.0)
+        field_weights = np.array(
+            [FIELD_WEIGHTS[i] if i < len(FIELD_WEIGHTS) else 1.0 for i in range(field_count)]
+        )
+        norms = 1 - BM25_B + BM25_B * self._lengths / self._avg_lengths
+        self._weights = (self._tfs * field_weights / norms[self._doc_ids]).sum(axis=1)
+
+        # 非中文词表（用于英文片段的子串查找）
+        self._words = [t for t in self._vocab if not _CJK_RUN.match(t)]
+
+    def _count_new(
+        self, new_docs: Sequence[int], vocab: Dict[str, int], field_count: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        新记录逐字段分词（新词追加到 vocab），并写入各字段长度
+
+        Returns:
+            (词编号, 记录下标, 各字段词频矩阵)，每个 (词, 记录) 一行，按 (词, 记录) 排序
+        """
+        # 每个 (词, 记录, 字段) 一项，再合并为每个 (词, 记录) 一行
+        terms: List[int] = []
+        doc_ids: List[int] = []
+        field_ids: List[int] = []
+        tfs: List[int] = []
+        lengths: List[List[int]] = []
+        counted: Dict[Tuple[str, ...], List[Tuple[List[int], List[int]]]] = {}
+        for doc_id in new_docs:
+            fields = self._fields[doc_id]
+            field_terms = counted.get(fields)
+            if field_terms is None:
+                field_terms = []
+                for text in fields:
+                    counter = Counter(token_stream(text))
+                    field_terms.append(([vocab.setdefault(t, len(vocab)) for t in counter], list(counter.values())))
+                counted[fields] = field_terms
+            doc_lengths = [0] * field_count
+            for i, (term_ids, field_tfs) in enumerate(field_terms):
+                doc_lengths[i] = sum(field_tfs)
+                terms.extend(term_ids)
+                tfs.extend(field_tfs)
+                doc_ids.extend([doc_id] * len(term_ids))
+                field_ids.extend([i] * len(term_ids))
+            lengths.append(doc_lengths)
+        if new_docs:
+            self._lengths[list(new_docs)] = lengths
+
+        entry_terms = np.array(terms, dtype=np.int64)
+        entry_docs = np.array(doc_ids, dtype=np.int64)
+        order = np.lexsort((entry_docs, entry_terms))
+        entry_terms, entry_docs = entry_terms[order], entry_docs[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (entry_terms[1:] != entry_terms[:-1]) | (entry_docs[1:] != entry_docs[:-1])
+        matrix = np.zeros((int(first.sum()), field_count), dtype=np.int32)
+        matrix[np.cumsum(first) - 1, np.array(field_ids, dtype=np.int64)[order]] = np.array(tfs, dtype=np.int32)[order]
+        return entry_terms[first], entry_docs[first], matrix
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def _postings(self, term_ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """若干个词的倒排项（记录下标, 权重）拼接在一起"""
+        ranges = [slice(self._offsets[t], self._offsets[t + 1]) for t in term_ids]
+        if len(ranges) == 1:
+            return self._doc_ids[ranges[0]], self._weights[ranges[0]]
+        return (
+            np.concatenate([self._doc_ids[r] for r in ranges] or [np.empty(0, dtype=np.int64)]),
+            np.concatenate([self._weights[r] for r in ranges] or [np.empty(0)]),
+        )
+
+    def _word_fragment(self, fragment: str) -> Tuple[np.ndarray, List[int]]:
+        """包含该英文片段的所有单词（词编号），及其倒排表并集（升序记录下标）"""
+        cached = self._fragment_cache.get(fragment)
+        if cached is not None:
+            return cached
+
+        words = [fragment] if fragment in self._vocab else []
+        words.extend(word for word in self._words if fragment in word and word != fragment)
+        term_ids = [self._vocab[word] for word in words]
+        docs = self._postings(term_ids)[0]
+        if len(term_ids) > 1:
+            docs = np.unique(docs)
+
+        if len(self._fragment_cache) >= _FRAGMENT_CACHE_SIZE:
+            self._fragment_cache.clear()
+        self._fragment_cache[fragment] = (docs, term_ids)
+        return docs, term_ids
+
+    def _gram_docs(self, gram: str) -> np.ndarray:
+        """单个中文检索词的倒排表（升序记录下标）"""
+        term_id = self._vocab.get(gram)
+        if term_id is None:
+            return np.empty(0, dtype=np.int64)
+        return self._postings([term_id])[0]
+
+    def _candidates(self, keyword: str) -> Optional[np.ndarray]:
+        """倒排表求交得到候选记录下标（升序；None 表示关键词无法分词，需要全量校验）"""
+        grams, fragments = keyword_terms(keyword)
+        posting_sets = [self._gram_docs(g) for g in grams]
+        posting_sets.extend(self._word_fragment(f)[0] for f in fragments)
+
+        if not posting_sets:
+            return None
+
+        posting_sets.sort(key=len)
+        candidates = posting_sets[0]
+        for postings in posting_sets[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+        return candidates
+
+    def search(self, keyword: str) -> List[int]:
+        """
+        查询包含关键词（不区分大小写的子串匹配）的记录
+
+        Returns:
+            命中记录的下标（升序）
+        """
+        keyword = keyword.lower()
+        candidates = self._candidates(keyword)
+        doc_ids = range(len(self._fields)) if candidates is None else candidates.tolist()
+        return [
+            doc_id for doc_id in doc_ids
+            if any(keyword in text for text in self._fields[doc_id])
+        ]
+
+    def scores(self, keyword: str, doc_ids: Sequence[int]) -> List[float]:
+        """
+        BM25F 相关度
+
+        每个检索词取其倒排项中属于 doc_ids 的部分（在排序后的 doc_ids 上二分查找），
+        用 np.add.at 累加词频后整体计算 idf * tf * (k1 + 1) / (k1 + tf)。
+
+        Args:
+            keyword: 查询关键词
+            doc_ids: 需要打分的记录下标（通常为 search() 的结果）
+
+        Returns:
+            与 doc_ids 一一对应的得分
+        """
+        grams, fragments = keyword_terms(keyword.lower())
+        doc_count = len(self._fields)
+        terms = []
+        for gram in dict.fromkeys(grams):
+            term_id = self._vocab.get(gram)
+            if term_id is not None:
+                terms.append((_idf(doc_count, self._offsets[term_id + 1] - self._offsets[term_id]), [term_id]))
+        for fragment in dict.fromkeys(fragments):
+            docs, term_ids = self._word_fragment(fragment)
+            if len(docs):
+                terms.append((_idf(doc_count, len(docs)), term_ids))
+
+        targets = np.asarray(doc_ids, dtype=np.int64)
+        scores = np.zeros(len(targets))
+        if not terms or not len(targets):
+            return scores.tolist()
+
+        order = np.argsort(targets, kind="stable")
+        sorted_targets = targets[order]
+        for idf, term_ids in terms:
+            posting_docs, weights = self._postings(term_ids)
+            slots = np.searchsorted(sorted_targets, posting_docs)
+            hit = slots < len(sorted_targets)
+            hit[hit] = sorted_targets[slots[hit]] == posting_docs[hit]
+            tf = np.zeros(len(targets))
+            np.add.at(tf, order[slots[hit]], weights[hit])
+            scores += idf * tf * (BM25_K1 + 1) / (BM25_K1 + tf)
+        return scores.tolist()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""翻译缓存 - SQLite 键值存储
+
+- 条目按 (语言对, 提供方, 原文 MD5) 区分，同一原文可同时保留不同提供方的译文
+- 数据库在首次查询时才打开，查询逐条走主键，不把整个缓存读入内存
+- 新译文和访问时间先记在内存中，每 flush_every 条写入一次（一个事务），结束时 flush() 落盘
+- 落盘时按年龄和 LRU 淘汰：超过 max_age_days 未访问的条目删除，总数超过 max_entries 时删除最久未访问的
+- 首次打开时导入旧版 translation_cache.json（提供方记为 legacy），导入后原文件改名为 .json.bak
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from backend.config import (
+    TRANSLATION_CACHE_FLUSH_EVERY,
+    TRANSLATION_CACHE_MAX_AGE_DAYS,
+    TRANSLATION_CACHE_MAX_ENTRIES,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    lang_pair TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    key TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (lang_pair, key, provider)
+);
+CREATE INDEX IF NOT EXISTS idx_translations_accessed ON translations (accessed_at);
+"""
+
+# 旧版 JSON 缓存条目的提供方
+LEGACY_PROVIDER = "legacy"
+DEFAULT_LANG_PAIR = "en-zh"
+
+
+def text_key(text: str) -> str:
+    """缓存键（原文 MD5，与旧版 JSON 缓存一致）"""
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """持久化翻译缓存（线程安全）"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        legacy_json: Optional[Path] = None,
+        max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES,
+        max_age_days: float = TRANSLATION_CACHE_MAX_AGE_DAYS,
+        flush_every: int = TRANSLATION_CACHE_FLUSH_EVERY,
+    ):
+        """
+        Args:
+            db_path: SQLite 数据库路径
+            legacy_json: 旧版 JSON 缓存文件，存在时在首次打开数据库时导入
+            max_entries: 最多保留的条目数，0 表示不限
+            max_age_days: 未访问超过该天数的条目被淘汰，0 表示不限
+            flush_every: 累积多少条新译文后写入一次
+        """
+        self.db_path = Path(db_path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self.max_entries = max(max_entries, 0)
+        self.max_age_days = max(max_age_days, 0)
+        self.flush_every = max(flush_every, 1)
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # 待写入的新译文：(语言对, 键, 提供方) -> 译文
+        self._pending: Dict[Tuple[str, str, str], str] = {}
+        # 待更新访问时间的条目 -> 访问时间
+        self._touched: Dict[Tuple[str, str, str], float] = {}
+        self.evictions = 0
+
+    # ==================== 连接 ====================
+
+    def _connection(self) -> sqlite3.Connection:
+        """首次使用时打开数据库（调用方持锁）"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._import_legacy(conn)
+        return self._conn
+
+    def _import_legacy(self, conn: sqlite3.Connection):
+        """导入旧版 JSON 缓存 {md5: 译文}"""
+        if self.legacy_json is None or not self.legacy_json.exists():
+            return
+        try:
+            with open(self.legacy_json, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取旧版翻译缓存失败: {e}")
+            return
+        if not isinstance(data, dict):
+            return
+
+        now = time.time()
+        rows = [
+            (DEFAULT_LANG_PAIR, LEGACY_PROVIDER, key, value, now, now)
+            for key, value in data.items()
+            if isinstance(key, str) and isinstance(value, str)
+        ]
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        self.legacy_json.replace(self.legacy_json.with_name(self.legacy_json.name + ".bak"))
+        print(f"已导入旧版翻译缓存 {len(rows)} 条")
+
+    # ==================== 读写 ====================
+
+    def get(
+        self,
+        text: str,
+        providers: Optional[Sequence[str]] = None,
+        lang_pair: str = DEFAULT_LANG_PAIR,
+    ) -> Optional[Tuple[str, str]]:
+        """
+        查询缓存
+
+        Args:
+            text: 原文
+            providers: 提供方优先顺序；同一原文有多个提供方的译文时取排在最前的，
+                不在列表中的提供方（如 legacy）排在最后
+            lang_pair: 语言对
+
+        Returns:
+            (译文, 提供方)，未命中返回 None
+        """
+        key = text_key(text)
+        order = {name: i for i, name in enumerate(providers or ())}
+        with self._lock:
+            candidates = dict(self._connection().execute(
+                "SELECT provider, translation FROM translations WHERE lang_pair = ? AND key = ?",
+                (lang_pair, key),
+            ).fetchall())
+            # 未写入的新译文优先于库中的旧值
+            candidates.update(
+                (provider, value)
+                for (pair, k, provider), value in self._pending.items()
+                if pair == lang_pair and k == key
+            )
+            if not candidates:
+                return None
+
+            provider = min(candidates, key=lambda name: (order.get(name, len(order)), name))
+            self._touched[(lang_pair, key, provider)] = time.time()
+            return candidates[provider], provider
+
+    def put(self, text: str, translation: str, provider: str, lang_pair: str = DEFAULT_LANG_PAIR):
+        """记录新译文（累积到 flush_every 条时写入数据库）"""
+        with self._lock:
+            self._pending[(lang_pair, text_key(text), provider)] = translation
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def flush(self):
+        """写入待保存的译文和访问时间，并执行淘汰"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending and not self._touched:
+            return
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                [(pair, provider, key, value, now, now) for (pair, key, provider), value in self._pending.items()],
+            )
+            conn.executemany(
+                "UPDATE translations SET accessed_at = ? WHERE lang_pair = ? AND key = ? AND provider = ?",
+                [(at, pair, key, provider) for (pair, key, provider), at in self._touched.items()],
+            )
+            self._evict(conn, now)
+        self._pending.clear()
+        self._touched.clear()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """按年龄和 LRU 淘汰"""
+        if self.max_age_days:
+            cursor = conn.execute(
+                "DELETE FROM translations WHERE accessed_at < ?", (now - self.max_age_days * 86400,)
+            )
+            self.evictions += cursor.rowcount
+        if self.max_entries:
+            excess = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0] - self.max_entries
+            if excess > 0:
+                cursor = conn.execute(
+                    "DELETE FROM translations WHERE rowid IN "
+                    "(SELECT rowid FROM translations ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += cursor.rowcount
+
+    def close(self):
+        """落盘并关闭数据库"""
+        with self._lock:
+            # 只有新译文、尚未打开数据库时也要落盘
+            self._flush()
+            if self._conn is None:
+                return
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> Dict[str, int]:
+        """已写入的条目数、待写入数和淘汰数"""
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            return {"entries": entries, "pending": len(self._pending), "evictions": self.evictions}
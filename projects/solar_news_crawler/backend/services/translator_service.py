@@ -1,21 +1,90 @@
 # -*- coding: utf-8 -*-
-"""翻译服务"""
+"""翻译服务
+
+上游请求按提供方自适应限速（见 rate_limiter），缓存命中的标题不等待。
+译文缓存在 SQLite 中（见 translation_cache），按提供方区分。
+批量翻译（translate_batch）对支持多条输入的提供方按批发送，失败的条目逐条回退到其余提供方，
+不再重复请求刚对该条失败的批量提供方；批次和逐条回退在服务持有的线程池中并发执行。
+各端点按观测到的延迟和错误率排序（见 endpoint_health），已知不可用的端点在冷却期内跳过。
+配置了 LLM 时，批量翻译优先使用 LLM（见 llm_translator），提供方顺序由 SOLAR_NEWS_TRANSLATE_PROVIDERS 指定。
+"""
 import glob
-import hashlib
 import json
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import requests
-
-from backend.config import DATA_DIR, CRAWLERS_DIR
+from requests.adapters import HTTPAdapter
+
+from backend.config import (
+    CRAWLERS_DIR,
+    DATA_DIR,
+    TRANSLATE_LLM_BATCH_SIZE,
+    TRANSLATE_PROVIDERS,
+    TRANSLATE_WORKERS,
+    TRANSLATION_CACHE_DB,
+)
+from backend.services.endpoint_health import EndpointHealthTracker
+from backend.services.llm_translator import LLMTranslator
+from backend.services.rate_limiter import AdaptiveRateLimiter
+from backend.services.translation_cache import TranslationCache
 
 # 国际新闻爬虫的输出目录
 CRAWLERS_OUTPUT_DIR = CRAWLERS_DIR / "output"
 
+# 内置的翻译提供方（实际使用的顺序由 SOLAR_NEWS_TRANSLATE_PROVIDERS 配置）
+TRANSLATION_PROVIDERS = ("llm", "libretranslate", "mymemory", "simplytranslate")
+
+# LibreTranslate 单次请求的最多条数（q 传数组）
+LIBRETRANSLATE_BATCH_SIZE = 25
+
+LIBRETRANSLATE_ENDPOINTS = [
+    "https://translate.argosopentech.com/translate",
+    "https://libretranslate.de/translate",
+    "https://translate.fortran.is/translate"
+]
+
+# 提供方 -> 端点
+PROVIDER_ENDPOINTS: Dict[str, List[str]] = {
+    "libretranslate": LIBRETRANSLATE_ENDPOINTS,
+    "mymemory": ["https://api.mymemory.translated.net/get"],
+    "simplytranslate": ["https://simplytranslate.org/api/translate"],
+}
+
+
+def _is_translated(result: Any, text: str) -> bool:
+    """译文是否有效（非空且与原文不同）"""
+    return isinstance(result, str) and bool(result.strip()) and result != text
+
+
+def _chunks(items: Sequence[str], size: int) -> List[Sequence[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """解析 Retry-After 头（只支持秒数形式）"""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+
+def _response_status(provider: str, response: requests.Response) -> int:
+    """请求的实际状态码（MyMemory 配额用尽时返回 HTTP 200，真实状态在 responseStatus 中）"""
+    if provider == "mymemory" and response.status_code == 200:
+        try:
+            return int(response.json().get("responseStatus", 200))
+        except (ValueError, TypeError, AttributeError):
+            pass
+    return response.status_code
+
 
 def find_latest_file(pattern: str, directory: Path = None) -> Optional[str]:
     """查找指定模式的最新文件"""
@@ -57,88 +126,270 @@ class TranslatorService:
     """多源新闻翻译服务"""
 
     def __init__(self):
-        self.cache_file = DATA_DIR / 'translation_cache.json'
-        self.translation_cache = self._load_cache()
-
-    def _load_cache(self) -> Dict:
-        """加载翻译缓存"""
-        try:
-            if self.cache_file.exists():
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception:
-            pass
-        return {}
-
-    def _save_cache(self):
-        """保存翻译缓存"""
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.translation_cache, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-
-    def _get_cache_key(self, text: str) -> str:
-        """生成缓存键"""
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        # 数据库在首次翻译时才打开；旧版 translation_cache.json 届时导入
+        self.cache = TranslationCache(
+            Path(TRANSLATION_CACHE_DB), legacy_json=DATA_DIR / 'translation_cache.json'
+        )
+        self.llm = LLMTranslator()
+        self.providers = self._configured_providers(TRANSLATE_PROVIDERS)
+        self.endpoints: Dict[str, List[str]] = dict(PROVIDER_ENDPOINTS, llm=[self.llm.endpoint] if self.llm.enabled else [])
+        self.rate_limiters = {name: AdaptiveRateLimiter(name) for name in self.providers}
+        self.health = EndpointHealthTracker()
+        # 提供方 -> 缓存命中数（旧版缓存条目记在 legacy 下）
+        self.cache_hits: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        # 批次和逐条回退共用的线程池（首次批量翻译时创建，各次调用复用）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # 所有工作线程共用一个会话，按主机复用连接
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=sum(len(urls) for urls in self.endpoints.values()),
+            pool_maxsize=TRANSLATE_WORKERS,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # 提供方 -> 单条翻译方法 (端点, 原文)
+        self._translators: Dict[str, Callable[[str, str], Optional[str]]] = {
+            "llm": self._llm_translate,
+            "libretranslate": self._libretranslate_translate,
+            "mymemory": self._mymemory_translate,
+            "simplytranslate": self._simply_translate,
+        }
+        # 提供方 -> (批量翻译方法 (端点, 原文列表), 每批条数)
+        self._batch_translators: Dict[str, Tuple[Callable, int]] = {
+            "llm": (self._llm_translate_batch, TRANSLATE_LLM_BATCH_SIZE),
+            "libretranslate": (self._libretranslate_translate_batch, LIBRETRANSLATE_BATCH_SIZE),
+        }
 
-    def translate_text(self, text: str) -> str:
-        """使用免费的翻译服务"""
+    def _configured_providers(self, names: Sequence[str]) -> List[str]:
+        """配置的提供方顺序（去掉未知的和未配置的 llm）"""
+        providers = []
+        for name in dict.fromkeys(names):
+            if name not in TRANSLATION_PROVIDERS:
+                print(f"未知的翻译提供方: {name}")
+            elif name != "llm" or self.llm.enabled:
+                providers.append(name)
+        return providers
+
+    def _endpoints(self, providers: Iterable[str]) -> List[Tuple[str, str]]:
+        """提供方的可用端点，按健康度排序（冷却中的不返回）"""
+        return self.health.order([
+            (provider, url) for provider in providers for url in self.endpoints[provider]
+        ])
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=TRANSLATE_WORKERS, thread_name_prefix="translate"
+                )
+            return self._executor
+
+    def shutdown(self):
+        """停止翻译线程池并把缓存写入磁盘"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.cache.close()
+
+    def translate_text(self, text: str, providers: Optional[Sequence[str]] = None) -> str:
+        """
+        使用免费的翻译服务（按健康度依次尝试各端点）
+
+        Args:
+            text: 原文
+            providers: 尝试的提供方，默认为全部配置的提供方
+        """
         if not text or not text.strip():
             return text
 
-        cache_key = self._get_cache_key(text)
-        if cache_key in self.translation_cache:
-            return self.translation_cache[cache_key]
-
-        translation_methods = [
-            self._libretranslate_translate,
-            self._mymemory_translate,
-            self._simply_translate
-        ]
+        cached = self._cached(text)
+        if cached is not None:
+            return cached
 
-        for method in translation_methods:
+        for provider, endpoint in self._endpoints(self.providers if providers is None else providers):
             try:
-                result = method(text)
-                if result and result.strip() and result != text:
-                    self.translation_cache[cache_key] = result
-                    self._save_cache()
+                result = self._translators[provider](endpoint, text)
+                if _is_translated(result, text):
+                    self.cache.put(text, result, provider)
                     return result
             except Exception:
                 continue
 
         return text
 
-    def _libretranslate_translate(self, text: str) -> Optional[str]:
-        """使用LibreTranslate"""
-        endpoints = [
-            "https://translate.argosopentech.com/translate",
-            "https://libretranslate.de/translate",
-            "https://translate.fortran.is/translate"
-        ]
-
-        for endpoint in endpoints:
+    def translate_batch(self, texts: Sequence[str]) -> List[str]:
+        """
+        批量翻译
+
+        去重后先查缓存，未命中的按支持批量输入的提供方分批发送；
+        整批失败或单条译文无效的条目再用其余（不支持批量的）提供方逐条翻译，
+        批量提供方已经对这些条目失败过，不再逐条重试。
+        各批次和逐条回退在服务的线程池中并发执行（速率仍受各提供方限速器约束）。
+
+        Args:
+            texts: 原文列表
+
+        Returns:
+            与输入一一对应的译文（翻译失败的保留原文）
+        """
+        translations: Dict[str, str] = {}
+        misses: List[str] = []
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                translations[text] = text
+                continue
+            cached = self._cached(text)
+            if cached is not None:
+                translations[text] = cached
+            else:
+                misses.append(text)
+
+        if misses:
+            pool = self._get_executor()
+            fallback = [provider for provider in self.providers if provider not in self._batch_translators]
+            for provider in self.providers:
+                if provider not in self._batch_translators:
+                    continue
+                _, batch_size = self._batch_translators[provider]
+                failed: List[str] = []
+                chunks = _chunks(misses, batch_size)
+                for done, chunk_failed in pool.map(partial(self._translate_chunk, provider), chunks):
+                    translations.update(done)
+                    failed.extend(chunk_failed)
+                misses = failed
+
+            translations.update(zip(misses, pool.map(partial(self.translate_text, providers=fallback), misses)))
+
+        return [translations[text] for text in texts]
+
+    def _translate_chunk(self, provider: str, chunk: Sequence[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        用批量提供方翻译一批原文
+
+        Returns:
+            (成功的 {原文: 译文}, 需要逐条回退的原文)
+        """
+        method, _ = self._batch_translators[provider]
+        results = None
+        for _, endpoint in self._endpoints([provider]):
             try:
-                data = {
-                    'q': text,
-                    'source': 'en',
-                    'target': 'zh',
-                    'format': 'text'
-                }
-                response = requests.post(endpoint, json=data, timeout=15)
-                if response.status_code == 200:
-                    return response.json()['translatedText']
+                results = method(endpoint, chunk)
             except Exception:
-                continue
+                results = None
+            # 译文按位置对应原文，条数不一致时视为该端点失败
+            if isinstance(results, list) and len(results) == len(chunk):
+                break
+            results = None
+        if results is None:
+            return {}, list(chunk)
+
+        done: Dict[str, str] = {}
+        failed: List[str] = []
+        for text, result in zip(chunk, results):
+            if _is_translated(result, text):
+                done[text] = result
+                self.cache.put(text, result, provider)
+            else:
+                failed.append(text)
+        return done, failed
+
+    def _cached(self, text: str) -> Optional[str]:
+        """查缓存并按提供方记录命中"""
+        cached = self.cache.get(text, self.providers)
+        if cached is None:
+            return None
+        translation, provider = cached
+        with self._stats_lock:
+            self.cache_hits[provider] = self.cache_hits.get(provider, 0) + 1
+        return translation
+
+    def _request(self, provider: str, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        """经提供方限速器发送上游请求，记录限速和端点健康度；网络错误返回 None"""
+        limiter = self.rate_limiters[provider]
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.health.record((provider, url), False, time.monotonic() - start)
+            limiter.record(None)
+            return None
+        status = _response_status(provider, response)
+        self.health.record((provider, url), 200 <= status < 300, time.monotonic() - start)
+        limiter.record(status, _retry_after(response))
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """各提供方的缓存命中、调用、限流、等待时间统计，各端点健康度，以及缓存条目数"""
+        with self._stats_lock:
+            cache_hits = dict(self.cache_hits)
+        providers = {
+            name: {"cache_hits": cache_hits.get(name, 0), **limiter.stats()}
+            for name, limiter in self.rate_limiters.items()
+        }
+        for name, hits in cache_hits.items():
+            providers.setdefault(name, {"cache_hits": hits})
+        return {"cache": self.cache.stats(), "providers": providers, "endpoints": self.health.stats()}
+
+    def reset_stats(self):
+        """清零统计（各提供方已调整的速率和端点健康度保留）"""
+        with self._stats_lock:
+            self.cache_hits = {}
+        for limiter in self.rate_limiters.values():
+            limiter.reset_stats()
+
+    def _llm_translate(self, endpoint: str, text: str) -> Optional[str]:
+        """使用LLM翻译单条（一条的批量请求）"""
+        results = self._llm_translate_batch(endpoint, [text])
+        return results[0] if results else None
+
+    def _llm_translate_batch(self, endpoint: str, texts: Sequence[str]) -> Optional[List[Optional[str]]]:
+        """使用LLM批量翻译（JSON 模式，按序号对应原文，注入术语表）"""
+        try:
+            response = self._request("llm", "POST", endpoint, **self.llm.build_request(texts))
+            if response is not None and response.status_code == 200:
+                return self.llm.parse_response(response.json(), len(texts))
+        except Exception:
+            pass
         return None
 
-    def _mymemory_translate(self, text: str) -> Optional[str]:
+    def _libretranslate_translate(self, endpoint: str, text: str) -> Optional[str]:
+        """使用LibreTranslate"""
+        result = self._libretranslate_request(endpoint, text)
+        return result if isinstance(result, str) else None
+
+    def _libretranslate_translate_batch(self, endpoint: str, texts: Sequence[str]) -> Optional[List[str]]:
+        """使用LibreTranslate批量翻译（q 传数组，译文按相同顺序返回）"""
+        result = self._libretranslate_request(endpoint, list(texts))
+        return result if isinstance(result, list) else None
+
+    def _libretranslate_request(self, endpoint: str, q: Any) -> Any:
+        """返回 translatedText（与 q 同为字符串或数组），失败返回 None"""
+        try:
+            data = {
+                'q': q,
+                'source': 'en',
+                'target': 'zh',
+                'format': 'text'
+            }
+            response = self._request("libretranslate", "POST", endpoint, json=data, timeout=15)
+            if response is not None and response.status_code == 200:
+                return response.json()['translatedText']
+        except Exception:
+            pass
+        return None
+
+    def _mymemory_translate(self, endpoint: str, text: str) -> Optional[str]:
         """使用MyMemory翻译API"""
         try:
-            url = "https://api.mymemory.translated.net/get"
             params = {'q': text, 'langpair': 'en|zh'}
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
+            response = self._request("mymemory", "GET", endpoint, params=params, timeout=10)
+            if response is not None and response.status_code == 200:
                 data = response.json()
                 if data.get('responseStatus') == 200:
                     return data['responseData']['translatedText']
@@ -146,13 +397,12 @@ class TranslatorService:
             pass
         return None
 
-    def _simply_translate(self, text: str) -> Optional[str]:
+    def _simply_translate(self, endpoint: str, text: str) -> Optional[str]:
         """使用SimplyTranslate"""
         try:
-            url = "https://simplytranslate.org/api/translate"
             data = {'text': text, 'from': 'en', 'to': 'zh'}
-            response = requests.post(url, data=data, timeout=10)
-            if response.status_code == 200:
+            response = self._request("simplytranslate", "POST", endpoint, data=data, timeout=10)
+            if response is not None and response.status_code == 200:
                 return response.text.strip()
         except Exception:
             pass
@@ -164,11 +414,9 @@ class TranslatorService:
             with open(filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
+            titles = [item.get('title', '') for item in data]
             processed_news = []
-            for item in data:
-                original_title = item.get('title', '')
-                translated_title = self.translate_text(original_title)
-
+            for item, original_title, translated_title in zip(data, titles, self.translate_batch(titles)):
                 news_item = {
                     'title_original': original_title,
                     'title_translated': translated_title,
@@ -179,7 +427,6 @@ class TranslatorService:
                     'file_source': os.path.basename(filename)
                 }
                 processed_news.append(news_item)
-                time.sleep(2)
 
             return processed_news
         except Exception as e:
@@ -199,11 +446,9 @@ class TranslatorService:
             else:
                 return []
 
+            titles = [item.get('title', '') for item in news_list]
             processed_news = []
-            for item in news_list:
-                original_title = item.get('title', '')
-                translated_title = self.translate_text(original_title)
-
+            for item, original_title, translated_title in zip(news_list, titles, self.translate_batch(titles)):
                 news_item = {
                     'title_original': original_title,
                     'title_translated': translated_title,
@@ -216,7 +461,6 @@ class TranslatorService:
                     'file_source': os.path.basename(filename)
                 }
                 processed_news.append(news_item)
-                time.sleep(2)
 
             return processed_news
         except Exception as e:
@@ -229,11 +473,9 @@ class TranslatorService:
             with open(filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
+            titles = [item.get('title', '') for item in data]
             processed_news = []
-            for item in data:
-                original_title = item.get('title', '')
-                translated_title = self.translate_text(original_title)
-
+            for item, original_title, translated_title in zip(data, titles, self.translate_batch(titles)):
                 news_item = {
                     'title_original': original_title,
                     'title_translated': translated_title,
@@ -244,7 +486,6 @@ class TranslatorService:
                     'file_source': os.path.basename(filename)
                 }
                 processed_news.append(news_item)
-                time.sleep(2)
 
             return processed_news
         except Exception as e:
@@ -254,6 +495,7 @@ class TranslatorService:
     def merge_and_save_translations(self) -> Optional[str]:
         """合并所有翻译结果并保存"""
         all_news = []
+        self.reset_stats()
 
         # 使用 find_latest_crawler_file 从爬虫输出目录查找文件
         files_to_process = [
@@ -300,6 +542,21 @@ class TranslatorService:
         with open(output_filepath, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, ensure_ascii=False, indent=2)
 
+        self.cache.flush()
+        stats = self.get_stats()
+        print(f"翻译缓存: {stats['cache']['entries']} 条, 淘汰 {stats['cache']['evictions']} 条")
+        for name, provider_stats in stats['providers'].items():
+            if 'calls' not in provider_stats:
+                print(f"  {name}: 缓存命中 {provider_stats['cache_hits']}")
+                continue
+            print(f"  {name}: 缓存命中 {provider_stats['cache_hits']}, 请求 {provider_stats['calls']}, "
+                  f"成功 {provider_stats['successes']}, 限流 {provider_stats['throttled']}, "
+                  f"等待 {provider_stats['slept_seconds']}s, 当前间隔 {provider_stats['interval']}s")
+        for endpoint, health in stats['endpoints'].items():
+            print(f"  {endpoint}: 请求 {health['requests']}, 失败 {health['failures']}, "
+                  f"延迟 {health['latency_ms']}ms, 错误率 {health['error_rate']}, "
+                  f"冷却 {health['cooldown_seconds']}s")
+
         return str(output_filepath)
 
 
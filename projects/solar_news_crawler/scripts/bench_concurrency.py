@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""并发延迟基准：重查询进行期间 /api/health 的响应延迟
+
+用法:
+    python scripts/bench_concurrency.py
+    python scripts/bench_concurrency.py --records 20000 --clients 8 --duration 5
+
+生成一份合成数据（不使用 data/ 目录），在若干并发客户端持续请求全量新闻列表的同时，
+按固定间隔请求 /api/health，对比两种情况：
+- inline: 在事件循环上直接调用同步查询并由 FastAPI 序列化（改造前的做法）
+- executor: /api/news（查询和序列化在线程池中执行）
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+WORDS = "光伏 储能 组件 电池 硅片 逆变器 招标 装机 并网 政策 价格 出口 海上 风电 分布式 电网".split()
+SOURCES = ["国家能源局", "中国政府网", "北极星", "发改委"]
+
+
+def write_dataset(directory: Path, records: int):
+    """写入合成的国内新闻数据文件"""
+    rng = random.Random(42)
+    news = [
+        {
+            "title": "".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))),
+            "date": f"20{rng.randint(19, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "source": rng.choice(SOURCES),
+            "link": f"https://example.com/news/{i}",
+        }
+        for i in range(records)
+    ]
+    with open(directory / "combined_bench.json", "w", encoding="utf-8") as f:
+        json.dump(news, f, ensure_ascii=False)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    k = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[k]
+
+
+async def run_case(app, heavy_path: str, clients: int, duration: float, interval: float):
+    """返回 (health 延迟列表, 重查询完成数)"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        deadline = time.monotonic() + duration
+        completed = 0
+
+        async def heavy():
+            nonlocal completed
+            while time.monotonic() < deadline:
+                resp = await client.get(heavy_path, params={"keyword": random.choice(WORDS)[0]})
+                resp.raise_for_status()
+                completed += 1
+
+        async def probe():
+            # 延迟从计划发送时刻算起，事件循环被阻塞的时间也计入
+            latencies = []
+            scheduled = time.perf_counter()
+            while True:
+                resp = await client.get("/api/health")
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+                resp.raise_for_status()
+                if time.monotonic() >= deadline:
+                    return latencies
+                scheduled = time.perf_counter() + interval
+                await asyncio.sleep(interval)
+
+        results = await asyncio.gather(probe(), *(heavy() for _ in range(clients)))
+    return results[0], completed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API latency under concurrent queries")
+    parser.add_argument("--records", type=int, default=20000, help="合成新闻条数")
+    parser.add_argument("--clients", type=int, default=8, help="并发重查询客户端数")
+    parser.add_argument("--duration", type=float, default=4.0, help="每种情况的采样秒数")
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="health 请求间隔（毫秒）")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="solar_bench_"))
+    os.environ["SOLAR_NEWS_ARCHIVE_DB"] = ""
+    write_dataset(workdir, args.records)
+
+    import backend.services.news_service as news_module
+    from backend.main import app
+    from backend.services.news_service import news_service
+
+    news_module.DATA_DIR = workdir
+    news_service.check_and_reload_data()
+
+    @app.get("/bench/inline-news")
+    async def inline_news(keyword: str = ""):
+        return news_service.get_news(keyword=keyword or None)
+
+    print(f"数据 {len(news_service.news_data)} 条，并发客户端 {args.clients}")
+    print(f"{'模式':<10}{'重查询数':>10}{'采样数':>8}{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for mode, path in (("inline", "/bench/inline-news"), ("executor", "/api/news")):
+        latencies, completed = asyncio.run(
+            run_case(app, path, args.clients, args.duration, args.interval_ms / 1000)
+        )
+        print(
+            f"{mode:<10}{completed:>10}{len(latencies):>8}"
+            f"{percentile(latencies, 50):>10.2f}"
+            f"{percentile(latencies, 99):>10.2f}"
+            f"{max(latencies):>10.2f}"
+        )
+    news_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for solar_news_crawler"""
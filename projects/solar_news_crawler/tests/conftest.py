@@ -0,0 +1,10 @@
+"""Root pytest fixtures for all test types"""
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Keep tests away from the archive under data/ (archive tests pass their own path)
+os.environ.setdefault("SOLAR_NEWS_ARCHIVE_DB", "")
@@ -0,0 +1 @@
+"""Unit tests for solar_news_crawler"""
@@ -0,0 +1,50 @@
+"""Pytest fixtures for solar_news_crawler unit tests"""
+import json
+
+import pytest
+
+
+@pytest.fixture
+def domestic_news():
+    """Domestic news records, including a duplicated link and a near-duplicate title"""
+    return [
+        {"title": "国家能源局关于印发《2024年能源工作指导意见》的通知", "date": "2024-03-01",
+         "source": "国家能源局", "link": "https://example.com/a"},
+        {"title": "关于印发《2024年能源工作指导意见》的通知", "date": "2024-03-02",
+         "source": "中国政府网", "link": "https://example.com/b"},
+        {"title": "光伏组件价格持续下行", "date": "2024-03-03",
+         "source": "北极星", "link": "https://example.com/c"},
+        {"title": "光伏组件价格持续下行", "date": "2024-03-03",
+         "source": "北极星", "link": "https://example.com/c"},
+        {"title": "分布式光伏装机创新高", "date": "2024-02-28",
+         "source": "国家能源局", "link": "https://example.com/d"},
+        {"title": "储能电池出口增长", "date": "2024-02-27",
+         "source": "中国政府网", "link": "https://example.com/e"},
+    ]
+
+
+@pytest.fixture
+def international_news():
+    """Translated international news records"""
+    return [
+        {"title": "Solar module prices fall", "title_translated": "光伏组件价格下跌",
+         "summary": "Photovoltaic module prices fell again", "publish_date": "2024-03-05",
+         "source": "PV Magazine", "link": "https://example.com/pv1"},
+        {"title": "IRENA renewable capacity statistics", "title_translated": "IRENA 可再生能源装机统计",
+         "summary": "Solar power leads capacity additions", "publish_date": "2024-03-04",
+         "source": "IRENA", "link": "https://example.com/irena1"},
+        {"title": "Grid operators curb curtailment", "title_translated": "电网运营商减少弃电",
+         "summary": "Powerful new storage projects", "publish_date": "2024-03-03",
+         "source": "IEA", "link": "https://example.com/iea1"},
+    ]
+
+
+@pytest.fixture
+def write_json(tmp_path):
+    """Write data to a JSON file in a temporary data directory"""
+    def write(name, data):
+        path = tmp_path / name
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        return path
+    return write
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Tests for endpoint health tracking"""
+import threading
+import time
+
+from backend.services.endpoint_health import EndpointHealthTracker
+
+ENDPOINTS = [("libre", "dead"), ("libre", "fast"), ("libre", "slow")]
+
+
+class TestEndpointHealthTracker:
+    """Test suite for EndpointHealthTracker"""
+
+    def test_orders_by_score(self):
+        """Test known endpoints are ranked by latency and failures go to cooldown"""
+        health = EndpointHealthTracker()
+        health.record(("libre", "dead"), False, 0.1)
+        health.record(("libre", "fast"), True, 0.1)
+        health.record(("libre", "slow"), True, 0.5)
+        assert health.order(ENDPOINTS) == [("libre", "fast"), ("libre", "slow")]
+        assert health.stats()["libre dead"]["cooldown_seconds"] > 0
+
+    def test_single_probe_per_unknown_endpoint(self):
+        """Test concurrent callers never probe the same unknown endpoint"""
+        health = EndpointHealthTracker()
+        firsts = []
+        barrier = threading.Barrier(6)
+
+        def worker():
+            barrier.wait()
+            firsts.append(health.order(ENDPOINTS)[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while len(firsts) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Each unknown endpoint is reserved once; the other callers wait for a probe result
+        assert sorted(firsts) == sorted(ENDPOINTS)
+
+        health.record(("libre", "fast"), True, 0.1)
+        for thread in threads:
+            thread.join(timeout=5)
+        assert firsts[3:] == [("libre", "fast")] * 3
+
+    def test_reserved_endpoints_go_last(self):
+        """Test unknown endpoints reserved by others are ranked after known ones"""
+        health = EndpointHealthTracker()
+        health.record(("libre", "slow"), True, 0.5)
+        assert health.order(ENDPOINTS)[0] == ("libre", "dead")
+        assert health.order(ENDPOINTS)[:2] == [("libre", "fast"), ("libre", "slow")]
+        assert health.order(ENDPOINTS) == [("libre", "slow"), ("libre", "dead"), ("libre", "fast")]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Tests for the facet index"""
+from datetime import date
+
+import pytest
+
+from backend.services.facets import FacetIndex
+
+RECORDS = [
+    {"source": "北极星", "content_type": "news", "category": "光伏"},
+    {"source": "北极星", "content_type": "policy"},
+    {"source": "国家能源局", "content_type": "policy", "category": "储能"},
+    {"content_type": "news", "category": ""},
+    {"source": "国家能源局"},
+]
+DAYS = ["2024-03-03", "2024-03-03", "2024-03-01", None, "2024-02-28"]
+
+
+def _ordinal(day):
+    """Date string to ordinal"""
+    return date.fromisoformat(day).toordinal()
+
+
+@pytest.fixture
+def facets():
+    """A facet index over RECORDS, with the fourth record undated"""
+    ordinals = [_ordinal(d) if d else None for d in DAYS]
+    return FacetIndex(RECORDS, ordinals, [3])
+
+
+def _linear_counts(field, positions, missing=None):
+    """Reference facet counts by scanning the selected records"""
+    counts = {}
+    for pos in positions:
+        value = RECORDS[pos].get(field) or missing
+        if value is not None:
+            counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+class TestFacetIndex:
+    """Test suite for FacetIndex"""
+
+    def test_full_counts(self, facets):
+        """Test full counts label missing sources and skip missing categories"""
+        assert facets.counts("source") == {"北极星": 2, "国家能源局": 2, "Unknown": 1}
+        assert facets.counts("content_type") == {"news": 2, "policy": 2}
+        assert facets.counts("category") == {"光伏": 1, "储能": 1}
+        assert facets.sources == ["北极星", "国家能源局", "Unknown"]
+
+    @pytest.mark.parametrize("positions", [[], [0], [1, 3], [0, 2, 4], [0, 1, 2, 3, 4]])
+    def test_filtered_counts_match_linear_scan(self, facets, positions):
+        """Test counts over a subset equal counting the subset directly"""
+        assert facets.counts("source", positions) == _linear_counts("source", positions, "Unknown")
+        assert facets.counts("content_type", positions) == _linear_counts("content_type", positions)
+        assert facets.counts("category", positions) == _linear_counts("category", positions)
+
+    def test_day_counts(self, facets):
+        """Test per-day counts leave out undated records"""
+        assert facets.counts("day") == {"2024-03-03": 2, "2024-03-01": 1, "2024-02-28": 1}
+        assert facets.counts("day", [0, 3, 4]) == {"2024-03-03": 1, "2024-02-28": 1}
+
+    def test_range_source_counts(self, facets):
+        """Test date range source counts add per-day counts and always include undated records"""
+        counts = facets.range_source_counts(_ordinal("2024-03-01"), _ordinal("2024-03-03"))
+        assert counts == {"北极星": 2, "国家能源局": 1, "Unknown": 1}
+        assert facets.range_source_counts(_ordinal("2025-01-01"), _ordinal("2025-12-31")) == {"Unknown": 1}
+
+    def test_timeline(self, facets):
+        """Test the timeline is ascending by day and can be sliced by range"""
+        timeline = facets.timeline()
+        assert [row["date"] for row in timeline] == ["2024-02-28", "2024-03-01", "2024-03-03"]
+        assert timeline[2] == {"date": "2024-03-03", "total": 2, "sources": {"北极星": 2}}
+        assert facets.timeline(_ordinal("2024-03-01"), None) == timeline[1:]
+        assert facets.timeline(None, _ordinal("2024-03-02")) == timeline[:2]
+        assert facets.timeline(_ordinal("2024-03-04"), None) == []
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Tests for the LLM batch translator"""
+import json
+
+from backend.services.llm_translator import LLMTranslator
+
+
+def _body(content):
+    """A /chat/completions response carrying content"""
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False)
+    return {"choices": [{"message": {"content": content}}]}
+
+
+class TestParseResponse:
+    """Test suite for LLMTranslator.parse_response"""
+
+    def test_in_order(self):
+        """Test translations are placed by id"""
+        body = _body({"translations": [{"id": 1, "text": "乙"}, {"id": 0, "text": " 甲 "}]})
+        assert LLMTranslator.parse_response(body, 2) == ["甲", "乙"]
+
+    def test_missing_ids(self):
+        """Test missing ids become None without shifting the others"""
+        body = _body({"translations": [{"id": 2, "text": "丙"}]})
+        assert LLMTranslator.parse_response(body, 3) == [None, None, "丙"]
+
+    def test_extra_and_invalid_ids(self):
+        """Test out-of-range, non-numeric and malformed items are ignored"""
+        body = _body({"translations": [
+            {"id": 0, "text": "甲"}, {"id": 5, "text": "多余"}, {"id": -1, "text": "负数"},
+            {"id": "x", "text": "非法"}, {"id": 1, "text": None}, "garbage",
+        ]})
+        assert LLMTranslator.parse_response(body, 2) == ["甲", None]
+
+    def test_fenced_json(self):
+        """Test a Markdown code fence around the JSON is stripped"""
+        content = '```json\n{"translations": [{"id": "0", "text": "甲"}]}\n```'
+        assert LLMTranslator.parse_response(_body(content), 1) == ["甲"]
+
+    def test_bare_list(self):
+        """Test a bare JSON array is accepted"""
+        assert LLMTranslator.parse_response(_body([{"id": 0, "text": "甲"}]), 1) == ["甲"]
+
+    def test_unparseable(self):
+        """Test malformed bodies return None"""
+        assert LLMTranslator.parse_response({}, 1) is None
+        assert LLMTranslator.parse_response(_body("not json"), 1) is None
+        assert LLMTranslator.parse_response(_body({"other": []}), 1) is None
+
+
+class TestGlossary:
+    """Test suite for glossary injection"""
+
+    def test_only_matching_terms(self):
+        """Test only whole-word terms present in the batch are injected"""
+        translator = LLMTranslator(glossary={"PERC": "PERC电池", "tracker": "跟踪支架", "IEA": "国际能源署"})
+        assert translator.glossary_for(["New perc line", "IEAx report"]) == {"PERC": "PERC电池"}
+        system = translator.build_request(["New PERC line"])["json"]["messages"][0]["content"]
+        assert "PERC => PERC电池" in system and "tracker" not in system
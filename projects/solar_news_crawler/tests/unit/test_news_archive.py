@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Tests for the SQLite news archive"""
+import sqlite3
+
+import pytest
+
+from backend.services.news_archive import NewsArchive
+from backend.services.news_collection import normalize_query
+from backend.services.news_snapshot import international_collection
+
+
+@pytest.fixture
+def archive(tmp_path, write_json, international_news):
+    """Archive with the international fixture ingested"""
+    archive = NewsArchive(tmp_path / "archive.db")
+    archive.ingest_files([("international", write_json("translator_1.json", international_news))])
+    return archive
+
+
+class TestNewsArchive:
+    """Test suite for NewsArchive"""
+
+    @pytest.mark.parametrize("keyword", ["ow", "olar", "power", "光伏", "光伏 olar", "curtail", "module 光伏", "zzz"])
+    def test_matches_latest_scope(self, archive, international_news, keyword):
+        """Test keyword hits equal the in-memory collection's, fragments included"""
+        query = normalize_query(keyword=keyword)
+        collection = international_collection(international_news)
+        expected = collection.paginate(collection.match(query))
+        page = archive.page("international", query)
+        assert sorted(n["id"] for n in page["data"]) == sorted(n["id"] for n in expected["data"])
+        assert page["source_stats"] == expected["source_stats"]
+
+    def test_stats_only_on_first_page(self, archive):
+        """Test later pages skip count and source_stats"""
+        query = normalize_query()
+        first = archive.page("international", query, limit=2)
+        assert first["count"] == 3 and len(first["data"]) == 2
+        second = archive.page("international", query, limit=2, cursor=first["next_cursor"])
+        assert "source_stats" not in second and "count" not in second
+        assert second["next_cursor"] is None
+        assert len({n["id"] for n in first["data"] + second["data"]}) == 3
+
+    def test_ingest_skips_unchanged_files(self, archive, tmp_path):
+        """Test re-ingesting an unchanged file imports nothing"""
+        assert archive.ingest_files([("international", tmp_path / "translator_1.json")]) == 0
+
+    def test_finds_translated_record_by_english_title(self, archive):
+        """Test a word only in the English title finds the translated record, by date and by relevance"""
+        for sort in ("date", "relevance"):
+            page = archive.page("international", normalize_query(keyword="curtailment"), sort=sort)
+            assert [n["source"] for n in page["data"]] == ["IEA"]
+
+    def test_migrates_two_column_index(self, tmp_path, archive):
+        """Test an archive written with the title/body FTS layout is re-indexed from the stored records"""
+        conn = sqlite3.connect(tmp_path / "archive.db")
+        with conn:
+            conn.execute("DROP TABLE news_fts_vocab")
+            conn.execute("DROP TABLE news_fts")
+            conn.execute("CREATE VIRTUAL TABLE news_fts USING fts5(title, body)")
+            conn.execute("UPDATE news SET search_text = ''")
+            conn.execute("PRAGMA user_version = 2")
+        conn.close()
+
+        migrated = NewsArchive(tmp_path / "archive.db")
+        page = migrated.page("international", normalize_query(keyword="curtailment"), sort="relevance")
+        assert [n["source"] for n in page["data"]] == ["IEA"]
+        assert migrated.page("international", normalize_query(keyword="光伏"))["count"] == 1
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Tests for near-duplicate clustering"""
+import random
+
+from backend.services.news_clusters import cluster_heads, jaccard, minhash, shingles
+
+
+NEAR_DUPLICATES = [
+    "国家能源局关于印发《2024年能源工作指导意见》的通知",
+    "Solar module prices fall again in Europe this week",
+    "关于印发《2024年能源工作指导意见》的通知",
+    "Solar module prices fall again in Europe this week!",
+    "储能电池出口增长",
+]
+
+
+def _groups(heads, order):
+    """Clusters as sets of original indexes"""
+    groups = {}
+    for pos, head in enumerate(heads):
+        groups.setdefault(order[head], set()).add(order[pos])
+    return sorted(sorted(group) for group in groups.values())
+
+
+class TestClusterHeads:
+    """Test suite for cluster_heads"""
+
+    def test_known_near_duplicates(self):
+        """Test reposted titles share the earliest position as head"""
+        assert cluster_heads(NEAR_DUPLICATES) == [0, 1, 0, 1, 4]
+
+    def test_empty_titles_stay_alone(self):
+        """Test records without a title are never clustered"""
+        assert cluster_heads(["", "", "光伏"]) == [0, 1, 2]
+
+    def test_transitive_chain(self):
+        """Test a ~ b and b ~ c put a, b and c in one cluster in any order"""
+        a = "solar module prices fall again in europe this week"
+        b = "solar module prices fall again in europe this month"
+        c = "solar module prices fall again in asia this month"
+        assert jaccard(shingles(a), shingles(c)) < 0.6
+        for texts in ([a, b, c], [c, a, b], [a, c, b]):
+            assert cluster_heads(texts) == [0, 0, 0]
+
+    def test_independent_of_input_order(self):
+        """Test shuffling the input yields the same clusters"""
+        texts = NEAR_DUPLICATES * 3
+        order = list(range(len(texts)))
+        random.Random(7).shuffle(order)
+        shuffled = cluster_heads([texts[i] for i in order])
+        assert _groups(cluster_heads(texts), list(range(len(texts)))) == _groups(shuffled, order)
+
+    def test_minhash_is_deterministic(self):
+        """Test signatures do not depend on cache state"""
+        shingle_set = shingles(NEAR_DUPLICATES[1])
+        assert minhash(shingle_set) == minhash(shingle_set, {})
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Tests for the news collection"""
+import copy
+
+import pytest
+
+from backend.services.news_collection import (
+    decode_cursor,
+    encode_cursor,
+    international_search_fields,
+    normalize_query,
+)
+from backend.services.news_snapshot import domestic_collection, international_collection
+
+
+def _pages(collection, limit, **match_kwargs):
+    """Walk every page and return the ids in order"""
+    match = collection.match(normalize_query(keyword=match_kwargs.pop("keyword", None)), **match_kwargs)
+    ids, cursor = [], None
+    while True:
+        page = collection.paginate(match, limit, cursor)
+        ids.extend(news["id"] for news in page["data"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+class TestDateIndex:
+    """Test suite for date sorting and range queries"""
+
+    def test_sorted_newest_first(self, domestic_news):
+        """Test records are ordered by date string, newest first"""
+        collection = domestic_collection(domestic_news)
+        dates = [n["date"] for n in collection.records]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_range_query(self, domestic_news):
+        """Test a date range returns only records within it, newest first"""
+        collection = domestic_collection(domestic_news)
+        result = collection.query(start_date="2024-02-28", end_date="2024-03-02")
+        assert [n["date"] for n in result] == ["2024-03-02", "2024-03-01", "2024-02-28"]
+
+    def test_irregular_dates(self):
+        """Test parseable non-canonical dates are still filtered by value"""
+        collection = domestic_collection([
+            {"title": "a", "date": "2024-1-5", "link": "a"},
+            {"title": "b", "date": "2024-01-10", "link": "b"},
+            {"title": "c", "date": "2023-12-31", "link": "c"},
+        ])
+        result = collection.query(start_date="2024-01-01", end_date="2024-01-31")
+        assert sorted(n["title"] for n in result) == ["a", "b"]
+        assert collection.earliest_ordinal is not None
+
+    @pytest.mark.parametrize("start,end", [("bad", "2024-03-01"), ("2024-02-30", "2024-03-01")])
+    def test_invalid_dates_keep_only_undated(self, international_news, start, end):
+        """Test an invalid date keeps only undated international records"""
+        collection = international_collection(international_news + [{"title": "undated", "link": "u"}])
+        assert [n["title"] for n in collection.query(start_date=start, end_date=end)] == ["undated"]
+
+    def test_single_bound_does_not_filter(self, domestic_news):
+        """Test the date filter applies only when both bounds are given"""
+        collection = domestic_collection(domestic_news)
+        assert normalize_query("2024-03-01", None)[0] is False
+        assert len(collection.query(start_date="2024-03-01")) == len(domestic_news)
+
+
+class TestCursor:
+    """Test suite for cursor encoding"""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the values it was built from"""
+        cursor = encode_cursor("2024-03-01", "abc~1")
+        assert decode_cursor(cursor) == ("2024-03-01", "abc~1")
+        assert "=" not in cursor
+
+    def test_round_trip_unicode(self):
+        """Test non-ASCII sort keys survive the round trip"""
+        assert decode_cursor(encode_cursor("2024年3月", "id")) == ("2024年3月", "id")
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor("a", "b")[:-3], "WzEsIDJd"])
+    def test_invalid(self, cursor):
+        """Test malformed cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestPagination:
+    """Test suite for ids, keyset pagination and projection"""
+
+    def test_ids_are_stable_across_reloads(self, domestic_news):
+        """Test ids depend only on content, not on position"""
+        first = domestic_collection(copy.deepcopy(domestic_news))
+        second = domestic_collection(copy.deepcopy(list(reversed(domestic_news))))
+        assert sorted(n["id"] for n in first.records) == sorted(n["id"] for n in second.records)
+        assert not any("-" in n["id"] for n in first.records)
+
+    def test_records_are_not_mutated(self, domestic_news):
+        """Test ids are set on copies"""
+        original = copy.deepcopy(domestic_news)
+        collection = domestic_collection(domestic_news)
+        assert domestic_news == original
+        assert all("id" in n for n in collection.records)
+
+    @pytest.mark.parametrize("limit", [1, 2, 5])
+    def test_round_trip(self, domestic_news, limit):
+        """Test paging with next_cursor returns every record once, duplicates included"""
+        collection = domestic_collection(domestic_news)
+        full = collection.page()
+        assert _pages(collection, limit) == [n["id"] for n in full["data"]]
+        assert len(full["data"]) == len(domestic_news)
+
+    def test_relevance_round_trip(self, international_news):
+        """Test relevance-sorted pages follow the full relevance order"""
+        collection = international_collection(international_news)
+        match = collection.match(normalize_query(keyword="ow"), sort="relevance")
+        full = [collection.records[pos]["id"] for pos in match.positions]
+        assert len(full) == 2
+        assert match.scores == sorted(match.scores, reverse=True)
+        assert _pages(collection, 1, keyword="ow", sort="relevance") == full
+
+    def test_stats_cover_all_hits(self, domestic_news):
+        """Test count and source_stats do not depend on the page"""
+        collection = domestic_collection(domestic_news)
+        page = collection.page(keyword="光伏", limit=1)
+        assert page["count"] == 3 and len(page["data"]) == 1
+        assert page["source_stats"] == {"北极星": 2, "国家能源局": 1}
+
+    def test_next_cursor_omitted_without_limit(self, domestic_news):
+        """Test unpaginated results carry no next_cursor"""
+        collection = domestic_collection(domestic_news)
+        assert "next_cursor" not in collection.page()
+        assert collection.page(limit=100)["next_cursor"] is None
+        assert collection.page(limit=0)["data"] == []
+
+    def test_cursor_after_removed_record(self, domestic_news):
+        """Test a cursor from an older generation resumes after its sort key"""
+        collection = domestic_collection(domestic_news)
+        cursor = encode_cursor("2024-03-01", "missing")
+        page = collection.page(cursor=cursor, limit=10)
+        assert [n["date"] for n in page["data"]] == ["2024-02-28", "2024-02-27"]
+
+    def test_field_projection(self, domestic_news):
+        """Test fields limits the returned keys"""
+        collection = domestic_collection(domestic_news)
+        page = collection.page(fields=["title", "missing"], limit=1)
+        assert list(page["data"][0]) == ["title"]
+
+
+class TestCollapse:
+    """Test suite for collapsing near-duplicate records"""
+
+    def test_cluster_fields_on_copies(self, domestic_news):
+        """Test every record carries its cluster id"""
+        collection = domestic_collection(domestic_news)
+        assert all("cluster_id" in n for n in collection.records)
+        assert all("cluster_id" not in n for n in domestic_news)
+
+    def test_collapse_near_duplicates(self, domestic_news):
+        """Test collapse keeps one record per near-duplicate cluster"""
+        collection = domestic_collection(domestic_news)
+        collapsed = collection.match(normalize_query(), collapse=True)
+        assert collapsed.count == 4
+        heads = [collection.records[pos] for pos in collapsed.positions]
+        assert max(n["cluster_size"] for n in heads) == 2
+        assert len({n["cluster_id"] for n in heads}) == 4
+
+
+class TestInternationalFields:
+    """Test suite for the international search fields"""
+
+    def test_finds_translated_record_by_english_title(self, international_news):
+        """Test a word only in the English title finds the translated record"""
+        collection = international_collection(international_news)
+        assert [n["source"] for n in collection.query(keyword="curtailment")] == ["IEA"]
+        assert [n["source"] for n in collection.query(keyword="弃电")] == ["IEA"]
+
+    def test_translator_output_records(self):
+        """Test records written by the translator (title_original) are searchable in both languages"""
+        collection = international_collection([
+            {"title_original": "Perovskite tandem record", "title_translated": "钙钛矿叠层效率纪录",
+             "publish_date": "2024-03-05", "source": "PV Magazine", "link": "p"},
+            {"title_original": "Untranslated headline", "title_translated": "Untranslated headline",
+             "publish_date": "2024-03-04", "source": "IEA", "link": "u"},
+        ])
+        assert [n["link"] for n in collection.query(keyword="tandem")] == ["p"]
+        assert [n["link"] for n in collection.query(keyword="钙钛矿")] == ["p"]
+        assert international_search_fields(collection.records[1])[:2] == ["Untranslated headline", ""]
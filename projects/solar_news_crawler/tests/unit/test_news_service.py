@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Tests for the news service"""
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import backend.services.news_service as news_module
+
+
+def _touch(path, offset):
+    """Give a rewritten file a distinct mtime"""
+    now = time.time_ns() + offset * 1_000_000_000
+    os.utime(path, ns=(now, now))
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """A news service over a temporary data directory without an archive"""
+    monkeypatch.setattr(news_module, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(news_module, "ARCHIVE_DB", "")
+    svc = news_module.NewsService()
+    yield svc
+    svc.shutdown()
+
+
+class TestChangeDetection:
+    """Test suite for stat-based change detection"""
+
+    def test_reload_on_new_file(self, service, write_json, domestic_news):
+        """Test a new data file is picked up by the next check"""
+        assert service.check_and_reload_data() is False
+        write_json("combined_1.json", domestic_news)
+        assert service.check_and_reload_data() is True
+        assert len(service.news_data) == len(domestic_news)
+        assert service.file_signatures["combined"][0].endswith("combined_1.json")
+
+    def test_unchanged_files_are_not_reloaded(self, service, write_json, domestic_news, monkeypatch):
+        """Test polling without changes does not read any file"""
+        write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        monkeypatch.setattr(service, "_load_news_from_file", lambda *a, **k: pytest.fail("file re-read"))
+        assert service.check_and_reload_data() is False
+
+    def test_rewrite_is_detected(self, service, write_json, domestic_news):
+        """Test rewriting the latest file in place triggers a reload"""
+        path = write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        write_json("combined_1.json", domestic_news[:2])
+        _touch(path, 1)
+        assert service.check_and_reload_data() is True
+        assert len(service.news_data) == 2
+
+    def test_watcher_reloads_in_background(self, service, write_json, domestic_news):
+        """Test the watcher thread picks up new files without a request"""
+        service.start_watcher(interval=0.01)
+        write_json("combined_1.json", domestic_news)
+        deadline = time.monotonic() + 5
+        while not service.news_data and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(service.news_data) == len(domestic_news)
+
+
+class TestSnapshots:
+    """Test suite for copy-on-write snapshots"""
+
+    def test_unchanged_datasets_are_reused(self, service, write_json, domestic_news, international_news):
+        """Test a reload of one dataset keeps the other dataset's objects"""
+        write_json("combined_1.json", domestic_news)
+        write_json("translator_1.json", international_news)
+        service.check_and_reload_data()
+        before = service.snapshot
+
+        write_json("combined_2.json", domestic_news[:1])
+        _touch(service.snapshot.signatures["combined"][0], -10)
+        service.check_and_reload_data()
+        after = service.snapshot
+        assert after.version == before.version + 1
+        assert after.international is before.international
+        assert after.domestic is not before.domestic
+        assert len(before.domestic) == len(domestic_news)
+
+    def test_failed_load_keeps_snapshot(self, service, write_json, domestic_news):
+        """Test a file that fails to parse keeps the previous snapshot and version"""
+        path = write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        snapshot = service.snapshot
+
+        path.write_text("[{broken", encoding="utf-8")
+        _touch(path, 1)
+        assert service.check_and_reload_data() is False
+        assert service.check_and_reload_data() is False
+        assert service.snapshot is snapshot
+
+        write_json("combined_1.json", domestic_news[:1])
+        _touch(path, 2)
+        assert service.check_and_reload_data() is True
+        assert service.snapshot.version == snapshot.version + 1
+        assert len(service.news_data) == 1
+
+    def test_readers_see_consistent_data(self, service, write_json, domestic_news):
+        """Test concurrent readers never see a half-built snapshot"""
+        path = write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        errors, stop = [], threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                result = service.get_news()
+                if result["count"] != len(result["data"]) or result["count"] != result["total_count"]:
+                    errors.append(result["count"])
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for i, size in enumerate((2, 6, 1, 4)):
+            write_json("combined_1.json", domestic_news[:size])
+            _touch(path, i + 1)
+            service.check_and_reload_data()
+        stop.set()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+
+class TestQueryCache:
+    """Test suite for the service's query result cache"""
+
+    def test_repeated_query_hits_cache(self, service, write_json, domestic_news):
+        """Test paging through one query filters only once"""
+        write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        first = service.get_news(keyword="光伏", limit=1)
+        service.get_news(keyword="光伏", limit=1, cursor=first["next_cursor"])
+        service.get_news(keyword="光伏")
+        assert service.query_cache.stats()["misses"] == 1
+        assert service.query_cache.stats()["hits"] == 2
+
+    def test_invalidated_on_version_bump(self, service, write_json, domestic_news):
+        """Test a reload publishes a new version and cached results are not reused"""
+        path = write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        version = service.snapshot.version
+        assert service.get_news(keyword="光伏")["count"] == 3
+
+        write_json("combined_1.json", domestic_news[:2])
+        _touch(path, 1)
+        service.check_and_reload_data()
+        assert service.snapshot.version == version + 1
+        assert service.get_news(keyword="光伏")["count"] == 0
+        assert service.query_cache.stats()["misses"] == 2
+
+
+class TestStats:
+    """Test suite for the stats and timeline endpoints"""
+
+    def test_stats(self, service, write_json, domestic_news):
+        """Test stats count every record in the latest file"""
+        write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        stats = service.get_news_stats()
+        assert stats["total_count"] == len(service.snapshot.domestic)
+        assert sum(stats["source_stats"].values()) == stats["total_count"]
+
+    def test_timeline_matches_filtered_query(self, service, write_json, domestic_news):
+        """Test each timeline day equals a single-day date filter"""
+        write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        timeline = service.get_news_timeline(start_date="2024-02-28", end_date="2024-03-02")["data"]
+        assert [row["date"] for row in timeline] == ["2024-02-28", "2024-03-01", "2024-03-02"]
+        for row in timeline:
+            page = service.get_news(start_date=row["date"], end_date=row["date"])
+            assert row["total"] == page["count"]
+            assert row["sources"] == page["source_stats"]
+
+    def test_timeline_invalid_date(self, service):
+        """Test a malformed date is rejected"""
+        with pytest.raises(ValueError):
+            service.get_news_timeline(start_date="2024-13-45")
+
+
+class TestArchiveIngest:
+    """Test suite for archive ingest from the reload path"""
+
+    def test_ingest_runs_in_reload_not_init(self, tmp_path, monkeypatch, write_json, domestic_news):
+        """Test construction does not ingest and reloads only ingest changed files"""
+        monkeypatch.setattr(news_module, "DATA_DIR", tmp_path)
+        monkeypatch.setattr(news_module, "ARCHIVE_DB", str(tmp_path / "db" / "archive.db"))
+        write_json("combined_1.json", domestic_news)
+        svc = news_module.NewsService()
+        try:
+            assert svc.archive.count("domestic") == 0
+            svc.check_and_reload_data()
+            assert svc.archive.count("domestic") == 5
+
+            calls = []
+            ingest = svc.archive.ingest_files
+            monkeypatch.setattr(svc.archive, "ingest_files", lambda files: calls.append(list(files)) or ingest([]))
+            svc.check_and_reload_data()
+            assert calls == []
+
+            write_json("combined_2.json", domestic_news[:1])
+            svc.check_and_reload_data()
+            assert [[path.name for _, path in files] for files in calls] == [["combined_2.json"]]
+        finally:
+            svc.shutdown()
+
+
+class TestSummary:
+    """Test suite for the pre-serialized AI summary payloads"""
+
+    SUMMARIES = [
+        {"date": "2024-03-03", "summary": "光伏组件价格继续下行"},
+        {"date": "2024-03-02", "summary": "储能装机增长"},
+        {"date": "2024-03-02", "summary": "older duplicate"},
+    ]
+
+    def test_date_payload_bytes(self, service, write_json):
+        """Test a dated request returns that day's summary as ready-made JSON bytes"""
+        write_json("summary_domestic.json", self.SUMMARIES)
+        service.check_and_reload_data()
+        payload = service.get_ai_summary_payload("domestic", "2024-03-02")
+        assert isinstance(payload, bytes)
+        assert json.loads(payload) == {"success": True, "data": [self.SUMMARIES[1]]}
+        assert service.get_ai_summary_payload("domestic", "2024-03-02") is payload
+        assert json.loads(service.get_ai_summary_payload("domestic")) == {"success": True, "data": self.SUMMARIES}
+
+    def test_missing_date_and_type(self, service, write_json):
+        """Test an unknown date or news type yields no payload and an error response"""
+        write_json("summary_domestic.json", self.SUMMARIES)
+        service.check_and_reload_data()
+        assert service.get_ai_summary_payload("domestic", "2024-01-01") is None
+        assert service.get_ai_summary_payload("weekly") is None
+        assert service.get_ai_summary("domestic", "2024-01-01")["success"] is False
+        assert service.get_ai_summary("weekly")["success"] is False
+
+    def test_empty_before_first_load(self, service):
+        """Test both news types answer with an empty history before any summary file exists"""
+        for news_type in ("domestic", "international"):
+            assert json.loads(service.get_ai_summary_payload(news_type)) == {"success": True, "data": {}}
+
+
+class TestAsyncQueries:
+    """Test suite for running queries off the event loop"""
+
+    def test_json_matches_sync_query(self, service, write_json, domestic_news):
+        """Test the async variant returns the serialized sync response"""
+        write_json("combined_1.json", domestic_news)
+        service.check_and_reload_data()
+        payload = asyncio.run(service.get_news_json(keyword="光伏", limit=2))
+        assert json.loads(payload) == service.get_news(keyword="光伏", limit=2)
+
+    def test_runs_in_query_pool(self, service, monkeypatch):
+        """Test a slow query runs in a worker thread while the event loop keeps serving"""
+        release = threading.Event()
+        threads = []
+
+        def slow_query(**kwargs):
+            threads.append(threading.current_thread().name)
+            assert release.wait(5)
+            return {"success": True}
+
+        monkeypatch.setattr(service, "get_news", slow_query)
+
+        async def main():
+            query = asyncio.create_task(service.get_news_json())
+            # the loop still runs other coroutines while the query blocks its worker
+            await asyncio.sleep(0.05)
+            assert not query.done()
+            release.set()
+            return await query
+
+        assert json.loads(asyncio.run(main())) == {"success": True}
+        assert threads[0].startswith("news-query")
+
+    def test_errors_propagate(self, service):
+        """Test a ValueError raised by the query reaches the awaiting caller"""
+        with pytest.raises(ValueError):
+            asyncio.run(service.get_news_json(cursor="not-a-cursor", limit=1))
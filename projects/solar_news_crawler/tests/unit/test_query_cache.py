@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Tests for the query result cache"""
+from backend.services.news_collection import QueryMatch
+from backend.services.query_cache import QueryCache
+
+
+def _match(n):
+    """A match of n positions from one source"""
+    return QueryMatch(list(range(n)), n, {"src": n})
+
+
+class TestQueryCache:
+    """Test suite for QueryCache"""
+
+    def test_hit_and_miss(self):
+        """Test the second lookup of a key is served from the cache"""
+        cache = QueryCache(max_entries=4)
+        calls = []
+        compute = lambda: calls.append(1) or _match(3)
+        first = cache.get_or_compute(("domestic", 1), compute)
+        assert cache.get_or_compute(("domestic", 1), compute) is first
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = QueryCache(max_entries=2)
+        cache.get_or_compute("a", lambda: _match(1))
+        cache.get_or_compute("b", lambda: _match(2))
+        cache.get_or_compute("a", lambda: _match(1))
+        cache.get_or_compute("c", lambda: _match(3))
+        assert cache.stats()["evictions"] == 1
+        assert cache.get_or_compute("a", lambda: _match(9)).count == 1
+        assert cache.get_or_compute("b", lambda: _match(9)).count == 9
+
+    def test_disabled(self):
+        """Test max_entries 0 computes every time"""
+        cache = QueryCache(max_entries=0)
+        cache.get_or_compute("a", lambda: _match(1))
+        assert cache.get_or_compute("a", lambda: _match(2)).count == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_normalized_queries_share_entries(self):
+        """Test equivalent filter parameters normalize to the same key"""
+        from backend.services.news_collection import normalize_query
+
+        assert normalize_query("bad", "2024-01-01", "Solar", None) == normalize_query("x", "y", "solar", "")
+        assert normalize_query(None, "2024-01-01") == normalize_query()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Tests for the AIMD rate limiter"""
+import time
+
+import pytest
+
+from backend.services.rate_limiter import BACKOFF_FACTOR, SUCCESS_STEP, AdaptiveRateLimiter, is_throttled
+
+
+@pytest.fixture
+def limiter():
+    """A limiter starting at one request per second"""
+    return AdaptiveRateLimiter("test", interval=1.0, min_interval=0.2, max_interval=4.0)
+
+
+class TestAdaptiveRateLimiter:
+    """Test suite for AdaptiveRateLimiter"""
+
+    def test_additive_speed_up(self, limiter):
+        """Test successes shorten the interval linearly down to the floor"""
+        limiter.record(200)
+        assert limiter.interval == pytest.approx(1.0 - SUCCESS_STEP)
+        for _ in range(20):
+            limiter.record(204)
+        assert limiter.interval == pytest.approx(0.2)
+
+    def test_multiplicative_back_off(self, limiter):
+        """Test 429 and 5xx multiply the interval up to the ceiling"""
+        limiter.record(429)
+        assert limiter.interval == pytest.approx(BACKOFF_FACTOR)
+        limiter.record(503)
+        assert limiter.interval == pytest.approx(4.0)
+        limiter.record(500)
+        assert limiter.interval == pytest.approx(4.0)
+        assert limiter.stats()["throttled"] == 3
+
+    def test_back_off_delays_next_slot(self, limiter):
+        """Test throttling pushes the next slot by at least Retry-After"""
+        before = time.monotonic()
+        limiter.record(429, retry_after=10)
+        assert limiter._next_at >= before + 10
+
+    def test_other_failures_keep_rate(self, limiter):
+        """Test network errors and 4xx count as failures without changing the rate"""
+        limiter.record(None)
+        limiter.record(404)
+        assert limiter.interval == pytest.approx(1.0)
+        assert limiter.stats()["failures"] == 2 and limiter.stats()["throttled"] == 0
+
+    def test_acquire_reserves_slots(self):
+        """Test consecutive acquires are spaced by the interval"""
+        limiter = AdaptiveRateLimiter("test", interval=0.05, min_interval=0.01, max_interval=1.0)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.1
+        assert limiter.stats()["calls"] == 3
+
+    @pytest.mark.parametrize("status,expected", [(429, True), (500, True), (503, True), (404, False), (200, False)])
+    def test_is_throttled(self, status, expected):
+        """Test only 429 and 5xx count as throttling"""
+        assert is_throttled(status) is expected
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Tests for the keyword index"""
+import math
+
+import pytest
+
+from backend.services.search_index import (
+    BM25_B, BM25_K1, FIELD_WEIGHTS, SearchIndex, keyword_terms, token_stream, tokenize,
+)
+
+
+DOCUMENTS = [
+    ["光伏组件价格下跌", "Solar module prices fall", "Photovoltaic module prices fell"],
+    ["储能项目并网", "", "Powerful new storage projects"],
+    ["Solar power leads", "", ""],
+    ["电网运营商减少弃电", "Grid operators curb curtailment", ""],
+]
+
+
+def _reference_scores(documents, keyword):
+    """BM25F computed directly from the documents, one record at a time"""
+    lowered = [[(text or "").lower() for text in fields] for fields in documents]
+    tokens = [[token_stream(text) for text in fields] for fields in lowered]
+    avg = [
+        (sum(len(doc[i]) for doc in tokens) / len(tokens)) or 1.0
+        for i in range(len(tokens[0]))
+    ]
+    grams, fragments = keyword_terms(keyword.lower())
+    # each query term covers a set of words; a latin fragment covers every word containing it
+    vocab = {t for doc in tokens for field in doc for t in field}
+    terms = [{g} for g in dict.fromkeys(grams)]
+    terms.extend({w for w in vocab if f in w} for f in dict.fromkeys(fragments))
+
+    scores = [0.0] * len(documents)
+    for words in terms:
+        tfs = []
+        for doc in tokens:
+            tf = 0.0
+            for i, field in enumerate(doc):
+                norm = 1 - BM25_B + BM25_B * len(field) / avg[i]
+                tf += sum(FIELD_WEIGHTS[i] / norm for t in field if t in words)
+            tfs.append(tf)
+        df = sum(1 for tf in tfs if tf)
+        idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+        for d, tf in enumerate(tfs):
+            if tf:
+                scores[d] += idf * tf * (BM25_K1 + 1) / (BM25_K1 + tf)
+    return scores
+
+
+class TestSearchIndex:
+    """Test suite for SearchIndex"""
+
+    def test_tokenize(self):
+        """Test CJK text yields characters and bigrams, latin text yields words"""
+        assert tokenize("光伏 Solar-Power") == {"光", "伏", "光伏", "solar", "power"}
+        assert keyword_terms("光伏组 pow") == (["光伏", "伏组"], ["pow"])
+
+    def test_substring_semantics(self):
+        """Test latin fragments match inside words and CJK matches substrings"""
+        index = SearchIndex(DOCUMENTS)
+        assert index.search("ow") == [1, 2]
+        assert index.search("光伏组") == [0]
+        assert index.search("组件价格 下跌") == []
+
+    def test_matches_linear_scan(self):
+        """Test index results equal a case-insensitive substring scan"""
+        index = SearchIndex(DOCUMENTS)
+        for keyword in ("光", "电", "ro", "PRICES", "curb curt", "zzz", "!"):
+            expected = [
+                i for i, fields in enumerate(DOCUMENTS)
+                if any(keyword.lower() in text.lower() for text in fields)
+            ]
+            assert index.search(keyword) == expected, keyword
+
+    def test_title_weighs_more(self):
+        """Test a title hit outranks a summary hit"""
+        index = SearchIndex(DOCUMENTS)
+        title_hit, summary_hit = index.scores("power", [2, 1])
+        assert title_hit > summary_hit > 0
+
+    @pytest.mark.parametrize("keyword", ["光伏", "电", "pow", "solar power", "光伏 prices", "zzz"])
+    def test_scores_match_reference(self, keyword):
+        """Test scores equal BM25F computed record by record"""
+        index = SearchIndex(DOCUMENTS)
+        doc_ids = list(range(len(DOCUMENTS)))
+        expected = _reference_scores(DOCUMENTS, keyword)
+        assert index.scores(keyword, doc_ids) == pytest.approx(expected)
+        assert index.scores(keyword, [3, 0]) == pytest.approx([expected[3], expected[0]])
+
+    def test_incremental_build_matches_full_build(self):
+        """Test an index built from the previous generation equals a fresh build"""
+        previous = SearchIndex(DOCUMENTS)
+        documents = DOCUMENTS[1:] + [["新增光伏电站", "", "new solar plant"], DOCUMENTS[1]]
+        evolved = SearchIndex(documents, previous)
+        fresh = SearchIndex(documents)
+        doc_ids = list(range(len(documents)))
+        assert evolved._vocab.keys() == fresh._vocab.keys()
+        for token in fresh._vocab:
+            evolved_docs, evolved_weights = evolved._postings([evolved._vocab[token]])
+            fresh_docs, fresh_weights = fresh._postings([fresh._vocab[token]])
+            assert evolved_docs.tolist() == fresh_docs.tolist(), token
+            assert evolved_weights.tolist() == pytest.approx(fresh_weights.tolist()), token
+        for keyword in ("光伏", "solar", "pow", "电网"):
+            assert evolved.search(keyword) == fresh.search(keyword)
+            assert evolved.scores(keyword, doc_ids) == pytest.approx(fresh.scores(keyword, doc_ids))
+
+    def test_unchanged_documents_not_retokenized(self, monkeypatch):
+        """Test a reload tokenizes only documents the previous generation did not have"""
+        import backend.services.search_index as search_module
+
+        previous = SearchIndex(DOCUMENTS)
+        seen = []
+        stream = search_module.token_stream
+        monkeypatch.setattr(search_module, "token_stream", lambda text: seen.append(text) or stream(text))
+        SearchIndex(DOCUMENTS[2:] + [["新增光伏电站", "", "new solar plant"]], previous)
+        assert seen == ["新增光伏电站", "", "new solar plant"]
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Tests for the SQLite translation cache"""
+import json
+import time
+
+from backend.services.translation_cache import LEGACY_PROVIDER, TranslationCache, text_key
+
+
+class TestTranslationCache:
+    """Test suite for TranslationCache"""
+
+    def test_pending_entries_are_readable_before_flush(self, tmp_path):
+        """Test put is visible to get before it is written"""
+        cache = TranslationCache(tmp_path / "cache.db", flush_every=10)
+        cache.put("hello", "你好", "libretranslate")
+        assert cache.get("hello") == ("你好", "libretranslate")
+        assert cache.stats() == {"entries": 0, "pending": 1, "evictions": 0}
+
+    def test_flush_every(self, tmp_path):
+        """Test entries are written once flush_every accumulate"""
+        cache = TranslationCache(tmp_path / "cache.db", flush_every=2)
+        cache.put("a", "甲", "llm")
+        assert cache.stats()["entries"] == 0
+        cache.put("b", "乙", "llm")
+        assert cache.stats()["entries"] == 2 and cache.stats()["pending"] == 0
+
+    def test_close_persists(self, tmp_path):
+        """Test close flushes pending entries to disk"""
+        cache = TranslationCache(tmp_path / "cache.db", flush_every=100)
+        cache.put("a", "甲", "llm")
+        cache.close()
+        assert TranslationCache(tmp_path / "cache.db").get("a") == ("甲", "llm")
+
+    def test_provider_preference(self, tmp_path):
+        """Test the earliest listed provider wins and unlisted ones come last"""
+        cache = TranslationCache(tmp_path / "cache.db")
+        cache.put("a", "甲1", "mymemory")
+        cache.put("a", "甲2", "llm")
+        assert cache.get("a", ["llm", "mymemory"]) == ("甲2", "llm")
+        assert cache.get("a", ["mymemory"]) == ("甲1", "mymemory")
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently accessed entries are evicted past max_entries"""
+        cache = TranslationCache(tmp_path / "cache.db", max_entries=2, flush_every=1)
+        cache.put("a", "甲", "llm")
+        cache.put("b", "乙", "llm")
+        time.sleep(0.01)
+        cache.get("a")
+        cache.flush()
+        cache.put("c", "丙", "llm")
+        assert cache.stats()["entries"] == 2 and cache.evictions == 1
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_age_eviction(self, tmp_path):
+        """Test entries not accessed within max_age_days are evicted on flush"""
+        cache = TranslationCache(tmp_path / "cache.db", max_age_days=1, flush_every=1)
+        cache.put("a", "甲", "llm")
+        with cache._lock:
+            cache._connection().execute("UPDATE translations SET accessed_at = ?", (time.time() - 2 * 86400,))
+        cache.put("b", "乙", "llm")
+        assert cache.get("a") is None
+        assert cache.evictions == 1
+
+    def test_imports_legacy_json(self, tmp_path):
+        """Test the legacy JSON cache is imported once and renamed"""
+        legacy = tmp_path / "translation_cache.json"
+        legacy.write_text(json.dumps({text_key("hello"): "你好"}), encoding="utf-8")
+        cache = TranslationCache(tmp_path / "cache.db", legacy_json=legacy)
+        assert cache.get("hello") == ("你好", LEGACY_PROVIDER)
+        assert not legacy.exists()
+        assert (tmp_path / "translation_cache.json.bak").exists()
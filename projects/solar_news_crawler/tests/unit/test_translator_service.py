@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""Tests for the translator service (upstream requests are faked, no network)"""
+import json
+import threading
+
+import pytest
+
+import backend.services.translator_service as translator_module
+from backend.services.llm_translator import LLMTranslator
+from backend.services.rate_limiter import AdaptiveRateLimiter
+
+LIBRE = translator_module.LIBRETRANSLATE_ENDPOINTS
+MYMEMORY = translator_module.PROVIDER_ENDPOINTS["mymemory"][0]
+LLM_URL = "https://llm.example.com/v1/chat/completions"
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def libre_handler(method, url, kwargs):
+    """LibreTranslate answering every request with "译:" + text"""
+    q = kwargs["json"]["q"]
+    translated = ["译:" + t for t in q] if isinstance(q, list) else "译:" + q
+    return FakeResponse({"translatedText": translated})
+
+
+def mymemory_handler(method, url, kwargs):
+    """MyMemory answering with "忆:" + text"""
+    return FakeResponse({"responseStatus": 200, "responseData": {"translatedText": "忆:" + kwargs["params"]["q"]}})
+
+
+def llm_handler(method, url, kwargs):
+    """LLM answering every id with "模:" + text, except titles mentioning storage"""
+    items = json.loads(kwargs["json"]["messages"][1]["content"])
+    translations = [
+        {"id": item["id"], "text": "模:" + item["text"]} for item in items if "storage" not in item["text"]
+    ]
+    content = json.dumps({"translations": translations}, ensure_ascii=False)
+    return FakeResponse({"choices": [{"message": {"content": content}}]})
+
+
+class FakeSession:
+    """Records upstream requests and answers them with per-host handlers"""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            self.calls.append((url, kwargs))
+        handler = self.handlers.get(url)
+        if handler is None:
+            provider = "llm" if url == LLM_URL else "libretranslate" if url in LIBRE else "mymemory"
+            handler = self.handlers[provider]
+        return handler(method, url, kwargs)
+
+
+class EnabledLLM(LLMTranslator):
+    """An LLM backend configured with a fake endpoint"""
+
+    def __init__(self):
+        super().__init__(glossary={"module": "组件"})
+        self.enabled = True
+        self.endpoint = LLM_URL
+
+
+@pytest.fixture
+def make_translator(tmp_path, monkeypatch):
+    """Factory for translators with a temporary cache, millisecond rate limits and a fake session"""
+    monkeypatch.setattr(translator_module, "TRANSLATION_CACHE_DB", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(translator_module, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(translator_module, "LLMTranslator", EnabledLLM)
+    services = []
+
+    def make(providers=("libretranslate", "mymemory"), handlers=None):
+        monkeypatch.setattr(translator_module, "TRANSLATE_PROVIDERS", list(providers))
+        svc = translator_module.TranslatorService()
+        svc.rate_limiters = {
+            name: AdaptiveRateLimiter(name, interval=0.001, min_interval=0.001, max_interval=0.01)
+            for name in svc.providers
+        }
+        svc.session = FakeSession({"libretranslate": libre_handler, "mymemory": mymemory_handler, **(handlers or {})})
+        services.append(svc)
+        return svc
+
+    yield make
+    for svc in services:
+        svc.shutdown()
+
+
+@pytest.fixture
+def translator(make_translator):
+    """A LibreTranslate + MyMemory translator"""
+    return make_translator()
+
+
+class TestRateLimiting:
+    """Test suite for pacing upstream requests"""
+
+    def test_cache_hits_skip_limiter(self, translator, monkeypatch):
+        """Test cached titles are served without a limiter slot or an upstream request"""
+        translator.cache.put("Solar module prices fall", "光伏组件价格下跌", "libretranslate")
+        acquired = []
+        for limiter in translator.rate_limiters.values():
+            monkeypatch.setattr(limiter, "acquire", lambda: acquired.append(1))
+
+        assert translator.translate_text("Solar module prices fall") == "光伏组件价格下跌"
+        assert translator.translate_batch(["Solar module prices fall"] * 3) == ["光伏组件价格下跌"] * 3
+        assert acquired == [] and translator.session.calls == []
+        assert translator.get_stats()["providers"]["libretranslate"]["cache_hits"] == 2
+
+    def test_limiter_counts_only_upstream_calls(self, translator):
+        """Test each upstream request takes exactly one slot of its provider"""
+        translator.translate_text("Grid operators curb curtailment")
+        translator.translate_text("Grid operators curb curtailment")
+        stats = translator.get_stats()["providers"]
+        assert len(translator.session.calls) == 1
+        assert stats["libretranslate"]["calls"] == 1 and stats["libretranslate"]["cache_hits"] == 1
+        assert stats["mymemory"]["calls"] == 0
+
+    def test_throttled_provider_backs_off(self, translator):
+        """Test a 429 from the upstream slows down that provider only"""
+        translator.session.handlers.update({url: lambda *args: FakeResponse({}, 429) for url in LIBRE})
+        before = translator.rate_limiters["libretranslate"].interval
+        assert translator.translate_text("Powerful new storage projects") == "忆:Powerful new storage projects"
+        assert translator.rate_limiters["libretranslate"].interval > before
+        assert translator.rate_limiters["mymemory"].interval == pytest.approx(0.001)
+
+
+class TestTranslationCache:
+    """Test suite for the service's persistent translation cache"""
+
+    def test_translations_survive_restart(self, translator):
+        """Test a new service answers from the cache written by the previous one"""
+        assert translator.translate_batch(["Solar module prices fall"]) == ["译:Solar module prices fall"]
+        translator.shutdown()
+
+        restarted = translator_module.TranslatorService()
+        restarted.session = FakeSession({})
+        try:
+            assert restarted.translate_text("Solar module prices fall") == "译:Solar module prices fall"
+            assert restarted.session.calls == []
+        finally:
+            restarted.shutdown()
+
+
+class TestTranslateBatch:
+    """Test suite for batched translation with per-item fallback"""
+
+    def test_chunks_and_order(self, translator):
+        """Test titles go out in provider-sized chunks and results keep input order"""
+        texts = [f"Headline {i}" for i in range(30)]
+        result = translator.translate_batch(texts + ["", texts[0]])
+        assert result == ["译:" + t for t in texts] + ["", "译:Headline 0"]
+        sizes = [len(kwargs["json"]["q"]) for _, kwargs in translator.session.calls]
+        assert sorted(sizes) == [5, 25]
+
+    def test_invalid_items_fall_back(self, translator):
+        """Test untranslated items in a good batch fall back one by one"""
+        def partial_libre(method, url, kwargs):
+            q = kwargs["json"]["q"]
+            if isinstance(q, list):
+                return FakeResponse({"translatedText": [t if "storage" in t else "译:" + t for t in q]})
+            return FakeResponse({"translatedText": q})
+
+        translator.session.handlers["libretranslate"] = partial_libre
+        texts = ["Solar module prices fall", "Powerful new storage projects"]
+        assert translator.translate_batch(texts) == ["译:Solar module prices fall", "忆:Powerful new storage projects"]
+
+    def test_failed_chunk_falls_back(self, translator):
+        """Test a chunk whose response does not line up with the input falls back item by item"""
+        translator.session.handlers["libretranslate"] = lambda *args: FakeResponse({"translatedText": ["只有一条"]})
+        texts = ["Solar module prices fall", "Grid operators curb curtailment"]
+        assert translator.translate_batch(texts) == ["忆:" + t for t in texts]
+        assert translator.cache.get(texts[0]) == ("忆:Solar module prices fall", "mymemory")
+
+    def test_fallback_skips_failed_batch_provider(self, translator):
+        """Test items a batch provider failed are retried only with the other providers"""
+        translator.session.handlers["libretranslate"] = lambda *args: FakeResponse({"translatedText": ["只有一条"]})
+        # MyMemory is known to be slow, so it would only be tried after LibreTranslate
+        translator.health.record(("mymemory", MYMEMORY), True, 5.0)
+        texts = ["Solar module prices fall", "Grid operators curb curtailment"]
+        assert translator.translate_batch(texts) == ["忆:" + t for t in texts]
+        libre_calls = [kwargs for url, kwargs in translator.session.calls if url in LIBRE]
+        assert all(isinstance(kwargs["json"]["q"], list) for kwargs in libre_calls)
+        assert [url for url, _ in translator.session.calls].count(MYMEMORY) == 2
+
+    def test_reuses_one_executor(self, translator, monkeypatch):
+        """Test batches share the service's thread pool instead of creating one per call"""
+        created = []
+        executor_class = translator_module.ThreadPoolExecutor
+        monkeypatch.setattr(
+            translator_module, "ThreadPoolExecutor", lambda **kwargs: created.append(1) or executor_class(**kwargs)
+        )
+        for i in range(3):
+            translator.translate_batch([f"Headline {i}", f"Other {i}"])
+        assert len(created) == 1
+
+    def test_all_providers_fail(self, translator):
+        """Test titles nobody can translate are returned unchanged and not cached"""
+        translator.session.handlers.update({
+            "libretranslate": lambda *args: FakeResponse({}, 503),
+            "mymemory": lambda *args: FakeResponse({}, 503),
+        })
+        assert translator.translate_batch(["Solar module prices fall"]) == ["Solar module prices fall"]
+        assert translator.cache.get("Solar module prices fall") is None
+
+
+class TestEndpointOrdering:
+    """Test suite for health-ordered endpoints under concurrent batches"""
+
+    def test_dead_endpoint_probed_once(self, translator):
+        """Test concurrent chunks send a single request to a dead host and skip it afterwards"""
+        translator.session.handlers[LIBRE[0]] = lambda *args: FakeResponse({}, 503)
+        texts = [f"Headline {i}" for i in range(200)]
+        assert translator.translate_batch(texts) == ["译:" + t for t in texts]
+
+        hosts = [url for url, _ in translator.session.calls]
+        assert hosts.count(LIBRE[0]) == 1
+        assert len(hosts) == 9
+        assert translator.get_stats()["endpoints"][f"libretranslate {LIBRE[0]}"]["cooldown_seconds"] > 0
+
+    def test_prefers_faster_endpoint(self, translator):
+        """Test once every endpoint has samples the fastest is tried first"""
+        translator.health.record(("libretranslate", LIBRE[0]), True, 2.0)
+        translator.health.record(("libretranslate", LIBRE[1]), True, 0.1)
+        translator.health.record(("libretranslate", LIBRE[2]), True, 0.5)
+        translator.translate_batch(["Solar module prices fall"])
+        assert [url for url, _ in translator.session.calls] == [LIBRE[1]]
+
+
+class TestLLMProvider:
+    """Test suite for the LLM batch provider inside the translator service"""
+
+    def test_llm_batches_first(self, make_translator):
+        """Test the LLM translates whole batches in one request with the matching glossary terms"""
+        translator = make_translator(["llm", "libretranslate"], {"llm": llm_handler})
+        texts = ["Solar module prices fall", "Grid operators curb curtailment"]
+        assert translator.translate_batch(texts) == ["模:" + t for t in texts]
+        assert len(translator.session.calls) == 1
+        url, kwargs = translator.session.calls[0]
+        assert url == LLM_URL and "module => 组件" in kwargs["json"]["messages"][0]["content"]
+        assert translator.cache.get(texts[0]) == ("模:Solar module prices fall", "llm")
+
+    def test_missing_ids_fall_back(self, make_translator):
+        """Test titles the LLM leaves out are translated by the next provider"""
+        translator = make_translator(["llm", "libretranslate"], {"llm": llm_handler})
+        texts = ["Solar module prices fall", "Powerful new storage projects"]
+        assert translator.translate_batch(texts) == ["模:Solar module prices fall", "译:Powerful new storage projects"]
+
+    def test_missing_ids_not_retried_with_llm(self, make_translator):
+        """Test the per-item fallback does not send the LLM a title it just left out"""
+        translator = make_translator(["llm", "mymemory"], {"llm": llm_handler})
+        translator.health.record(("mymemory", MYMEMORY), True, 5.0)
+        texts = ["Solar module prices fall", "Powerful new storage projects"]
+        assert translator.translate_batch(texts) == ["模:Solar module prices fall", "忆:Powerful new storage projects"]
+        assert [url for url, _ in translator.session.calls] == [LLM_URL, MYMEMORY]
+
+    def test_skipped_without_configuration(self, translator):
+        """Test an unconfigured LLM is dropped from the provider order"""
+        translator.llm.enabled = False
+        assert translator._configured_providers(["llm", "mymemory"]) == ["mymemory"]